@@ -0,0 +1,97 @@
+"""Cold-start time of the headless CLI, and a check that it never loads the GUI.
+
+Usage:
+    python benchmarks/bench_cli_startup.py [--runs 10] [--games 20]
+
+Each run starts a fresh interpreter with -X importtime and executes
+`python -m core --json list` against a throwaway settings file. The run
+fails if tkinter, customtkinter or any ui.* module shows up in the
+import log, or any of the modules only backups, restores and other
+commands need (LISTING_EXCLUDED).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_MODULES = ("tkinter", "_tkinter", "customtkinter", "ui")
+# Listing reads the settings and the catalog; none of these may load for it
+LISTING_EXCLUDED = ("core.archive", "core.restore", "core.capture", "core.scheduler", "core.jobs",
+                    "core.retention", "core.copier", "core.snapshots", "core.file_index",
+                    "concurrent.futures", "multiprocessing")
+
+
+def make_config(work_dir, games):
+    root = os.path.join(work_dir, "backups")
+    config = {"root_backup_dir": root, "games": {}, "version": "4.1"}
+    for i in range(games):
+        source = os.path.join(work_dir, "saves", f"game_{i:03d}")
+        os.makedirs(source, exist_ok=True)
+        with open(os.path.join(source, "slot1.sav"), 'wb') as f:
+            f.write(os.urandom(1024))
+        config["games"][f"game_{i:03d}"] = {"source_path": source}
+    path = os.path.join(work_dir, "game_backup_config.json")
+    with open(path, 'w') as f:
+        json.dump(config, f, indent=4)
+    return path
+
+
+def imported_modules(importtime_log):
+    """Module names from a -X importtime log"""
+    modules = set()
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        name = line.rsplit("|", 1)[1].strip()
+        if name and name != "package":
+            modules.add(name)
+    return modules
+
+
+def run_once(config_path):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "core", "--config", config_path, "--json", "list"],
+        cwd=os.path.dirname(config_path), env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise SystemExit(f"CLI failed ({proc.returncode}): {proc.stderr[-2000:]}")
+    return elapsed, imported_modules(proc.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--games", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_cli_") as work_dir:
+        config_path = make_config(work_dir, args.games)
+        run_once(config_path)  # first run creates the catalog; not timed
+
+        times = []
+        for _ in range(args.runs):
+            elapsed, modules = run_once(config_path)
+            gui = sorted(m for m in modules if m.split(".")[0] in GUI_MODULES)
+            if gui:
+                raise SystemExit(f"GUI modules imported on the CLI path: {', '.join(gui)}")
+            loaded = sorted(m for m in modules if m in LISTING_EXCLUDED)
+            if loaded:
+                raise SystemExit(f"Modules `list` does not need were imported: {', '.join(loaded)}")
+            times.append(elapsed)
+
+    print(f"python -m core list ({args.games} games, {args.runs} runs)")
+    print(f"  median {statistics.median(times) * 1000:.1f} ms, "
+          f"min {min(times) * 1000:.1f} ms, max {max(times) * 1000:.1f} ms")
+    print("  no GUI or backup/restore modules imported")
+
+
+if __name__ == "__main__":
+    main()
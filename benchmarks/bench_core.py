@@ -0,0 +1,347 @@
+"""Time GameBackupCore's hot paths on synthetic save trees and catch regressions.
+
+Usage:
+    python benchmarks/bench_core.py [--formats store,folder] [--repeat 3]
+                                    [--tiny-files 5000] [--huge-files 2] [--huge-mb 128]
+                                    [--depth 20] [--games 20] [--snapshots 10]
+                                    [--seed 1] [--dir PATH]
+                                    [--save-baseline FILE] [--baseline FILE]
+                                    [--threshold 0.25] [--min-seconds 0.05]
+
+Four reproducible datasets are generated from --seed: many tiny files, a
+few huge files, a deeply nested tree, and a fleet of --games games that
+each collect --snapshots backups. For every snapshot format the script
+times create_backup (full and incremental), restore_backup,
+update_all_backups and get_backups, and records throughput, read/write
+syscall counts and peak RSS (the last two on Linux only). Each operation
+is run --repeat times on a fresh backup root and the median is kept.
+
+--save-baseline writes the results as JSON; --baseline compares a run
+against such a file and exits with status 1 if any operation got slower
+(or used more syscalls or memory) by more than --threshold. Baselines
+are only meaningful on the machine and disk they were recorded on. The
+"archive" format is not in the default --formats: compressing the huge,
+incompressible files takes minutes with xz.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.backup_manager import GameBackupCore
+from core.config_store import default_config
+
+MB = 1024 * 1024
+# Metrics compared against the baseline; throughput follows from seconds
+COMPARED = ('seconds', 'syscalls', 'peak_rss_mb')
+# Arguments that change the datasets, and so must match the baseline's
+DATASET_ARGS = ('tiny_files', 'huge_files', 'huge_mb', 'depth', 'games', 'snapshots', 'seed')
+
+
+# ========== SYNTHETIC SAVE TREES ==========
+
+def write_random(path, size, rng):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        while size > 0:
+            n = min(size, MB)
+            f.write(rng.randbytes(n))
+            size -= n
+
+
+def make_tiny(root, rng, count):
+    for i in range(count):
+        write_random(os.path.join(root, f"slot_{i // 250:03d}", f"save_{i:05d}.sav"),
+                     rng.randint(256, 4096), rng)
+
+
+def make_huge(root, rng, count, size_mb):
+    for i in range(count):
+        write_random(os.path.join(root, f"world_{i}.db"), size_mb * MB, rng)
+
+
+def make_deep(root, rng, depth, files_per_level=10):
+    folder = root
+    for level in range(depth):
+        folder = os.path.join(folder, f"level_{level:02d}")
+        for i in range(files_per_level):
+            write_random(os.path.join(folder, f"chunk_{i}.dat"), rng.randint(1024, 64 * 1024), rng)
+
+
+def make_fleet(root, rng, games, files=50):
+    for g in range(games):
+        make_tiny(os.path.join(root, f"game_{g:03d}"), rng, files)
+
+
+def touch_files(root, rng, fraction):
+    """Rewrite a fraction of the files (at least one), as a game saving would"""
+    paths = sorted(os.path.join(d, f) for d, _, names in os.walk(root) for f in names)
+    for path in rng.sample(paths, max(1, int(len(paths) * fraction))):
+        size = os.path.getsize(path)
+        with open(path, 'r+b') as f:
+            page = min(size, 4096)
+            f.seek(rng.randrange(max(1, size - page + 1)))
+            f.write(rng.randbytes(page))
+
+
+def tree_size(root):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, names in os.walk(root) for f in names)
+
+
+# ========== MEASUREMENT ==========
+
+def _proc_io():
+    """Read and write syscalls made by this process so far, or None off Linux"""
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(":") for line in f)
+        return int(fields['syscr']) + int(fields['syscw'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _reset_peak_rss():
+    """Restart the kernel's peak-RSS counter so each operation gets its own peak"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        # Lifetime peak only: kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / MB if sys.platform == "darwin" else peak / 1024
+    except ImportError:  # Windows
+        return None
+
+
+def measure(func, nbytes=None):
+    """Run func once, returning its metrics"""
+    _reset_peak_rss()
+    io_before = _proc_io()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    io_after = _proc_io()
+    return {
+        'seconds': elapsed,
+        'mb_s': nbytes / MB / elapsed if nbytes and elapsed else None,
+        'syscalls': io_after - io_before if io_before is not None else None,
+        'peak_rss_mb': _peak_rss_mb()
+    }
+
+
+def check(result):
+    """Fail the run loudly instead of timing an operation that did nothing"""
+    success, message = result[:2] if isinstance(result, tuple) else (True, "")
+    if not success:
+        raise RuntimeError(message)
+
+
+# ========== SCENARIOS ==========
+
+class Run:
+    """One repeat: a fresh settings file and backup root for a dataset"""
+
+    def __init__(self, work, snapshot_format):
+        self.work = work
+        self.root = os.path.join(work, "backups")
+        config = default_config(self.root)
+        config['safety_snapshot'] = False  # a safety snapshot would just be another backup_full
+        config_path = os.path.join(work, "config.json")
+        with open(config_path, 'w') as f:
+            json.dump(config, f)
+        self.core = GameBackupCore(config_path)
+        self.format = snapshot_format
+
+    def add(self, game_name, source):
+        self.core.add_game(game_name, source)
+        with self.core.edit_config() as config:
+            config['games'][game_name]['format'] = self.format
+
+    def backup(self, game_name):
+        check(self.core.create_backup(game_name))
+
+    def restore_latest(self, game_name):
+        check(self.core.restore_backup(game_name, self.core.get_backups(game_name)[0]['path']))
+
+
+def single_game(run, rng, source, size, change_fraction):
+    """Full backup, incremental backup after a few writes, restore after a few more"""
+    run.add("game", source)
+    results = {'backup_full': measure(lambda: run.backup("game"), size)}
+    touch_files(source, rng, change_fraction)
+    results['backup_incremental'] = measure(lambda: run.backup("game"), size)
+    touch_files(source, rng, change_fraction)
+    results['restore_changed'] = measure(lambda: run.restore_latest("game"))
+    shutil.rmtree(source)
+    results['restore_full'] = measure(lambda: run.restore_latest("game"), size)
+    return results
+
+
+def fleet(run, rng, source, size, games, snapshots):
+    """update_all_backups over many games, then listing their snapshot histories"""
+    for g in range(games):
+        run.add(f"game_{g:03d}", os.path.join(source, f"game_{g:03d}"))
+    core = run.core
+    results = {'update_all_full': measure(lambda: core.update_all_backups(), size)}
+    for _ in range(snapshots - 2):
+        touch_files(source, rng, 0.02)
+        core.update_all_backups()
+    touch_files(source, rng, 0.02)
+    results['update_all_incremental'] = measure(lambda: core.update_all_backups(), size)
+
+    def _list_all():
+        for game_name in core.list_games():
+            core.get_backups(game_name)
+    results['get_backups_all'] = measure(_list_all)
+    return results
+
+
+def run_scenarios(args, snapshot_format, work):
+    """{operation: [metrics per repeat]} for one snapshot format"""
+    samples = {}
+    datasets = {
+        'tiny': lambda src, rng: make_tiny(src, rng, args.tiny_files),
+        'huge': lambda src, rng: make_huge(src, rng, args.huge_files, args.huge_mb),
+        'deep': lambda src, rng: make_deep(src, rng, args.depth),
+        'fleet': lambda src, rng: make_fleet(src, rng, args.games)
+    }
+    for repeat in range(args.repeat):
+        for name, make in datasets.items():
+            run_dir = os.path.join(work, f"{snapshot_format}_{name}_{repeat}")
+            source = os.path.join(run_dir, "saves")
+            rng = random.Random(f"{args.seed}/{name}")  # same tree on every repeat
+            make(source, rng)
+            size = tree_size(source)
+            run = Run(run_dir, snapshot_format)
+            if name == 'fleet':
+                results = fleet(run, rng, source, size, args.games, args.snapshots)
+            else:
+                results = single_game(run, rng, source, size, 0.01)
+            run.core.prune_backups(wait=True)
+            for op, metrics in results.items():
+                samples.setdefault(f"{snapshot_format}/{name}/{op}", []).append(metrics)
+            shutil.rmtree(run_dir, ignore_errors=True)
+    return samples
+
+
+def median_metrics(runs):
+    summary = {}
+    for key in runs[0]:
+        values = [r[key] for r in runs if r[key] is not None]
+        summary[key] = statistics.median(values) if values else None
+    return summary
+
+
+# ========== BASELINE ==========
+
+def compare(results, baseline, threshold, min_seconds):
+    """Lines describing regressions beyond threshold (a fraction, e.g. 0.25).
+
+    Timings that stay under min_seconds are timer noise and never count.
+    """
+    regressions = []
+    for op, metrics in results.items():
+        before = baseline.get(op)
+        if before is None:
+            continue
+        for key in COMPARED:
+            old, new = before.get(key), metrics.get(key)
+            if not old or new is None:
+                continue
+            if key == 'seconds' and new < min_seconds:
+                continue
+            if new > old * (1 + threshold):
+                regressions.append(f"{op} {key}: {old:.4g} -> {new:.4g} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'operation':<40} {'seconds':>9} {'MB/s':>9} {'syscalls':>10} {'peak MB':>9}")
+    for op, m in results.items():
+        mb_s = f"{m['mb_s']:9.1f}" if m['mb_s'] is not None else f"{'-':>9}"
+        syscalls = f"{m['syscalls']:10.0f}" if m['syscalls'] is not None else f"{'-':>10}"
+        rss = f"{m['peak_rss_mb']:9.1f}" if m['peak_rss_mb'] is not None else f"{'-':>9}"
+        print(f"{op:<40} {m['seconds']:9.3f} {mb_s} {syscalls} {rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--formats", default="store,folder", help="comma-separated snapshot formats")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tiny-files", type=int, default=5000)
+    parser.add_argument("--huge-files", type=int, default=2)
+    parser.add_argument("--huge-mb", type=int, default=128)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--snapshots", type=int, default=10, help="backups per game in the fleet dataset")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dir", default=None, help="scratch directory (default: system temp)")
+    parser.add_argument("--save-baseline", metavar="FILE", help="write the results to FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="compare the results with FILE")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a regression is reported (default 0.25 = 25%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="ignore slowdowns of operations that still take less than this")
+    args = parser.parse_args()
+    args.snapshots = max(2, args.snapshots)
+
+    work = tempfile.mkdtemp(prefix="bench_core_", dir=args.dir)
+    results = {}
+    try:
+        for snapshot_format in args.formats.split(","):
+            samples = run_scenarios(args, snapshot_format.strip(), work)
+            results.update((op, median_metrics(runs)) for op, runs in samples.items())
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print_table(results)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({
+                'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                            'cpus': os.cpu_count()},
+                'args': {k: v for k, v in vars(args).items() if k not in ('baseline', 'save_baseline')},
+                'results': results
+            }, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for key in DATASET_ARGS:
+            if baseline['args'].get(key) != getattr(args, key):
+                print(f"warning: baseline used --{key.replace('_', '-')} {baseline['args'].get(key)}, "
+                      f"this run {getattr(args, key)}")
+        regressions = compare(results, baseline['results'], args.threshold, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} regressions beyond {args.threshold * 100:.0f}%:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Measure how much a running backup slows a game's disk reads, with the I/O governor off and on.
+
+Usage:
+    python benchmarks/bench_governor.py [--save-mb 512] [--files 64] [--game-mb 256]
+                                        [--rate-mb 32] [--interval-ms 5] [--idle-seconds 5]
+                                        [--seed 1] [--dir PATH]
+
+A stand-in game runs in its own process and keeps its data file open in
+a separate "install" folder, doing one random 4 KiB read every
+--interval-ms, with the page dropped from the cache first so every read
+reaches the disk. Its read latency is recorded while nothing else runs,
+while create_backup copies --save-mb of saves at full speed, and while
+the same backup runs under the governor: paced to --rate-mb once it sees
+the game's open file, at idle CPU and I/O priority. The save files are
+dropped from the page cache before each backup, so it reads from disk
+too. Priorities only take effect on Linux, and the result depends on the
+disk and its I/O scheduler (none/mq-deadline largely ignore the idle
+class; BFQ honours it).
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.backup_manager import GameBackupCore
+from core.config_store import default_config
+from core.governor import install
+
+MB = 1024 * 1024
+READ_SIZE = 4096
+
+
+def write_random(path, size, rng):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        while size > 0:
+            n = min(size, MB)
+            f.write(rng.randbytes(n))
+            size -= n
+
+
+def drop_cache(root):
+    """Evict a tree's pages so the next read goes to the disk"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            fd = os.open(os.path.join(dirpath, name), os.O_RDONLY)
+            try:
+                os.fdatasync(fd)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+# ========== FOREGROUND "GAME" ==========
+
+def foreground(path, interval):
+    """Random uncached reads until stdin closes, then print the latencies (seconds) as JSON"""
+    import threading
+    stop = threading.Event()
+    threading.Thread(target=lambda: (sys.stdin.read(), stop.set()), daemon=True).start()
+    rng = random.Random(0)
+    latencies = []
+    fd = os.open(path, os.O_RDONLY)
+    blocks = os.fstat(fd).st_size // READ_SIZE
+    print("ready", flush=True)
+    while not stop.is_set():
+        offset = rng.randrange(blocks) * READ_SIZE
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, offset, READ_SIZE, os.POSIX_FADV_DONTNEED)
+        start = time.perf_counter()
+        os.pread(fd, READ_SIZE, offset)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(interval)
+    os.close(fd)
+    print(json.dumps(latencies), flush=True)
+
+
+def start_game(game_file, interval):
+    game = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--foreground", game_file, str(interval)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    game.stdout.readline()  # "ready": the file is open
+    return game
+
+
+def stop_game(game):
+    game.stdin.close()
+    latencies = json.loads(game.stdout.readline())
+    game.wait()
+    return latencies
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+    return {'reads': len(ordered), 'p50_ms': pct(0.50), 'p95_ms': pct(0.95),
+            'p99_ms': pct(0.99), 'max_ms': ordered[-1] * 1000}
+
+
+# ========== SCENARIOS ==========
+
+def run_backup(work, save_dir, governor_settings):
+    config_path = os.path.join(work, "config.json")
+    root = os.path.join(work, "root")
+    shutil.rmtree(root, ignore_errors=True)
+    config = default_config(root)
+    if governor_settings:
+        config['io_governor'] = governor_settings
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+    core = GameBackupCore(config_path)
+    core.add_game("bench", save_dir)
+    drop_cache(save_dir)
+    start = time.perf_counter()
+    success, message = core.create_backup("bench")
+    seconds = time.perf_counter() - start
+    install(None)
+    if not success:
+        raise RuntimeError(message)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save-mb", type=int, default=512)
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--game-mb", type=int, default=256)
+    parser.add_argument("--rate-mb", type=float, default=32, help="governor rate while the game runs")
+    parser.add_argument("--interval-ms", type=float, default=5)
+    parser.add_argument("--idle-seconds", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dir", help="scratch directory on the disk to test (default: system temp)")
+    parser.add_argument("--foreground", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.foreground:
+        return foreground(args.foreground[0], float(args.foreground[1]))
+
+    work = tempfile.mkdtemp(prefix="bench_governor_", dir=args.dir)
+    try:
+        rng = random.Random(args.seed)
+        save_dir = os.path.join(work, "saves")
+        for i in range(args.files):
+            write_random(os.path.join(save_dir, f"save_{i:03d}.dat"), args.save_mb * MB // args.files, rng)
+        install_dir = os.path.join(work, "install")
+        game_file = os.path.join(install_dir, "assets.pak")
+        write_random(game_file, args.game_mb * MB, rng)
+        interval = args.interval_ms / 1000
+
+        game = start_game(game_file, interval)
+        time.sleep(args.idle_seconds)
+        rows = [("no backup", None, summarize(stop_game(game)))]
+        scenarios = [
+            ("governor off", None),
+            ("governor on", {'game_rate_mb': args.rate_mb, 'low_priority': True,
+                             'source_paths': [install_dir], 'check_seconds': 1}),
+        ]
+        for name, settings in scenarios:
+            game = start_game(game_file, interval)
+            seconds = run_backup(work, save_dir, settings)
+            rows.append((name, seconds, summarize(stop_game(game))))
+
+        print(f"{'scenario':<14}{'backup s':>10}{'MB/s':>8}{'reads':>8}"
+              f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for name, seconds, stats in rows:
+            backup = f"{seconds:>10.2f}{args.save_mb / seconds:>8.1f}" if seconds else f"{'-':>10}{'-':>8}"
+            print(f"{name:<14}{backup}{stats['reads']:>8}{stats['p50_ms']:>9.2f}"
+                  f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
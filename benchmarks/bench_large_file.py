@@ -0,0 +1,100 @@
+"""How much a backup of one large save file stores after a few pages change.
+
+Usage:
+    python benchmarks/bench_large_file.py [--size-mb 2048] [--pages 100]
+                                          [--page-kb 4] [--dir PATH]
+
+Writes a synthetic database file, snapshots it into an object store,
+overwrites --pages random pages (as SQLite does), snapshots again and
+reports the new bytes stored, the time taken and the manifest size for
+several block sizes. Finally it restores the second snapshot and checks
+the result, reporting peak memory so you can see it does not grow with
+the file.
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.object_store import ObjectStore, CHUNK_SIZE, DELTA_THRESHOLD
+from core.file_index import FileIndex
+
+BLOCK_SIZES_KB = [CHUNK_SIZE // 1024, 1024, 256, 64]
+
+
+def make_file(path, size_mb):
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(1024 * 1024))
+
+
+def touch_pages(path, pages, page_size, seed=1):
+    rng = random.Random(seed)
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        for _ in range(pages):
+            f.seek(rng.randrange(size // page_size) * page_size)
+            f.write(os.urandom(page_size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--page-kb", type=int, default=4)
+    parser.add_argument("--dir", default=None, help="scratch directory (default: system temp)")
+    args = parser.parse_args()
+
+    if args.size_mb * 1024 * 1024 < DELTA_THRESHOLD:
+        print(f"note: files under {DELTA_THRESHOLD // (1024 * 1024)} MiB always use "
+              f"{CHUNK_SIZE // (1024 * 1024)} MiB chunks")
+
+    work = tempfile.mkdtemp(prefix="bench_large_", dir=args.dir)
+    try:
+        source = os.path.join(work, "world.db")
+        print(f"{args.size_mb} MiB file, {args.pages} changed pages of {args.page_kb} KiB")
+        print(f"{'block':>8} {'first MB':>9} {'delta MB':>9} {'delta s':>8} {'manifest KB':>12}")
+        for block_kb in BLOCK_SIZES_KB:
+            make_file(source, args.size_mb)
+            root = os.path.join(work, f"root_{block_kb}")
+            store = ObjectStore(root, delta_chunk_size=block_kb * 1024)
+            index = FileIndex(work)
+
+            first, manifest = store.snapshot(source, os.path.join(root, "first.manifest.json"), index)
+            index.reset(None, "store", {e['path']: e for e in manifest['files']})
+            touch_pages(source, args.pages, args.page_kb * 1024)
+
+            second_path = os.path.join(root, "second.manifest.json")
+            start = time.perf_counter()
+            delta, _ = store.snapshot(source, second_path, index)
+            elapsed = time.perf_counter() - start
+            print(f"{block_kb:>6}KB {first / 1e6:>9.1f} {delta / 1e6:>9.1f} {elapsed:>8.2f} "
+                  f"{os.path.getsize(second_path) / 1024:>12.1f}")
+
+        restored = os.path.join(work, "restored.db")
+        tracemalloc.start()
+        start = time.perf_counter()
+        store.restore(second_path, restored)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with open(source, 'rb') as a, open(restored, 'rb') as b:
+            while True:
+                x, y = a.read(1024 * 1024), b.read(1024 * 1024)
+                if x != y:
+                    raise SystemExit("restored file differs from the source")
+                if not x:
+                    break
+        print(f"restore: {elapsed:.2f} s, peak Python memory {peak / 1e6:.1f} MB, contents match")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
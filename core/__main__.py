@@ -0,0 +1,9 @@
+import sys
+from core.cli import main
+
+if __name__ == "__main__":
+    if getattr(sys, 'frozen', False):
+        # Only a frozen build needs this before the verify process pool starts
+        import multiprocessing
+        multiprocessing.freeze_support()
+    sys.exit(main())
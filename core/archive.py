@@ -0,0 +1,257 @@
+import os
+import json
+import zlib
+import lzma
+import struct
+import hashlib
+from datetime import datetime
+from core.copier import walk_files, native_path
+from core.governor import throttle
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_MAGIC = b"GBAR0001"
+TRAILER = struct.Struct("<QQ8s")
+TRAILER_MAGIC = b"GBARIDX1"
+READ_SIZE = 1024 * 1024
+DEFAULT_LEVELS = {"zstd": 3, "xz": 6, "zlib": 6, "none": 0}
+
+
+def available_codecs():
+    """Codecs usable on this machine, best first"""
+    codecs = ["zstd"] if zstandard is not None else []
+    return codecs + ["xz", "zlib", "none"]
+
+
+def default_codec():
+    return available_codecs()[0]
+
+
+class _Identity:
+    def compress(self, data):
+        return data
+
+    decompress = compress
+
+    def flush(self):
+        return b""
+
+
+def _compressor(codec, level):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        return zstandard.ZstdCompressor(level=level).compressobj()
+    if codec == "xz":
+        return lzma.LZMACompressor(preset=level)
+    if codec == "zlib":
+        return zlib.compressobj(level)
+    if codec == "none":
+        return _Identity()
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def _decompressor(codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd archives require the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompressobj()
+    if codec == "xz":
+        return lzma.LZMADecompressor()
+    if codec == "zlib":
+        return zlib.decompressobj()
+    if codec == "none":
+        return _Identity()
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def write_archive(source_path, archive_path, codec=None, level=None, progress=None, capture=None):
+    """Stream source_path into a single compressed archive, returning its index.
+
+    Every file is compressed as an independent stream so it can later be
+    extracted on its own; the index of offsets is appended as a footer.
+    The archive is written in one pass next to its final name and renamed
+    into place once complete, so a failed or cancelled write leaves nothing.
+    With a core.capture.Capture, a member whose file changed while it was
+    compressed is truncated off and written again.
+    """
+    if capture is not None:
+        source_path = capture.read_path
+    codec = codec or default_codec()
+    level = DEFAULT_LEVELS[codec] if level is None else level
+
+    if os.path.isdir(source_path):
+        kind = 'dir'
+        walk = walk_files(source_path)
+    else:
+        kind = 'file'
+        walk = [(os.path.basename(source_path), None, False)]
+    if progress is not None:
+        # Walk up front so progress has a total to report against
+        walk = list(walk)
+        sizes = [entry.stat().st_size if entry is not None else os.path.getsize(source_path)
+                 for _, entry, is_dir in walk if not is_dir]
+        progress.add_total(sum(sizes), len(sizes))
+
+    tmp_path = archive_path + ".tmp"
+    files = []
+    dirs = []
+    try:
+        with open(tmp_path, 'wb') as out:
+            out.write(ARCHIVE_MAGIC)
+            for rel_path, entry, is_dir in walk:
+                if is_dir:
+                    dirs.append(rel_path)
+                    continue
+                full_path = entry.path if entry is not None else source_path
+                if capture is None:
+                    files.append(_write_member(out, rel_path, full_path, codec, level, progress))
+                    continue
+                offset = out.tell()
+
+                def _member():
+                    if out.tell() != offset:  # drop the torn attempt
+                        out.seek(offset)
+                        out.truncate()
+                    return _write_member(out, rel_path, full_path, codec, level, progress)
+                st = entry.stat() if entry is not None else os.stat(full_path)
+                files.append(capture.read(rel_path, full_path, st, _member, progress)[0])
+                if progress is not None:
+                    progress.advance(files=1)
+
+            index = {
+                'version': 1,
+                'created': datetime.now().timestamp(),
+                'source_path': capture.source_path if capture is not None else source_path,
+                'kind': kind,
+                'codec': codec,
+                'level': level,
+                'dirs': sorted(dirs),
+                'files': sorted(files, key=lambda e: e['path'])
+            }
+            if capture is not None:
+                index['unsettled'] = sorted(capture.unsettled)
+            index_offset = out.tell()
+            index_data = zlib.compress(json.dumps(index).encode('utf-8'))
+            out.write(index_data)
+            out.write(TRAILER.pack(index_offset, len(index_data), TRAILER_MAGIC))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, archive_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return index
+
+
+def _write_member(out, rel_path, full_path, codec, level, progress=None):
+    compressor = _compressor(codec, level)
+    digest = hashlib.blake2b(digest_size=32)
+    offset = out.tell()
+    with open(full_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        while True:
+            data = f.read(READ_SIZE)
+            if not data:
+                break
+            digest.update(data)
+            out.write(compressor.compress(data))
+            throttle(len(data))
+            if progress is not None:
+                progress.advance(len(data))
+    out.write(compressor.flush())
+    return {
+        'path': rel_path,
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'mode': st.st_mode & 0o7777,
+        'digest': digest.hexdigest(),
+        'offset': offset,
+        'length': out.tell() - offset
+    }
+
+
+class ArchiveReader:
+    """Random-access reader for archive snapshots.
+
+    Opening an archive only reads the trailer and the footer index, so
+    listing contents or extracting a single file never decompresses the
+    rest of the archive.
+    """
+
+    def __init__(self, archive_path):
+        self.path = archive_path
+        with open(archive_path, 'rb') as f:
+            f.seek(-TRAILER.size, os.SEEK_END)
+            index_offset, index_length, magic = TRAILER.unpack(f.read(TRAILER.size))
+            if magic != TRAILER_MAGIC:
+                raise ValueError(f"Not a backup archive: {archive_path}")
+            f.seek(index_offset)
+            self.index_offset = index_offset
+            self.index = json.loads(zlib.decompress(f.read(index_length)).decode('utf-8'))
+
+    @property
+    def files(self):
+        return self.index['files']
+
+    def find(self, rel_path):
+        for entry in self.files:
+            if entry['path'] == rel_path:
+                return entry
+        raise KeyError(rel_path)
+
+    def iter_member(self, entry, f):
+        """Yield the decompressed bytes of one member from an open archive"""
+        decompressor = _decompressor(self.index['codec'])
+        f.seek(entry['offset'])
+        remaining = entry['length']
+        while remaining:
+            data = f.read(min(READ_SIZE, remaining))
+            if not data:
+                raise ValueError(f"Archive truncated while reading {entry['path']}")
+            remaining -= len(data)
+            throttle(len(data))
+            yield decompressor.decompress(data)
+        if hasattr(decompressor, 'flush'):
+            yield decompressor.flush()
+
+    def extract(self, entry, dest_path, f=None):
+        """Write one member to dest_path with its original metadata, returning its size"""
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        own = f is None
+        if own:
+            f = open(self.path, 'rb')
+        try:
+            with open(dest_path, 'wb') as out:
+                for data in self.iter_member(entry, f):
+                    out.write(data)
+        finally:
+            if own:
+                f.close()
+        os.utime(dest_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+        os.chmod(dest_path, entry['mode'])
+        return entry['size']
+
+    def extract_all(self, dest_path, paths=None):
+        """Extract the archive (or only the given relative paths) under dest_path"""
+        if self.index['kind'] == 'file':
+            return self.extract(self.files[0], dest_path)
+
+        os.makedirs(dest_path, exist_ok=True)
+        wanted = set(paths) if paths is not None else None
+        if wanted is None:
+            for rel_dir in self.index['dirs']:
+                os.makedirs(native_path(dest_path, rel_dir), exist_ok=True)
+
+        written = 0
+        with open(self.path, 'rb') as f:
+            # Members are laid out in write order; reading in offset order
+            # keeps the archive access sequential.
+            for entry in sorted(self.files, key=lambda e: e['offset']):
+                if wanted is None or entry['path'] in wanted:
+                    written += self.extract(entry, native_path(dest_path, entry['path']), f)
+        return written
@@ -1,62 +1,78 @@
 import os
 import shutil
 import json
-import urllib.parse
 from datetime import datetime
+from core.object_store import (ObjectStore, OBJECTS_DIR, MANIFEST_SUFFIX, MANIFEST_VERSION,
+                               FOLDER_MANIFEST, DELTA_CHUNK_SIZE, is_manifest, save_manifest)
+from core.catalog import (Catalog, CATALOG_FILE, ARCHIVE_SUFFIX, SAFETY_LABEL, parse_snapshot_name,
+                          snapshot_record, is_safety)
+from core.throttle import TokenBucket
+from core.progress import Cancelled
+from core.config_store import ConfigStore, relative_backup_dir
+from core.metrics import MetricsRecorder, instrumented, span, capture
+from core.governor import install as install_governor
 
 CONFIG_FILE = "game_backup_config.json"
-SAVEGAME_PRO_URL = "https://savegame.pro/"
 DEFAULT_ROOT = os.path.abspath("C:\\GameBackups")
+SNAPSHOT_FORMATS = ("store", "folder", "archive")
+DEFAULT_FORMAT = "store"
+DEFAULT_PRUNE_RATE_MB = 32
+METRICS_DIR = "metrics"
 
 class GameBackupCore:
-    def __init__(self):
-        self.config = self._load_config()
+    def __init__(self, config_path=CONFIG_FILE):
+        self.config_path = os.path.abspath(config_path)
+        self._config_store = ConfigStore(self.config_path, DEFAULT_ROOT)
+        self._load_config()
+        self._metrics = MetricsRecorder.from_config(
+            self.config, os.path.join(os.path.dirname(self.config_path), METRICS_DIR)
+        )
+        self._install_governor()
         self._ensure_paths()
+        self._catalog_cache = None
+        self._pruner_instance = None
+        self._trash_swept = False
+        self._tree_cache = None
+        self._replication_queue = None
+        self._job_manager = None
 
-    def _load_config(self):
-        """Load or create configuration file"""
-        config_path = os.path.abspath(CONFIG_FILE)
-        
-        if not os.path.exists(config_path):
-            default_config = {
-                "root_backup_dir": DEFAULT_ROOT,
-                "games": {},
-                "version": "4.1"
-            }
-            with open(config_path, 'w') as f:
-                json.dump(default_config, f, indent=4)
-            return default_config
+    @property
+    def config(self):
+        """Current settings; treat as read-only and change them through edit_config()"""
+        return self._config_store.data
 
+    def _load_config(self):
+        """Load, create or migrate the configuration file"""
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-
-            config['root_backup_dir'] = os.path.normpath(config['root_backup_dir'])
-            
-            cleaned_games = {}
-            for game_name, game_config in config['games'].items():
-                clean_name = game_name.strip().lower()  # Case-insensitive game name
-                game_config['source_path'] = os.path.normpath(game_config['source_path'].strip())
-                game_config['backup_dir'] = os.path.normpath(
-                    os.path.join(config['root_backup_dir'], clean_name)
-                )
-                cleaned_games[clean_name] = game_config
-            
-            config['games'] = cleaned_games
-            return config
-            
+            return self._config_store.load()
         except Exception as e:
             raise RuntimeError(f"Configuration error: {str(e)}")
 
     def _save_config(self):
         """Save current configuration to file"""
-        config_path = os.path.abspath(CONFIG_FILE)
         try:
-            with open(config_path, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            self._config_store.save()
         except Exception as e:
             raise RuntimeError(f"Failed to save config: {str(e)}")
 
+    def edit_config(self):
+        """Context manager yielding a working copy of the settings.
+
+        Changes are applied and written once when the outermost block ends,
+        so wrapping many add_game() calls in one block writes the file once.
+        """
+        return self._config_store.edit()
+
+    def _install_governor(self):
+        """Pace and deprioritise backup I/O as the `io_governor` setting asks, or stop doing so"""
+        settings = self.config.get('io_governor')
+        if not settings or not settings.get('enabled', True):
+            install_governor(None)
+            return
+        from core.governor import IOGovernor
+
+        install_governor(IOGovernor.from_config(settings, list(self.config['games'].values())))
+
     def _ensure_paths(self):
         """Create all required directories"""
         try:
@@ -66,38 +82,114 @@ class GameBackupCore:
         except Exception as e:
             raise RuntimeError(f"Path creation failed: {str(e)}")
 
+    def _object_store(self):
+        """Object store living under the current root backup directory"""
+        return ObjectStore(
+            self.config['root_backup_dir'],
+            delta_chunk_size=self.config.get('delta_chunk_kb', DELTA_CHUNK_SIZE // 1024) * 1024,
+            manifest_dirs=[cfg['backup_dir'] for cfg in self.config['games'].values()]
+        )
+
+    def _catalog(self):
+        """Snapshot catalog for the current root backup directory"""
+        root = self.config['root_backup_dir']
+        if self._catalog_cache is None or self._catalog_cache.root_dir != root:
+            catalog = Catalog(root)
+            if not catalog.exists():
+                # First run on this root: index whatever snapshots already exist
+                games = {name: cfg['backup_dir'] for name, cfg in self.config['games'].items()}
+                catalog.reconcile(games, self._describe_snapshot)
+            self._catalog_cache = catalog
+        return self._catalog_cache
+
+    def _describe_snapshot(self, game_name, snapshot_path, snapshot_format):
+        """Build a catalog record by reading an existing snapshot"""
+        from core.snapshots import open_snapshot
+
+        source = self.config['games'][game_name]['source_path']
+        snapshot = open_snapshot(snapshot_path, source, self._object_store())
+        return snapshot_record(snapshot_path, snapshot_format, snapshot.files,
+                               os.path.getmtime(snapshot_path))
+
+    def profile_operation(self, path, memory=False):
+        """Context manager writing a cProfile (and with memory=True a tracemalloc) capture of the block to path"""
+        return capture(path, memory)
+
+    def reconcile_catalog(self):
+        """Re-sync the snapshot catalog with the backup directories on disk"""
+        try:
+            games = {name: cfg['backup_dir'] for name, cfg in self.config['games'].items()}
+            added, removed = self._catalog().reconcile(games, self._describe_snapshot)
+            return True, f"Catalog reconciled: {added} added, {removed} removed"
+        except Exception as e:
+            return False, f"Catalog reconcile failed: {str(e)}"
+
+    def _copy_engine(self, progress=None):
+        """Parallel copy engine tuned from the settings file"""
+        from core.copier import CopyEngine, DEFAULT_WORKERS, DEFAULT_BUFFER_SIZE
+
+        return CopyEngine(
+            workers=self.config.get('copy_workers', DEFAULT_WORKERS),
+            buffer_size=self.config.get('copy_buffer_mb', DEFAULT_BUFFER_SIZE // (1024 * 1024)) * 1024 * 1024,
+            progress=progress
+        )
+
+    def _file_index(self, game_name, snapshot_format):
+        """File-state index of the newest snapshot in the given format"""
+        from core.file_index import FileIndex
+
+        latest = next(
+            (b for b in self.get_backups(game_name) if b['format'] == snapshot_format),
+            None
+        )
+        index = FileIndex(self.config['games'][game_name]['backup_dir'])
+        with span("index"):
+            index.ensure(latest['path'] if latest else None, snapshot_format)
+        return index
+
     # ========== GAME MANAGEMENT METHODS ==========
 
-    def add_game(self, game_name, source_path):
-        """Add new game to configuration with validation"""
+    @instrumented("add_game")
+    def add_game(self, game_name, source_path, processes=None):
+        """Add new game to configuration with validation.
+
+        processes are the game's executable names, which the I/O governor
+        uses to tell that it is running.
+        """
         cleaned_name = game_name.strip().lower()  # Case-insensitive game name
 
-        if cleaned_name in self.config['games']:
-            raise ValueError(f"'{cleaned_name}' already exists. Use a unique name.")
+        if cleaned_name == OBJECTS_DIR:
+            raise ValueError(f"'{cleaned_name}' is reserved. Use another name.")
 
         source_path = source_path.strip()
         if not os.path.exists(source_path):
             raise ValueError(f"Source path does not exist: {source_path}")
 
-        self.config['games'][cleaned_name] = {
-            'source_path': os.path.normpath(source_path),
-            'backup_dir': os.path.normpath(
-                os.path.join(self.config['root_backup_dir'], cleaned_name)
-            )
-        }
-        
-        self._save_config()
-        self._ensure_paths()
+        with self.edit_config() as config:
+            if cleaned_name in config['games']:
+                raise ValueError(f"'{cleaned_name}' already exists. Use a unique name.")
+            backup_dir = os.path.normpath(os.path.join(config['root_backup_dir'], cleaned_name))
+            config['games'][cleaned_name] = {
+                'source_path': os.path.normpath(source_path),
+                'backup_dir': backup_dir
+            }
+            if processes:
+                config['games'][cleaned_name]['processes'] = list(processes)
+        # Not _ensure_paths(): inside an outer edit_config() block the game is not in self.config yet
+        os.makedirs(backup_dir, exist_ok=True)
+        self._install_governor()  # watch the new save folder for open handles
         
         return True, f"Successfully added: {cleaned_name}"
 
+    @instrumented("remove_game")
     def remove_game(self, game_name):
         """Remove game from configuration"""
         cleaned_name = game_name.strip().lower()  # Case-insensitive game name
         
         try:
-            del self.config['games'][cleaned_name]
-            self._save_config()
+            with self.edit_config() as config:
+                del config['games'][cleaned_name]
+            self._install_governor()
             return True, f"Removed game: {cleaned_name}"
         except KeyError:
             return False, f"Game not found: {cleaned_name}"
@@ -106,6 +198,60 @@ class GameBackupCore:
         """Get current root backup directory"""
         return self.config['root_backup_dir']
 
+    @instrumented("set_root", game=False)
+    def set_root_directory(self, new_root):
+        """Point the backup root somewhere else.
+
+        Game backup dirs under the old root move with it; ones configured
+        outside the root stay where they are. Existing backups are not moved.
+        """
+        new_root = os.path.normpath(new_root)
+        with self.edit_config() as config:
+            old_root = config['root_backup_dir']
+            for game_config in config['games'].values():
+                rel_path = relative_backup_dir(game_config['backup_dir'], old_root)
+                game_config['backup_dir'] = os.path.normpath(os.path.join(new_root, rel_path))
+            config['root_backup_dir'] = new_root
+        self._ensure_paths()
+        return True, f"Root directory set to {new_root}"
+
+    @instrumented("move_root", game=False)
+    def migrate_root_directory(self, new_root, progress=None):
+        """Move every backup under the current root to new_root and switch the settings to it.
+
+        Same-disk moves are renames; moves to another disk copy, verify and
+        only then delete the originals. An interrupted or cancelled move is
+        resumed by calling this again with the same new_root. Game backup
+        dirs configured outside the root are left where they are.
+        """
+        from core.migrate import RootMigration, load_journal, nested
+
+        try:
+            new_root = os.path.normpath(new_root)
+            old_root = self.config['root_backup_dir']
+            journal = load_journal(new_root)
+            if journal is not None and os.path.normcase(old_root) == os.path.normcase(new_root):
+                old_root = journal['from']  # the settings switched before the old copies were deleted
+            elif nested(old_root, new_root):
+                return False, "The new root must not be inside the current one (or contain it)"
+
+            if self._pruner_instance is not None:
+                self._pruner_instance.join()  # nothing may be deleted from under the move
+            names = {OBJECTS_DIR, CATALOG_FILE}
+            for cfg in self.config['games'].values():
+                rel_path = relative_backup_dir(cfg['backup_dir'], old_root)
+                if not os.path.isabs(rel_path):
+                    names.add(rel_path.split(os.sep)[0])
+
+            migration = RootMigration(old_root, new_root, sorted(names), self._copy_engine(progress), progress)
+            renamed, copied_bytes = migration.run(on_switch=lambda: self.set_root_directory(new_root))
+            return True, (f"Backups moved to {new_root} ({renamed} renamed, "
+                          f"{copied_bytes / (1024 * 1024):.2f} MB copied)")
+        except Cancelled:
+            return False, "Move cancelled; choose the same folder again to resume"
+        except Exception as e:
+            return False, f"Move failed: {str(e)}"
+
     def list_games(self):
         """Get list of all registered game names"""
         return [name for name in self.config['games'].keys()]
@@ -113,135 +259,736 @@ class GameBackupCore:
     # ========== BACKUP/RESTORE METHODS ==========
 
     
-    def create_backup(self, game_name):
-        """Create backup with validation"""
+    def create_backup(self, game_name, progress=None):
+        """Create backup with validation.
+
+        progress is an optional core.progress.Progress that receives
+        byte/file events and carries the token used to cancel the backup.
+        """
+        success, message, _ = self._backup_game(game_name, progress=progress)
+        if success:
+            self.prune_backups(game_name)
+            self._queue_replication([game_name])
+        return success, message
+
+    @instrumented("backup")
+    def _backup_game(self, game_name, label=None, progress=None):
+        """Create a backup, returning (success, message, bytes copied)"""
         try:
             game_name = game_name.strip().lower()  # Case-insensitive game name
             cfg = self.config['games'][game_name]
+            if progress is not None:
+                progress.check()
             
             if not os.path.exists(cfg['source_path']):
-                return False, f"Source path not found: {cfg['source_path']}"
+                return False, f"Source path not found: {cfg['source_path']}", 0
                 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_dir = os.path.join(cfg['backup_dir'], f"backup_{timestamp}")
-            
-            if os.path.isdir(cfg['source_path']):
-                shutil.copytree(cfg['source_path'], backup_dir, dirs_exist_ok=True)
-            else:
-                os.makedirs(backup_dir, exist_ok=True)
-                shutil.copy2(cfg['source_path'], backup_dir)
-            
-            # Ensure the backup folder itself has the correct timestamp
-            current_time = datetime.now().timestamp()
-            os.utime(backup_dir, (current_time, current_time))
-            
-            return True, f"Backup created: {os.path.basename(backup_dir)}"
+            timestamp = self._snapshot_stamp(game_name, label)
+            snapshot_format = cfg.get('format', DEFAULT_FORMAT)
+            if snapshot_format not in SNAPSHOT_FORMATS:
+                return False, f"Unknown snapshot format: {snapshot_format}", 0
+            with self._capture(cfg) as capture:
+                if snapshot_format == "archive":
+                    snapshot_path, entries, message, copied = self._create_archive_backup(
+                        cfg, timestamp, capture, progress)
+                elif snapshot_format == "folder":
+                    index = self._file_index(game_name, snapshot_format)
+                    snapshot_path, entries, message, copied = self._create_folder_backup(
+                        cfg, timestamp, index, capture, progress)
+                else:
+                    index = self._file_index(game_name, snapshot_format)
+                    snapshot_path, entries, message, copied = self._create_store_backup(
+                        cfg, timestamp, index, capture, progress)
+            if capture.unsettled:
+                message += f" - {len(capture.unsettled)} files kept changing and may be inconsistent"
+
+            record = snapshot_record(snapshot_path, snapshot_format, entries, datetime.now().timestamp())
+            record['unsettled'] = len(capture.unsettled)
+            # What this snapshot added on disk, so sizes never need a tree walk
+            record['disk_size'] = copied
+            if snapshot_format == "store":
+                record['disk_size'] += os.path.getsize(snapshot_path)
+            with span("catalog"):
+                self._catalog().add(game_name, record)
+            return True, message, copied
             
+        except Cancelled:
+            return False, "Backup cancelled", 0
+        except KeyError:
+            return False, f"Game not found: {game_name}", 0
+        except Exception as e:
+            return False, f"Backup failed: {str(e)}", 0
+
+    def _snapshot_stamp(self, game_name, label=None):
+        """Name part of a new snapshot, with a counter if one was already taken this second"""
+        base = datetime.now().strftime("%Y%m%d_%H%M%S")
+        taken = {b['name'] for b in self.get_backups(game_name)}
+        stamp, n = base, 1
+        while f"backup_{stamp}{'_' + label if label else ''}" in taken:
+            n += 1
+            stamp = f"{base}_{n}"
+        return f"{stamp}_{label}" if label else stamp
+
+    def _capture(self, cfg):
+        """Change-safe reader for a game's save folder (global `capture` settings, overridden per game)"""
+        from core.capture import Capture
+
+        settings = {**self.config.get('capture', {}), **cfg.get('capture', {})}
+        return Capture.from_config(cfg['source_path'], settings)
+
+    def _create_store_backup(self, cfg, timestamp, index, capture, progress=None):
+        """Add the source to the object store and write a manifest"""
+        manifest_path = os.path.join(cfg['backup_dir'], f"backup_{timestamp}{MANIFEST_SUFFIX}")
+        new_bytes, manifest = self._object_store().snapshot(
+            cfg['source_path'], manifest_path, index, self._copy_engine(progress), progress, capture
+        )
+        with span("index"):
+            index.reset(manifest_path, "store", capture.index_files({e['path']: e for e in manifest['files']}))
+            index.save()
+        message = f"Backup created: backup_{timestamp} ({new_bytes / (1024 * 1024):.2f} MB new data)"
+        return manifest_path, manifest['files'], message, new_bytes
+
+    def _create_folder_backup(self, cfg, timestamp, index, capture, progress=None):
+        """Create a directory copy, hard-linking files unchanged since the last one.
+
+        The copy is built under a .tmp name and renamed into place when
+        complete, so a failed or cancelled backup never looks like a snapshot.
+        """
+        from core.copier import walk_files, copy2_digest
+        from core.file_index import file_state
+
+        backup_dir = os.path.join(cfg['backup_dir'], f"backup_{timestamp}")
+        work_dir = backup_dir + ".tmp"
+        previous_dir = (os.path.join(cfg['backup_dir'], index.snapshot)
+                        if index.snapshot else None)
+        source = capture.read_path
+
+        if os.path.isdir(source):
+            entries = walk_files(source)
+        else:
+            entries = [(os.path.basename(source), None, False)]
+
+        shutil.rmtree(work_dir, ignore_errors=True)
+        os.makedirs(work_dir)
+        try:
+            files = {}
+            dirs = []
+            to_copy = []
+            with span("scan"):
+                for rel_path, entry, is_dir in entries:
+                    dest = os.path.join(work_dir, *rel_path.split('/'))
+                    if is_dir:
+                        os.makedirs(dest, exist_ok=True)
+                        dirs.append(rel_path)
+                        continue
+
+                    src = entry.path if entry is not None else source
+                    st = entry.stat() if entry is not None else os.stat(source)
+                    size, mtime_ns, ino = file_state(st)
+                    files[rel_path] = {'path': rel_path, 'size': size, 'mtime_ns': mtime_ns, 'ino': ino,
+                                       'mode': st.st_mode & 0o7777}
+                    # Only link files whose digest is already known; the rest are
+                    # hashed while they are copied.
+                    previous = index.lookup(rel_path, st) if previous_dir else None
+                    if previous and previous.get('digest') and self._link_previous(previous_dir, rel_path, dest):
+                        files[rel_path]['digest'] = previous['digest']
+                    else:
+                        to_copy.append((src, dest, rel_path, st))
+
+            if progress is not None:
+                progress.add_total(sum(st.st_size for _, _, _, st in to_copy), len(to_copy))
+            engine = self._copy_engine(progress)
+
+            def _copy(item):
+                src, dest, rel_path, st = item
+
+                def _attempt():
+                    result = copy2_digest(src, dest, engine.buffer_size)
+                    if progress is not None:
+                        progress.advance(result[0])
+                    return result
+                (copied, digest), st = capture.read(rel_path, src, st, _attempt, progress)
+                if progress is not None:
+                    progress.advance(files=1)
+                return copied, digest, st
+
+            copied_bytes = 0
+            with span("copy") as phase:
+                for (_, _, rel_path, _), (copied, digest, st) in zip(to_copy, engine.run(_copy, to_copy)):
+                    files[rel_path].update(size=copied, digest=digest, mtime_ns=st.st_mtime_ns)
+                    copied_bytes += copied
+                phase.add(copied_bytes, len(to_copy))
+
+            with span("manifest"):
+                save_manifest({
+                    'version': MANIFEST_VERSION,
+                    'created': datetime.now().timestamp(),
+                    'source_path': cfg['source_path'],
+                    'kind': 'dir' if os.path.isdir(source) else 'file',
+                    'dirs': sorted(dirs),
+                    'files': sorted(files.values(), key=lambda e: e['path']),
+                    'unsettled': sorted(capture.unsettled)
+                }, os.path.join(work_dir, FOLDER_MANIFEST))
+            os.rename(work_dir, backup_dir)
+        except BaseException:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+
+        # Ensure the backup folder itself has the correct timestamp
+        current_time = datetime.now().timestamp()
+        os.utime(backup_dir, (current_time, current_time))
+
+        with span("index"):
+            index.reset(backup_dir, "folder", capture.index_files(files))
+            index.save()
+        
+        message = f"Backup created: {os.path.basename(backup_dir)} ({len(to_copy)} files copied)"
+        return backup_dir, list(files.values()), message, copied_bytes
+
+    def _create_archive_backup(self, cfg, timestamp, capture, progress=None):
+        """Stream the source into a single compressed archive"""
+        from core.archive import write_archive
+
+        archive_path = os.path.join(cfg['backup_dir'], f"backup_{timestamp}{ARCHIVE_SUFFIX}")
+        with span("compress"):
+            index = write_archive(
+                cfg['source_path'], archive_path,
+                codec=cfg.get('compression'),
+                level=cfg.get('compression_level'),
+                progress=progress,
+                capture=capture
+            )
+        size = os.path.getsize(archive_path)
+        message = f"Backup created: backup_{timestamp} ({size / (1024 * 1024):.2f} MB, {index['codec']})"
+        return archive_path, index['files'], message, size
+
+    def _link_previous(self, previous_dir, rel_path, dest):
+        """Hard-link an unchanged file from the previous snapshot"""
+        try:
+            os.link(os.path.join(previous_dir, *rel_path.split('/')), dest)
+            return True
+        except OSError:
+            # Missing file or a filesystem without hard links: copy instead
+            return False
+
+    def restore_backup(self, game_name, backup_path, paths=None, progress=None):
+        """Restore backup with validation.
+
+        paths optionally limits the restore to those relative file (or
+        folder) paths, leaving the rest of the save folder untouched.
+        progress works as in create_backup; a cancelled restore leaves the
+        save folder as it was.
+        """
+        success, message, _ = self._restore_game(game_name, backup_path, paths, progress)
+        return success, message
+
+    def _snapshot_tree(self, game_name, backup_path):
+        """Browsable tree of a snapshot; the last one opened is kept for paging through it"""
+        from core.snapshots import open_snapshot, SnapshotTree
+
+        game_name = game_name.strip().lower()  # Case-insensitive game name
+        backup_path = os.path.normpath(backup_path)
+        key = (backup_path, os.path.getmtime(backup_path))
+        cached = self._tree_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        source = self.config['games'][game_name]['source_path']
+        tree = SnapshotTree(open_snapshot(backup_path, source, self._object_store()))
+        self._tree_cache = (key, tree)
+        return tree
+
+    def list_backup_files(self, game_name, backup_path, folder=""):
+        """Contents of one folder of a backup, read from its manifest or index.
+
+        Returns [{'name', 'path', 'is_dir', 'size', 'mtime'}], folders first;
+        path is relative to the save folder and can be passed to
+        restore_backup(paths=...) or export_backup_files().
+        """
+        try:
+            listing = []
+            for name, rel_path, entry in self._snapshot_tree(game_name, backup_path).list(folder):
+                listing.append({
+                    'name': name,
+                    'path': rel_path,
+                    'is_dir': entry is None,
+                    'size': entry['size'] if entry else None,
+                    'mtime': entry['mtime_ns'] / 1e9 if entry else None
+                })
+            return listing
+        except Exception:
+            return []
+
+    @instrumented("export")
+    def export_backup_files(self, game_name, backup_path, paths, dest_dir, progress=None):
+        """Copy the given files (or folders) out of a backup into dest_dir, keeping their relative paths"""
+        from core.copier import native_path
+
+        try:
+            if progress is not None:
+                progress.check()
+            tree = self._snapshot_tree(game_name, backup_path)
+            entries = tree.select(paths)
+            if not entries:
+                return False, "Nothing to export"
+            snapshot = tree.snapshot
+            if progress is not None:
+                progress.add_total(sum(entry['size'] for entry in entries), len(entries))
+
+            def _extract(entry):
+                dest = native_path(dest_dir, entry['path'])
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                written = snapshot.extract(entry, dest)
+                if progress is not None:
+                    progress.advance(written, 1)
+                return written
+
+            with span("extract"):
+                written = sum(self._copy_engine(progress).run(_extract, entries))
+            return True, f"Exported {len(entries)} files ({written / (1024 * 1024):.2f} MB) to {dest_dir}"
+        except Cancelled:
+            return False, "Export cancelled"
         except KeyError:
             return False, f"Game not found: {game_name}"
         except Exception as e:
-            return False, f"Backup failed: {str(e)}"
+            return False, f"Export failed: {str(e)}"
+
+    def compare_backups(self, game_name, old_path, new_path):
+        """Which files were added, removed or changed between two backups.
+
+        Compares the manifests (content digests where both have them), so
+        no backup is extracted. Returns {'added', 'removed', 'changed':
+        [paths], 'unchanged': count}.
+        """
+        from core.snapshots import diff_snapshots
+
+        old = self._snapshot_tree(game_name, old_path).snapshot
+        new = self._snapshot_tree(game_name, new_path).snapshot
+        return diff_snapshots(old, new)
+
+    @instrumented("restore")
+    def _restore_game(self, game_name, backup_path, paths=None, progress=None):
+        """Restore a backup, returning (success, message, bytes copied)"""
+        from core.snapshots import open_snapshot
+        from core.restore import RestorePlan
 
-    def restore_backup(self, game_name, backup_path):
-        """Restore backup with validation"""
         try:
+            if progress is not None:
+                progress.check()
             game_name = game_name.strip().lower()  # Case-insensitive game name
             cfg = self.config['games'][game_name]
             backup_path = os.path.normpath(backup_path)
             
             if not os.path.exists(backup_path):
-                return False, "Backup file/directory not found"
+                return False, "Backup file/directory not found", 0
                 
             source = cfg['source_path']
-            if os.path.isdir(source):
-                shutil.rmtree(source, ignore_errors=True)
-            elif os.path.exists(source):
-                os.remove(source)
-                
-            if os.path.isdir(backup_path):
-                shutil.copytree(backup_path, source, dirs_exist_ok=True)
-            else:
-                os.makedirs(os.path.dirname(source), exist_ok=True)
-                shutil.copy2(backup_path, source)
+            with span("plan"):
+                plan = RestorePlan(open_snapshot(backup_path, source, self._object_store()), source, paths)
+            if plan.is_noop:
+                return True, "Restore completed successfully (already up to date)", 0
+
+            if self.config.get('safety_snapshot', True) and os.path.exists(source):
+                success, message, _ = self._backup_game(game_name, label=SAFETY_LABEL, progress=progress)
+                if not success:
+                    return False, f"Restore aborted, safety snapshot failed: {message}", 0
+
+            copied_bytes = plan.apply(self._copy_engine(progress), progress)
                 
-            return True, "Restore completed successfully"
+            return True, "Restore completed successfully", copied_bytes
             
+        except Cancelled:
+            return False, "Restore cancelled", 0
         except KeyError:
-            return False, f"Game not found: {game_name}"
+            return False, f"Game not found: {game_name}", 0
         except Exception as e:
-            return False, f"Restore failed: {str(e)}"
+            return False, f"Restore failed: {str(e)}", 0
 
     def get_backups(self, game_name):
-        """Get sorted list of backups"""
+        """Get sorted list of backups from the snapshot catalog"""
         try:
             game_name = game_name.strip().lower()  # Case-insensitive game name
             backup_dir = self.config['games'][game_name]['backup_dir']
-            
-            if not os.path.exists(backup_dir):
-                return []
 
             backups = []
-            for entry in os.listdir(backup_dir):
-                if entry.startswith("backup_"):
-                    backup_path = os.path.join(backup_dir, entry)
-                    if os.path.exists(backup_path):
-                        mtime = os.path.getmtime(backup_path)
-                        backups.append({
-                            'path': backup_path,
-                            'name': entry,
-                            'timestamp': mtime,
-                            'formatted_date': datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
-                        })
-            
-            return sorted(backups, key=lambda x: x['timestamp'], reverse=True)
+            for snapshot in self._catalog().list(game_name):
+                backups.append({
+                    'path': os.path.join(backup_dir, snapshot['file']),
+                    'name': snapshot['id'],
+                    'format': snapshot['format'],
+                    'safety': is_safety(snapshot['id']),
+                    'timestamp': snapshot['timestamp'],
+                    'formatted_date': datetime.fromtimestamp(snapshot['timestamp']).strftime("%Y-%m-%d %H:%M:%S"),
+                    'size': snapshot['size'],
+                    'disk_size': snapshot.get('disk_size'),
+                    'files': snapshot['files'],
+                    'unsettled': snapshot.get('unsettled', 0),
+                    'hash': snapshot['hash']
+                })
+            return backups
         except Exception:
             return []
 
-    def update_all_backups(self):
-        """Update all game backups"""
-        results = {}
+    def get_size_summary(self):
+        """Logical and on-disk totals per game and for the whole root, from the catalog.
+
+        disk totals only include snapshots whose on-disk size is known;
+        'pending' counts the ones the background size walker has not reached.
+        """
+        summary = {'games': {}, 'logical': 0, 'disk': 0, 'snapshots': 0, 'pending': 0}
+        catalog = self._catalog()
         for game_name in self.config['games']:
-            success, message = self.create_backup(game_name)
-            results[game_name] = {'success': success, 'message': message}
+            snapshots = catalog.list(game_name)
+            game = {
+                'logical': sum(s['size'] for s in snapshots),
+                'disk': sum(s.get('disk_size') or 0 for s in snapshots),
+                'snapshots': len(snapshots),
+                'pending': sum(1 for s in snapshots if s.get('disk_size') is None)
+            }
+            summary['games'][game_name] = game
+            for key in ('logical', 'disk', 'snapshots', 'pending'):
+                summary[key] += game[key]
+        return summary
+
+    def start_size_walker(self, on_update=None):
+        """Fill in on-disk sizes of older snapshots on a background thread"""
+        from core.sizes import SizeWalker
+
+        games = {name: cfg['backup_dir'] for name, cfg in self.config['games'].items()}
+        walker = SizeWalker(self._catalog(), self._object_store(), games, on_update)
+        walker.start()
+        return walker
+
+    def start_watcher(self, on_backup=None):
+        """Back up games automatically once their save folders stop changing.
+
+        on_backup(game, success, message) is called after each automatic
+        backup. Call stop() on the returned watcher to end watch mode.
+        """
+        from core.watcher import SaveWatcher
+
+        watcher = SaveWatcher(self, on_backup)
+        watcher.start()
+        return watcher
+
+    def job_manager(self):
+        """Shared queue that runs operations on a bounded pool, one at a time per game (`job_workers`)"""
+        if self._job_manager is None:
+            from core.jobs import JobManager, DEFAULT_JOB_WORKERS
+
+            self._job_manager = JobManager(workers=self.config.get('job_workers', DEFAULT_JOB_WORKERS))
+        return self._job_manager
+
+    def get_jobs(self):
+        """Running, queued and recently finished jobs as status dicts"""
+        if self._job_manager is None:
+            return []
+        return self._job_manager.jobs()
+
+    def shutdown_jobs(self, timeout=None):
+        """Cancel queued and running jobs and wait for them to stop"""
+        if self._job_manager is not None:
+            self._job_manager.shutdown(cancel=True, timeout=timeout)
+
+    def _scheduler(self):
+        """Multi-game scheduler configured from the settings file"""
+        from core.scheduler import GameScheduler, DEFAULT_MAX_WORKERS, DEFAULT_PER_VOLUME
+
+        return GameScheduler(
+            max_workers=self.config.get('max_parallel_games', DEFAULT_MAX_WORKERS),
+            per_volume=self.config.get('per_volume_limit', DEFAULT_PER_VOLUME),
+            backup_volume=self.config.get('backup_volume_limit')
+        )
+
+    @instrumented("update_all", game=False)
+    def update_all_backups(self, on_result=None, progress=None):
+        """Update all game backups in parallel.
+
+        Each result also carries 'duration' (seconds) and 'bytes' copied.
+        on_result(game, result) is called as each game finishes. One
+        progress tracker covers every game; once cancelled, games that have
+        not started yet report "cancelled" straight away.
+        """
+        jobs = [
+            (game_name, cfg['source_path'], cfg['backup_dir'], lambda g=game_name: self._backup_game(g, progress=progress))
+            for game_name, cfg in self.config['games'].items()
+        ]
+        results = self._scheduler().run(jobs, on_result)
+        self.prune_backups()
+        self._queue_replication([game_name for game_name, result in results.items() if result['success']])
         return results
 
-    def restore_all_backups(self):
-        """Restore all games to latest backup"""
-        results = {}
-        for game_name in self.config['games']:
-            backups = self.get_backups(game_name)
+    @instrumented("restore_all", game=False)
+    def restore_all_backups(self, on_result=None, progress=None):
+        """Restore all games to latest backup in parallel"""
+        def _restore_latest(game_name):
+            backups = [b for b in self.get_backups(game_name) if not b['safety']]
             if not backups:
-                results[game_name] = {'success': False, 'message': "No backups available"}
-                continue
-                
-            success, message = self.restore_backup(game_name, backups[0]['path'])
-            results[game_name] = {'success': success, 'message': message}
-        return results
+                return False, "No backups available", 0
+            return self._restore_game(game_name, backups[0]['path'], progress=progress)
+
+        jobs = [
+            (game_name, cfg['source_path'], cfg['backup_dir'], lambda g=game_name: _restore_latest(g))
+            for game_name, cfg in self.config['games'].items()
+        ]
+        return self._scheduler().run(jobs, on_result)
     
     def delete_backup(self, game_name, backup_path):
         """Delete a specific backup"""
         try:
             game_name = game_name.strip().lower()  # Case-insensitive game name
             backup_path = os.path.normpath(backup_path)
+            parsed = parse_snapshot_name(os.path.basename(backup_path))
+            if parsed is not None:
+                self._catalog().remove(game_name, parsed[0])
             if not os.path.exists(backup_path):
                 return False, "Backup not found"
             if os.path.isdir(backup_path):
                 shutil.rmtree(backup_path)
             else:
                 os.remove(backup_path)
+            if is_manifest(backup_path):
+                self.collect_garbage()
             return True, "Backup deleted successfully"
         except Exception as e:
             return False, f"Deletion failed: {str(e)}"
         
 
+    # ========== REPLICATION ==========
+
+    def _game_prefix(self, game_name):
+        """Where a game's snapshots live on a replication target, mirroring the backup root"""
+        backup_dir = self.config['games'][game_name]['backup_dir']
+        prefix = relative_backup_dir(backup_dir, self.config['root_backup_dir'])
+        if os.path.isabs(prefix):
+            prefix = game_name  # kept outside the root
+        return prefix.replace(os.sep, '/')
+
+    def _queue_replication(self, games):
+        """Replicate games in the background after a backup, if targets are configured"""
+        settings = self.config.get('replication') or {}
+        if not games or not settings.get('targets') or not settings.get('auto', True):
+            return
+        if self._replication_queue is None:
+            from core.replication import ReplicationQueue
+
+            self._replication_queue = ReplicationQueue(self._replicate_game)
+        for game_name in games:
+            self._replication_queue.submit(game_name)
+
+    def wait_for_replication(self):
+        """Block until background replication queued by earlier backups has finished"""
+        if self._replication_queue is not None:
+            self._replication_queue.join()
+
+    def replicate_backups(self, game_name, progress=None):
+        """Send a game's snapshots to every replication target that lacks them.
+
+        Only missing blobs and files are transferred and an interrupted run
+        resumes where it stopped; one failing target does not stop the
+        others. progress works as in create_backup.
+        """
+        success, message, _ = self._replicate_game(game_name, progress)
+        return success, message
+
+    @instrumented("replicate")
+    def _replicate_game(self, game_name, progress=None):
+        """Replicate a game's snapshots, returning (success, message, bytes sent)"""
+        from core.replication import Replicator, make_target, REPLICA_SUFFIXES, DEFAULT_REPLICATION_WORKERS
+        from core.copier import CopyEngine
+
+        try:
+            game_name = game_name.strip().lower()  # Case-insensitive game name
+            prefix = self._game_prefix(game_name)
+            settings = self.config.get('replication') or {}
+            if not settings.get('targets'):
+                return False, "No replication targets configured", 0
+
+            snapshots = [b['path'] for b in reversed(self.get_backups(game_name))]
+            engine = CopyEngine(workers=settings.get('workers', DEFAULT_REPLICATION_WORKERS), progress=progress)
+            messages = []
+            failed = False
+            total = 0
+            for target_settings in settings['targets']:
+                target = make_target(target_settings)
+                codec = target_settings.get('compression')
+                try:
+                    if codec is not None and codec not in REPLICA_SUFFIXES:
+                        raise ValueError(f"Unknown replica compression: {codec}")
+                    replicator = Replicator(target, self.config['root_backup_dir'], engine, codec)
+                    with span("upload") as phase:
+                        sent, sent_bytes = replicator.replicate(prefix, snapshots, progress)
+                        phase.add(sent_bytes, sent)
+                    total += sent_bytes
+                    messages.append(f"{target.name}: {sent} snapshots sent ({sent_bytes / (1024 * 1024):.2f} MB)")
+                except Cancelled:
+                    raise
+                except Exception as e:
+                    failed = True
+                    messages.append(f"{target.name}: failed ({str(e)})")
+            return not failed, "; ".join(messages), total
+
+        except Cancelled:
+            return False, "Replication cancelled", 0
+        except KeyError:
+            return False, f"Game not found: {game_name}", 0
+        except Exception as e:
+            return False, f"Replication failed: {str(e)}", 0
+
+    def _pruner(self):
+        """Background deleter shared by every prune pass"""
+        if self._pruner_instance is None:
+            from core.retention import Pruner
+
+            rate = self.config.get('prune_rate_mb', DEFAULT_PRUNE_RATE_MB) * 1024 * 1024
+            limiter = TokenBucket(rate)
+            self._pruner_instance = Pruner(
+                limiter,
+                on_done=lambda: self._object_store().collect_garbage(limiter)
+            )
+        return self._pruner_instance
+
+    @instrumented("prune")
+    def prune_backups(self, game_name=None, wait=False):
+        """Apply retention rules to one game (or all), deleting expired backups in the background"""
+        from core.retention import effective_policy, select_expired, move_to_trash, find_trash
+
+        try:
+            if game_name:
+                games = [game_name.strip().lower()]  # Case-insensitive game name
+            else:
+                games = list(self.config['games'])
+
+            trash = []
+            if not self._trash_swept:
+                # Finish deletions an earlier run was interrupted in
+                backup_dirs = [cfg['backup_dir'] for cfg in self.config['games'].values()]
+                trash.extend(find_trash(backup_dirs))
+                self._trash_swept = True
+
+            catalog = self._catalog()
+            in_use = 0
+            with span("select"):
+                for name in games:
+                    cfg = self.config['games'][name]
+                    policy = effective_policy(self.config, cfg)
+                    for snapshot in select_expired(catalog.list(name), policy):
+                        try:
+                            trash.append(move_to_trash(os.path.join(cfg['backup_dir'], snapshot['file'])))
+                        except FileNotFoundError:
+                            pass
+                        except OSError:
+                            in_use += 1  # e.g. a file held open on Windows; kept listed and retried next prune
+                            continue
+                        catalog.remove(name, snapshot['id'])
+
+            if trash:
+                self._pruner().submit(trash)
+            if wait and self._pruner_instance is not None:
+                with span("delete"):
+                    self._pruner_instance.join()
+            message = f"Pruned {len(trash)} expired backups"
+            if in_use:
+                message += f" ({in_use} could not be moved and were kept)"
+            return True, message
+        except KeyError:
+            return False, f"Game not found: {game_name}"
+        except Exception as e:
+            return False, f"Pruning failed: {str(e)}"
+
+    def _verifier(self, fast=False):
+        """Snapshot verifier sized from the settings file"""
+        from core.integrity import Verifier, DEFAULT_VERIFY_WORKERS
+
+        return Verifier(self._object_store(), fast, self.config.get('verify_workers', DEFAULT_VERIFY_WORKERS))
+
+    def _verify_snapshot(self, verifier, game_name, backup_path):
+        """Verify one snapshot, returning (success, message, files checked or None if unverifiable)"""
+        try:
+            game_name = game_name.strip().lower()  # Case-insensitive game name
+            if game_name not in self.config['games']:
+                return False, f"Game not found: {game_name}", 0
+            backup_path = os.path.normpath(backup_path)
+            if not os.path.exists(backup_path):
+                return False, "Backup not found", 0
+            if os.path.isdir(backup_path) and not os.path.isfile(os.path.join(backup_path, FOLDER_MANIFEST)):
+                return True, "Not verified: no manifest (created by an older version)", None
+
+            with span("hash"):
+                checked, problems = verifier.verify(backup_path)
+            if problems:
+                return False, f"{len(problems)} damaged files, e.g. {problems[0]}", checked
+            return True, f"OK ({checked} files)", checked
+        except Exception as e:
+            return False, f"Verification failed: {str(e)}", 0
+
+    @instrumented("verify")
+    def verify_backup(self, game_name, backup_path, fast=False):
+        """Check a snapshot against the sizes and digests recorded when it was written.
+
+        fast=True only compares sizes (and mtimes of folder copies) without reading data.
+        """
+        with self._verifier(fast) as verifier:
+            success, message, _ = self._verify_snapshot(verifier, game_name, backup_path)
+        return success, message
+
+    @instrumented("verify_all", game=False)
+    def verify_all_backups(self, fast=False, games=None, on_result=None):
+        """Verify every backup of every game (or of the given games).
+
+        Returns {game: {success, message, checked, damaged}}; on_result(game,
+        result) is called as each game finishes.
+        """
+        results = {}
+        with self._verifier(fast) as verifier:
+            for game_name in games or self.list_games():
+                game_name = game_name.strip().lower()  # Case-insensitive game name
+                if game_name not in self.config['games']:
+                    results[game_name] = {'success': False, 'message': f"Game not found: {game_name}",
+                                          'checked': 0, 'damaged': []}
+                    continue
+                damaged = []
+                unverified = 0
+                backups = self.get_backups(game_name)
+                for backup in backups:
+                    success, message, checked = self._verify_snapshot(verifier, game_name, backup['path'])
+                    if not success:
+                        damaged.append(f"{backup['name']}: {message}")
+                    elif checked is None:
+                        unverified += 1
+
+                if damaged:
+                    message = f"{len(damaged)} of {len(backups)} backups damaged ({damaged[0]})"
+                else:
+                    message = f"{len(backups) - unverified} backups OK"
+                    if unverified:
+                        message += f", {unverified} without a manifest"
+                results[game_name] = {
+                    'success': not damaged,
+                    'message': message,
+                    'checked': len(backups) - unverified,
+                    'damaged': damaged
+                }
+                if on_result is not None:
+                    on_result(game_name, results[game_name])
+        return results
+
+    def collect_garbage(self):
+        """Reclaim object store blobs no longer referenced by any snapshot"""
+        try:
+            removed, freed = self._object_store().collect_garbage()
+            return True, f"Removed {removed} unused blobs ({freed / (1024 * 1024):.2f} MB)"
+        except Exception as e:
+            return False, f"Garbage collection failed: {str(e)}"
+
     def export_config(self, export_path):
         """Export configuration to specified path"""
         try:
-            shutil.copy(CONFIG_FILE, export_path)
+            shutil.copy(self.config_path, export_path)
             return True, f"Config exported to {export_path}"
         except Exception as e:
             return False, f"Export failed: {str(e)}"
 
+    @instrumented("import_config", game=False)
     def import_config(self, import_path):
         """Import configuration from file with validation"""
         try:
@@ -253,21 +1000,60 @@ class GameBackupCore:
             if not all(key in new_config for key in required_keys):
                 raise ValueError("Invalid configuration format")
                 
-            # Preserve current root directory structure
-            new_config['root_backup_dir'] = os.path.normpath(new_config['root_backup_dir'])
-            
-            # Overwrite current config
-            self.config = new_config
-            self._save_config()
+            # Overwrite current config, migrating files exported by older versions
+            self._config_store.replace(new_config)
+            self._install_governor()
             self._ensure_paths()
             return True, "Config imported successfully"
             
         except Exception as e:
             return False, f"Import failed: {str(e)}"
 
+    # ========== SAVE DISCOVERY ==========
+
+    def _discovery(self):
+        """Save discovery configured from the `discovery` setting, caching next to the settings file"""
+        from core.discovery import SaveDiscovery, CACHE_FILE
+
+        return SaveDiscovery.from_config(
+            self.config.get('discovery', {}),
+            cache_path=os.path.join(os.path.dirname(self.config_path), CACHE_FILE)
+        )
+
+    @instrumented("discover", game=False)
+    def discover_games(self):
+        """Known games whose saves are on this machine, each flagged 'configured' if already set up.
+
+        Runs offline against the bundled signature database (plus the
+        `discovery.signatures` setting); folders unchanged since the last
+        scan are not listed again.
+        """
+        configured = {os.path.normcase(cfg['source_path']) for cfg in self.config['games'].values()}
+        found = self._discovery().scan()
+        for game in found:
+            game['configured'] = (game['name'] in self.config['games']
+                                  or os.path.normcase(game['source_path']) in configured)
+        return found
+
     def search_save_locations(self, game_name):
-        """Generate search URL for save locations"""
-        return {
-            'search_url': f"{SAVEGAME_PRO_URL}?s={urllib.parse.quote_plus(game_name)}",
-            'game': game_name.strip().lower()  # Case-insensitive game name
-        }
\ No newline at end of file
+        """Discovered games whose name contains game_name"""
+        query = game_name.strip().lower()  # Case-insensitive game name
+        return [game for game in self.discover_games() if query in game['name']]
+
+    @instrumented("add_games", game=False)
+    def add_discovered_games(self, games):
+        """Add several games found by discover_games() with one settings write"""
+        added = []
+        failed = []
+        with self.edit_config():
+            for game in games:
+                try:
+                    self.add_game(game['name'], game['source_path'], processes=game.get('processes'))
+                    added.append(game['name'])
+                except ValueError as e:
+                    failed.append(str(e))
+        self._install_governor()
+        message = f"Added {len(added)} games"
+        if failed:
+            message += f"; skipped {len(failed)}: " + "; ".join(failed)
+        return bool(added) or not failed, message
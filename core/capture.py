@@ -0,0 +1,142 @@
+import os
+import time
+import shutil
+from core.copier import walk_files, native_path, _reflink
+
+CLONE_SUFFIX = ".capture"
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_MS = 100
+
+
+def _state(st):
+    return st.st_size, st.st_mtime_ns
+
+
+def clone_dir_for(source_path):
+    """Hidden clone directory next to source_path, on the same filesystem"""
+    parent, name = os.path.split(os.path.normpath(source_path))
+    return os.path.join(parent, f".{name}{CLONE_SUFFIX}")
+
+
+def clone_tree(source_path, dest):
+    """Reflink every file of source_path into dest, returning False if any file can't be cloned.
+
+    A clone only shares extents with the original, so the whole tree is
+    taken in a few milliseconds however large it is, and each file is
+    captured atomically with respect to writers. A single file is cloned
+    to dest/<name>.
+    """
+    if os.path.isdir(source_path):
+        entries = walk_files(source_path)
+    else:
+        entries = [(os.path.basename(source_path), None, False)]
+
+    os.makedirs(dest)
+    dirs = []
+    for rel_path, entry, is_dir in entries:
+        target = native_path(dest, rel_path)
+        src = entry.path if entry is not None else source_path
+        if is_dir:
+            os.makedirs(target, exist_ok=True)
+            dirs.append((src, target))
+            continue
+        with open(src, 'rb') as fsrc, open(target, 'wb') as fdst:
+            if os.fstat(fsrc.fileno()).st_size and not _reflink(fsrc, fdst):
+                return False
+        shutil.copystat(src, target)
+    for src_dir, dst_dir in reversed(dirs):
+        shutil.copystat(src_dir, dst_dir)
+    return True
+
+
+class Capture:
+    """Reads a save folder consistently while the game may still be writing it.
+
+    Every file is stat()ed before it is read and again afterwards; if its
+    size or mtime moved, only that file is read again, up to retries times
+    with a doubling backoff. Files that never settle are kept as last read
+    and listed in unsettled, so the snapshot can flag them and the file
+    index can force a fresh read next time.
+
+    With clone=True the save folder is first reflinked into a hidden
+    directory beside it (btrfs, XFS) and captured from there, which needs
+    no retries. Filesystems without reflinks fall back to direct capture.
+    """
+
+    def __init__(self, source_path, retries=DEFAULT_RETRIES, backoff_ms=DEFAULT_BACKOFF_MS,
+                 clone=False, sleep=time.sleep):
+        self.source_path = source_path
+        self.read_path = source_path
+        self.retries = max(0, retries)
+        self.backoff = backoff_ms / 1000
+        self.clone = clone
+        self.cloned = False
+        self.sleep = sleep
+        self.unsettled = set()
+        self._clone_dir = None
+
+    @classmethod
+    def from_config(cls, source_path, settings):
+        return cls(
+            source_path,
+            retries=settings.get('retries', DEFAULT_RETRIES),
+            backoff_ms=settings.get('backoff_ms', DEFAULT_BACKOFF_MS),
+            clone=settings.get('clone', False)
+        )
+
+    def __enter__(self):
+        if self.clone:
+            self._clone_dir = clone_dir_for(self.source_path)
+            shutil.rmtree(self._clone_dir, ignore_errors=True)
+            try:
+                self.cloned = clone_tree(self.source_path, self._clone_dir)
+            except OSError:
+                self.cloned = False
+            if self.cloned:
+                self.read_path = self._clone_dir
+                if not os.path.isdir(self.source_path):
+                    self.read_path = os.path.join(self._clone_dir, os.path.basename(self.source_path))
+            else:
+                shutil.rmtree(self._clone_dir, ignore_errors=True)
+        return self
+
+    def __exit__(self, *exc):
+        if self._clone_dir is not None:
+            shutil.rmtree(self._clone_dir, ignore_errors=True)
+        return False
+
+    def read(self, rel_path, path, st, func, progress=None):
+        """Call func() until path is unchanged across the call, returning (result, final stat).
+
+        st is the stat taken when the file was scanned. Bytes reported to
+        progress by a discarded attempt are added to its total, so the bar
+        keeps moving forward.
+        """
+        if self.cloned:
+            return func(), st
+        for attempt in range(self.retries + 1):
+            result = func()
+            try:
+                after = os.stat(path)
+            except FileNotFoundError:
+                break  # deleted while being read; keep what was read
+            if _state(after) == _state(st):
+                return result, after
+            st = after
+            if attempt < self.retries:
+                if progress is not None:
+                    progress.add_total(after.st_size)
+                self.sleep(self.backoff * 2 ** attempt)
+        self.unsettled.add(rel_path)
+        return result, st
+
+    def index_files(self, files):
+        """File index records for the captured entries.
+
+        Unsettled files are left out so the next backup reads them again,
+        and a clone's inodes are dropped since they never match the source.
+        """
+        if self.cloned:
+            return {path: dict(entry, ino=None) for path, entry in files.items()
+                    if path not in self.unsettled}
+        return {path: entry for path, entry in files.items() if path not in self.unsettled}
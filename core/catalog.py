@@ -0,0 +1,233 @@
+import os
+import json
+import hashlib
+import threading
+from core.object_store import MANIFEST_SUFFIX, is_manifest
+
+CATALOG_FILE = "catalog.jsonl"
+COMPACT_RATIO = 2
+ARCHIVE_SUFFIX = ".archive"
+TRASH_SUFFIX = ".deleting"
+# Label of the snapshot taken of the current save before every restore
+SAFETY_LABEL = "pre-restore"
+
+
+def is_archive(path):
+    """Check whether a path points at an archive snapshot"""
+    return path.endswith(ARCHIVE_SUFFIX)
+
+
+def is_safety(snapshot_id):
+    """Whether a snapshot is a pre-restore safety snapshot rather than a backup"""
+    return snapshot_id.endswith(f"_{SAFETY_LABEL}")
+
+
+def parse_snapshot_name(entry):
+    """Split a backup directory entry into (snapshot id, format), or None if it is not a snapshot"""
+    if not entry.startswith("backup_") or entry.endswith((".tmp", TRASH_SUFFIX)):
+        return None
+    if is_manifest(entry):
+        return entry[:-len(MANIFEST_SUFFIX)], "store"
+    if is_archive(entry):
+        return entry[:-len(ARCHIVE_SUFFIX)], "archive"
+    return entry, "folder"
+
+
+def content_hash(entries):
+    """Digest of a snapshot's (path, content digest) pairs, or None if digests are unknown"""
+    h = hashlib.blake2b(digest_size=32)
+    for entry in sorted(entries, key=lambda e: e['path']):
+        if not entry.get('digest'):
+            return None
+        h.update(f"{entry['path']}\0{entry['digest']}\n".encode('utf-8'))
+    return h.hexdigest()
+
+
+def snapshot_record(snapshot_path, snapshot_format, entries, timestamp):
+    """Catalog record describing one snapshot"""
+    name = os.path.basename(snapshot_path)
+    return {
+        'id': parse_snapshot_name(name)[0],
+        'file': name,
+        'format': snapshot_format,
+        'timestamp': timestamp,
+        'size': sum(entry['size'] for entry in entries),
+        'files': len(entries),
+        'hash': content_hash(entries)
+    }
+
+
+class Catalog:
+    """Append-only JSON-lines catalog of every snapshot under the backup root.
+
+    Each line adds or removes one snapshot, so create and delete only append
+    (and fsync) a single line; a torn final line from a crash is ignored on
+    load. The whole catalog is held in memory, which makes listing a game's
+    snapshots a dictionary lookup instead of a directory scan. Lines written
+    by another process are picked up by checking the file size.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        self.path = os.path.join(root_dir, CATALOG_FILE)
+        self._lock = threading.RLock()
+        self._games = {}
+        self._offset = 0
+        self._lines = 0
+        self._identity = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _apply(self, record):
+        snapshots = self._games.setdefault(record['game'], {})
+        if record['op'] == 'add':
+            snapshots[record['snapshot']['id']] = record['snapshot']
+        elif record['op'] == 'remove':
+            snapshots.pop(record['id'], None)
+        elif record['op'] == 'drop_game':
+            self._games.pop(record['game'], None)
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.path)
+            size, identity = st.st_size, (st.st_dev, st.st_ino)
+        except OSError:
+            size, identity = 0, None
+        if identity != self._identity or size < self._offset:
+            # Rewritten (compacted or recreated) by someone else: start over
+            self._games = {}
+            self._offset = 0
+            self._lines = 0
+            self._identity = identity
+        if size == self._offset:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._offset += len(line)
+                self._lines += 1
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+
+    def _append(self, record):
+        self._refresh()
+        os.makedirs(self.root_dir, exist_ok=True)
+        line = (json.dumps(record) + "\n").encode('utf-8')
+        with open(self.path, 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        if self._identity is None:
+            self._identity = (st.st_dev, st.st_ino)
+        self._apply(record)
+        self._offset += len(line)
+        self._lines += 1
+
+    # ========== QUERIES ==========
+
+    def list(self, game_name):
+        """Snapshots of one game, newest first"""
+        with self._lock:
+            self._refresh()
+            snapshots = list(self._games.get(game_name, {}).values())
+        return sorted(snapshots, key=lambda s: s['timestamp'], reverse=True)
+
+    def get(self, game_name, snapshot_id):
+        with self._lock:
+            self._refresh()
+            return self._games.get(game_name, {}).get(snapshot_id)
+
+    def games(self):
+        with self._lock:
+            self._refresh()
+            return {game: dict(snapshots) for game, snapshots in self._games.items()}
+
+    # ========== UPDATES ==========
+
+    def add(self, game_name, snapshot):
+        with self._lock:
+            self._append({'op': 'add', 'game': game_name, 'snapshot': snapshot})
+
+    def update(self, game_name, snapshot_id, **fields):
+        """Merge fields into an existing record"""
+        with self._lock:
+            self._refresh()
+            current = self._games.get(game_name, {}).get(snapshot_id)
+            if current is not None:
+                self._append({'op': 'add', 'game': game_name, 'snapshot': dict(current, **fields)})
+
+    def remove(self, game_name, snapshot_id):
+        with self._lock:
+            self._append({'op': 'remove', 'game': game_name, 'id': snapshot_id})
+            self._maybe_compact()
+
+    def compact(self):
+        """Rewrite the log with one line per live snapshot"""
+        with self._lock:
+            self._refresh()
+            tmp_path = self.path + ".tmp"
+            lines = 0
+            with open(tmp_path, 'w') as f:
+                for game_name, snapshots in self._games.items():
+                    for snapshot in snapshots.values():
+                        f.write(json.dumps({'op': 'add', 'game': game_name, 'snapshot': snapshot}) + "\n")
+                        lines += 1
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            st = os.stat(self.path)
+            self._offset = st.st_size
+            self._identity = (st.st_dev, st.st_ino)
+            self._lines = lines
+
+    def _maybe_compact(self):
+        live = sum(len(snapshots) for snapshots in self._games.values())
+        if self._lines > COMPACT_RATIO * max(live, 16):
+            self.compact()
+
+    def reconcile(self, games, describe):
+        """Re-sync the catalog with what is actually on disk.
+
+        games maps game name to backup directory; describe(game, path, format)
+        returns a snapshot record for a snapshot missing from the catalog.
+        Returns (added, removed) counts.
+        """
+        added = 0
+        removed = 0
+        with self._lock:
+            self._refresh()
+            for game_name, backup_dir in games.items():
+                on_disk = {}
+                if os.path.isdir(backup_dir):
+                    for entry in os.listdir(backup_dir):
+                        parsed = parse_snapshot_name(entry)
+                        if parsed is not None:
+                            on_disk[parsed[0]] = (entry, parsed[1])
+
+                known = self._games.get(game_name, {})
+                for snapshot_id in list(known):
+                    if snapshot_id not in on_disk:
+                        self._append({'op': 'remove', 'game': game_name, 'id': snapshot_id})
+                        removed += 1
+                for snapshot_id, (entry, snapshot_format) in on_disk.items():
+                    if snapshot_id not in known:
+                        try:
+                            record = describe(game_name, os.path.join(backup_dir, entry), snapshot_format)
+                        except (OSError, ValueError, KeyError):
+                            continue  # unreadable snapshot; leave it out of listings
+                        self._append({'op': 'add', 'game': game_name, 'snapshot': record})
+                        added += 1
+
+            for game_name in list(self._games):
+                if game_name not in games:
+                    self._append({'op': 'drop_game', 'game': game_name})
+                    removed += 1
+            self.compact()
+        return added, removed
@@ -0,0 +1,322 @@
+"""Headless command line interface: python -m core <command>
+
+Only the standard library and core modules are imported here, and
+GameBackupCore is imported inside each command, so scheduled runs never
+pay for (or need a display for) the GUI toolkit.
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+
+
+def _core(args):
+    from core.backup_manager import GameBackupCore
+    if args.config:
+        return GameBackupCore(args.config)
+    return GameBackupCore()
+
+
+def _games(core, args):
+    """Game names selected by the positional arguments or --all"""
+    if args.all or not args.games:
+        return core.list_games()
+    return [name.strip().lower() for name in args.games]
+
+
+def _find_snapshot(core, game_name, name):
+    """Backup dict for a snapshot file name, or the newest regular backup"""
+    backups = core.get_backups(game_name)
+    if name:
+        return next((b for b in backups if b['name'] == name or b['path'] == name), None)
+    return next((b for b in backups if not b['safety']), None)
+
+
+def _emit(args, results):
+    """Print {game: result} as JSON or text and return the exit code"""
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for game_name, result in results.items():
+            status = "ok" if result['success'] else "FAILED"
+            print(f"{game_name}: {status} - {result['message']}")
+    return 0 if all(r['success'] for r in results.values()) else 1
+
+
+def _result(success, message, **extra):
+    return dict(extra, success=success, message=message)
+
+
+def _progress_printer(args):
+    """Progress callback writing one updating line to stderr, or None"""
+    if not args.progress:
+        return None
+
+    def _print(event):
+        mb = 1024 * 1024
+        line = (f"\r{event['bytes_done'] / mb:.1f}/{event['bytes_total'] / mb:.1f} MB"
+                f"  {event['files_done']}/{event['files_total']} files  {event['rate'] / mb:.1f} MB/s")
+        if event['eta'] is not None and not event['finished']:
+            line += f"  ETA {event['eta']:.0f}s"
+        print(line.ljust(79), end="\n" if event['finished'] else "", file=sys.stderr, flush=True)
+    return _print
+
+
+def _cancellable(args, work):
+    """Run work(progress) on a worker thread so Ctrl+C can cancel it cleanly.
+
+    Returns work's result, or None after an interrupt once the operation
+    has stopped and removed its partial snapshot.
+    """
+    from core.progress import Progress
+    progress = Progress(_progress_printer(args))
+    outcome = []
+    thread = threading.Thread(target=lambda: outcome.append(work(progress)), daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.5)
+    except KeyboardInterrupt:
+        print("Cancelling...", file=sys.stderr, flush=True)
+        progress.token.cancel()
+        thread.join()
+        return None
+    if args.progress:
+        progress.finish()
+    return outcome[0] if outcome else None
+
+
+# ========== COMMANDS ==========
+
+def cmd_list(args):
+    core = _core(args)
+    if not args.games and not args.all:
+        games = {}
+        for game_name in core.list_games():
+            backups = core.get_backups(game_name)
+            games[game_name] = {
+                'source_path': core.config['games'][game_name]['source_path'],
+                'backups': len(backups),
+                'latest': backups[0]['formatted_date'] if backups else None
+            }
+        if args.json:
+            print(json.dumps(games, indent=2))
+        else:
+            for game_name, info in games.items():
+                latest = info['latest'] or "never"
+                print(f"{game_name}: {info['backups']} backups, latest {latest} ({info['source_path']})")
+        return 0
+
+    listing = {}
+    for game_name in _games(core, args):
+        listing[game_name] = core.get_backups(game_name)
+    if args.json:
+        print(json.dumps(listing, indent=2))
+    else:
+        for game_name, backups in listing.items():
+            print(f"{game_name}:")
+            for backup in backups:
+                safety = " pre-restore" if backup['safety'] else ""
+                print(f"  {backup['name']}  {backup['formatted_date']}  {backup['format']}"
+                      f"  {backup['files']} files  {backup['size']} bytes{safety}")
+    return 0
+
+
+def cmd_backup(args):
+    core = _core(args)
+
+    def _work(progress):
+        if args.all or not args.games:
+            return core.update_all_backups(progress=progress)
+        results = {}
+        for game_name in _games(core, args):
+            start = time.perf_counter()
+            success, message = core.create_backup(game_name, progress=progress)
+            results[game_name] = _result(success, message, duration=time.perf_counter() - start)
+        return results
+
+    results = _cancellable(args, _work)
+    core.prune_backups(wait=True)  # let background deletions finish before exiting
+    core.wait_for_replication()
+    if results is None:
+        return 130
+    return _emit(args, results)
+
+
+def cmd_restore(args):
+    core = _core(args)
+    if args.all:
+        results = _cancellable(args, lambda progress: core.restore_all_backups(progress=progress))
+        return 130 if results is None else _emit(args, results)
+
+    if len(args.games) != 1:
+        print("restore takes exactly one game, or --all", file=sys.stderr)
+        return 2
+    game_name = args.games[0].strip().lower()
+    backup = _find_snapshot(core, game_name, args.snapshot)
+    if backup is None:
+        return _emit(args, {game_name: _result(False, "No matching backup found")})
+    outcome = _cancellable(args, lambda progress: core.restore_backup(
+        game_name, backup['path'], args.path or None, progress=progress))
+    if outcome is None:
+        return 130
+    success, message = outcome
+    return _emit(args, {game_name: _result(success, message, snapshot=backup['name'])})
+
+
+def cmd_prune(args):
+    core = _core(args)
+    results = {}
+    for game_name in _games(core, args):
+        success, message = core.prune_backups(game_name, wait=True)
+        results[game_name] = _result(success, message)
+    return _emit(args, results)
+
+
+def cmd_verify(args):
+    core = _core(args)
+    if not args.snapshot:
+        games = None if args.all or not args.games else args.games
+        return _emit(args, core.verify_all_backups(fast=args.fast, games=games))
+
+    results = {}
+    for game_name in _games(core, args):
+        backup = _find_snapshot(core, game_name, args.snapshot)
+        if backup is None:
+            results[game_name] = _result(False, "No matching backup found")
+            continue
+        success, message = core.verify_backup(game_name, backup['path'], fast=args.fast)
+        results[game_name] = _result(success, message, snapshot=backup['name'])
+    return _emit(args, results)
+
+
+def cmd_replicate(args):
+    core = _core(args)
+
+    def _work(progress):
+        results = {}
+        for game_name in _games(core, args):
+            success, message = core.replicate_backups(game_name, progress=progress)
+            results[game_name] = _result(success, message)
+        return results
+
+    results = _cancellable(args, _work)
+    if results is None:
+        print("Run the same command again to resume", file=sys.stderr)
+        return 130
+    return _emit(args, results)
+
+
+def cmd_discover(args):
+    core = _core(args)
+    try:
+        found = core.discover_games()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.games:
+        wanted = {name.strip().lower() for name in args.games}
+        found = [game for game in found if game['name'] in wanted]
+    if args.add:
+        new = [game for game in found if not game['configured']]
+        success, message = core.add_discovered_games(new)
+        if args.json:
+            print(json.dumps(_result(success, message, added=[game['name'] for game in new]), indent=2))
+        else:
+            print(message)
+        return 0 if success else 1
+
+    if args.json:
+        print(json.dumps(found, indent=2))
+    else:
+        for game in found:
+            configured = "  (configured)" if game['configured'] else ""
+            print(f"{game['name']}: {game['source_path']}  [{game['environment']}]{configured}")
+    return 0
+
+
+def cmd_watch(args):
+    core = _core(args)
+
+    def _report(game_name, success, message):
+        status = "ok" if success else "FAILED"
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {game_name}: {status} - {message}", flush=True)
+
+    watcher = core.start_watcher(_report)
+    print(f"Watching {len(watcher.settings)} games, press Ctrl+C to stop", flush=True)
+    try:
+        while watcher.is_alive():
+            watcher.join(1.0)
+    except KeyboardInterrupt:
+        watcher.stop()
+        watcher.join()
+    return 0
+
+
+def cmd_move_root(args):
+    core = _core(args)
+    outcome = _cancellable(args, lambda progress: core.migrate_root_directory(args.new_root, progress=progress))
+    if outcome is None:
+        print("Run the same command again to resume", file=sys.stderr)
+        return 130
+    success, message = outcome
+    if args.json:
+        print(json.dumps(_result(success, message, root=core.get_root_directory()), indent=2))
+    else:
+        print(message)
+    return 0 if success else 1
+
+
+# ========== ENTRY POINT ==========
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m core", description="Game save backup tool (headless)")
+    parser.add_argument("--config", help="settings file (default: game_backup_config.json)")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    parser.add_argument("--progress", action="store_true",
+                        help="show bytes, files, MB/s and ETA on stderr while backing up, restoring or moving")
+    parser.add_argument("--profile", metavar="FILE", help="write a cProfile capture of the command to FILE")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="with --profile, also write the top allocation sites to FILE.mem.txt")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def _command(name, func, help_text, games=True):
+        sub = commands.add_parser(name, help=help_text)
+        sub.set_defaults(func=func)
+        if games:
+            sub.add_argument("games", nargs="*", metavar="GAME")
+            sub.add_argument("--all", action="store_true", help="every configured game")
+        return sub
+
+    _command("list", cmd_list, "list games, or the backups of the given games")
+    _command("backup", cmd_backup, "back up the given games (all when none given)")
+    restore = _command("restore", cmd_restore, "restore a game to its latest or a chosen backup")
+    restore.add_argument("--snapshot", help="backup file name to restore (default: newest)")
+    restore.add_argument("--path", action="append", help="restore only this relative file path (repeatable)")
+    _command("prune", cmd_prune, "apply retention rules and wait for deletions to finish")
+    verify = _command("verify", cmd_verify, "check that backups are readable and complete")
+    verify.add_argument("--snapshot", help="backup file name to verify (default: all)")
+    verify.add_argument("--fast", action="store_true", help="only compare sizes and mtimes, without reading data")
+    _command("replicate", cmd_replicate, "copy backups missing on the replication targets (resumable)")
+    discover = _command("discover", cmd_discover, "find the save folders of known games on this machine",
+                        games=False)
+    discover.add_argument("games", nargs="*", metavar="GAME", help="only these games")
+    discover.add_argument("--add", action="store_true", help="add the games found that aren't configured yet")
+    _command("watch", cmd_watch, "back up games automatically when their saves change", games=False)
+    move_root = _command("move-root", cmd_move_root, "move every backup to a new root folder (resumable)", games=False)
+    move_root.add_argument("new_root", metavar="DIR")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.profile:
+            from core.metrics import capture
+            with capture(args.profile, memory=args.trace_memory):
+                return args.func(args)
+        return args.func(args)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
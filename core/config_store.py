@@ -0,0 +1,159 @@
+import os
+import copy
+import json
+import threading
+from contextlib import contextmanager
+from core.metrics import span
+
+APP_VERSION = "4.1"
+CONFIG_SCHEMA = 2
+
+
+def default_config(root_dir):
+    return {
+        "root_backup_dir": root_dir,
+        "games": {},
+        "version": APP_VERSION,
+        "schema": CONFIG_SCHEMA
+    }
+
+
+def migrate(config):
+    """Bring a settings dict written by any earlier version up to CONFIG_SCHEMA.
+
+    Schema 1 (the 4.1 layout, which has no "schema" key) stored every
+    game's absolute backup_dir although it was always <root>/<game>; it is
+    dropped so the directory follows the root again.
+    """
+    config = copy.deepcopy(config)
+    schema = config.get('schema', 1)
+    if schema > CONFIG_SCHEMA:
+        raise ValueError(f"Settings file is from a newer version (schema {schema})")
+    if schema < 2:
+        for game_config in config['games'].values():
+            game_config.pop('backup_dir', None)
+    config['schema'] = CONFIG_SCHEMA
+    return config
+
+
+def resolve(config):
+    """In-memory form of a migrated settings dict: clean names and absolute paths"""
+    root = os.path.normpath(config['root_backup_dir'])
+    games = {}
+    for game_name, game_config in config['games'].items():
+        clean_name = game_name.strip().lower()  # Case-insensitive game name
+        game_config = dict(game_config)
+        game_config['source_path'] = os.path.normpath(game_config['source_path'].strip())
+        # Relative backup dirs (the default) live under the root; absolute ones are kept
+        game_config['backup_dir'] = os.path.normpath(
+            os.path.join(root, game_config.get('backup_dir') or clean_name)
+        )
+        games[clean_name] = game_config
+    return dict(config, root_backup_dir=root, games=games)
+
+
+def relative_backup_dir(backup_dir, root_dir):
+    """backup_dir relative to root_dir, or unchanged if it lies outside the root"""
+    try:
+        rel_path = os.path.relpath(backup_dir, root_dir)
+    except ValueError:
+        return backup_dir  # different drive on Windows
+    if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+        return backup_dir
+    return rel_path
+
+
+def serialize(config):
+    """On-disk form of an in-memory settings dict, with backup dirs relative to the root"""
+    games = {}
+    for game_name, game_config in config['games'].items():
+        game_config = dict(game_config)
+        game_config['backup_dir'] = relative_backup_dir(game_config['backup_dir'], config['root_backup_dir'])
+        games[game_name] = game_config
+    return dict(config, games=games)
+
+
+class ConfigStore:
+    """The settings file, shared safely between the GUI and worker threads.
+
+    data is never modified in place: edit() hands out a working copy under
+    a lock and swaps it in as a whole when the block ends, so readers on
+    other threads always see a complete, consistent dict without locking.
+    Edits nested inside an outer edit() share its copy and are written once
+    when the outermost block ends, which turns a bulk import into a single
+    write. Writes go to a temporary file that is fsynced and renamed over
+    the settings file, so a crash never leaves it half written.
+    """
+
+    def __init__(self, path, default_root):
+        self.path = path
+        self.default_root = default_root
+        self.data = None
+        self._lock = threading.RLock()
+        self._pending = None
+
+    def load(self):
+        """Read (creating or migrating as needed) the settings file"""
+        if not os.path.exists(self.path):
+            self.data = resolve(default_config(self.default_root))
+            self.save()
+            return self.data
+
+        with open(self.path, 'r') as f:
+            raw = json.load(f)
+        self.data = resolve(migrate(raw))
+        if raw.get('schema') != CONFIG_SCHEMA:
+            self.save()
+        return self.data
+
+    @contextmanager
+    def edit(self):
+        """Yield a working copy of the settings; it replaces data and is saved on exit.
+
+        The copy is in the in-memory form, so new games need a backup_dir
+        already joined to the root. If the block raises, data and the file
+        are left untouched.
+        """
+        with self._lock:
+            outer = self._pending is None
+            if outer:
+                self._pending = copy.deepcopy(self.data)
+            try:
+                yield self._pending
+                if outer:
+                    self.data = self._pending
+                    self.save()
+            finally:
+                if outer:
+                    self._pending = None
+
+    def replace(self, config):
+        """Swap in a whole settings dict (e.g. an imported file) and save it"""
+        with self.edit() as pending:
+            pending.clear()
+            pending.update(resolve(migrate(config)))
+
+    def save(self):
+        """Write the settings atomically"""
+        with self._lock, span("config_save"):
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(serialize(self.data), f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            _sync_dir(os.path.dirname(self.path))
+
+
+def _sync_dir(path):
+    """Make a rename durable on POSIX; Windows cannot open directories"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        fd = os.open(path or ".", os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,232 @@
+import os
+import sys
+import errno
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from core.governor import throttle, chunk_limit, lower_priority
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+DEFAULT_BUFFER_SIZE = 8 * 1024 * 1024
+SMALL_BUFFER_SIZE = 256 * 1024
+LARGE_FILE_THRESHOLD = 64 * 1024 * 1024
+FICLONE = 0x40049409  # linux/fs.h
+
+# Errors meaning "this fast path is not available here", not a real failure
+_FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF,
+    errno.EOPNOTSUPP, getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP), errno.ETXTBSY
+}
+
+
+def walk_files(root):
+    """Yield (relative posix path, DirEntry, is_dir) for everything below root"""
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+            for entry in it:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir():
+                    stack.append(rel_path)
+                    yield rel_path, entry, True
+                else:
+                    yield rel_path, entry, False
+
+
+def native_path(root, rel_path):
+    """Join a manifest (posix) relative path onto a native root"""
+    return os.path.join(root, *rel_path.split('/'))
+
+
+def _reflink(fsrc, fdst):
+    """Clone src into dst on copy-on-write filesystems (btrfs, XFS)"""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def _copy_file_range(fsrc, fdst, size):
+    if not hasattr(os, 'copy_file_range'):
+        return 0
+    copied = 0
+    try:
+        while copied < size:
+            n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), chunk_limit(size - copied))
+            if n == 0:
+                break
+            copied += n
+            throttle(n)
+    except OSError as e:
+        if copied or e.errno not in _FALLBACK_ERRNOS:
+            raise
+    return copied
+
+
+def _sendfile(fsrc, fdst, size):
+    if not hasattr(os, 'sendfile') or not sys.platform.startswith("linux"):
+        return 0
+    offset = fsrc.tell()
+    copied = 0
+    try:
+        while copied < size:
+            n = os.sendfile(fdst.fileno(), fsrc.fileno(), offset + copied, chunk_limit(size - copied))
+            if n == 0:
+                break
+            copied += n
+            throttle(n)
+    except OSError as e:
+        if copied or e.errno not in _FALLBACK_ERRNOS:
+            raise
+    fsrc.seek(offset + copied)
+    return copied
+
+
+def _buffered(fsrc, fdst, size, buffer_size, hasher=None):
+    buf = bytearray(max(1, min(size or 1, buffer_size)))
+    view = memoryview(buf)
+    copied = 0
+    while True:
+        n = fsrc.readinto(buf)
+        if not n:
+            break
+        fdst.write(view[:n])
+        if hasher is not None:
+            hasher.update(view[:n])
+        copied += n
+        throttle(n)
+    return copied
+
+
+def append_fileobj(fsrc, fdst, size, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Copy the rest of fsrc to fdst's current position using the fastest available call"""
+    fdst.flush()
+    copied = _copy_file_range(fsrc, fdst, size)
+    if not copied:
+        copied = _sendfile(fsrc, fdst, size)
+    if copied < size:
+        if copied:
+            # Kernel copies moved the descriptors; resync the Python file objects
+            fdst.seek(0, os.SEEK_END)
+        copied += _buffered(fsrc, fdst, size - copied, buffer_size)
+    return copied
+
+
+def copy_file(src, dst, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Copy file contents (no metadata), returning the number of bytes copied"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        if size and _reflink(fsrc, fdst):
+            return size
+        if size < LARGE_FILE_THRESHOLD:
+            buffer_size = min(buffer_size, SMALL_BUFFER_SIZE)
+        return append_fileobj(fsrc, fdst, size, buffer_size)
+
+
+def copy2(src, dst, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Drop-in for shutil.copy2 built on copy_file, returning bytes copied"""
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    copied = copy_file(src, dst, buffer_size)
+    shutil.copystat(src, dst)
+    return copied
+
+
+def copy2_digest(src, dst, buffer_size=DEFAULT_BUFFER_SIZE):
+    """copy2 that also hashes the bytes on their way through, returning (bytes copied, digest).
+
+    Reflinks and in-kernel copies never pass the data through userspace,
+    so this always takes the buffered path; that is still cheaper than a
+    fast copy followed by a second read to hash the result.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    hasher = hashlib.blake2b(digest_size=32)
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        if size < LARGE_FILE_THRESHOLD:
+            buffer_size = min(buffer_size, SMALL_BUFFER_SIZE)
+        copied = _buffered(fsrc, fdst, size, buffer_size, hasher)
+    shutil.copystat(src, dst)
+    return copied, hasher.hexdigest()
+
+
+class CopyEngine:
+    """Copies many files concurrently over a worker pool.
+
+    Small save files leave a fast disk mostly idle when copied one at a
+    time; issuing them from several threads keeps the device queue full.
+    Each file goes through copy2(), which prefers reflinks and in-kernel
+    copies and preserves shutil.copy2 metadata semantics. With a Progress
+    tracker, every item first checks for cancellation, so queued items are
+    skipped as soon as the operation is cancelled.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, buffer_size=DEFAULT_BUFFER_SIZE, progress=None):
+        self.workers = max(1, workers)
+        self.buffer_size = buffer_size
+        self.progress = progress
+
+    def run(self, func, items):
+        """Apply func to every item on the worker pool, returning results in order"""
+        items = list(items)
+        if self.progress is not None:
+            unchecked = func
+
+            def func(item):
+                self.progress.check()
+                return unchecked(item)
+
+        if self.workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(items)), initializer=lower_priority) as pool:
+            return list(pool.map(func, items))
+
+    def _advance(self, nbytes):
+        if self.progress is not None:
+            self.progress.advance(nbytes, 1)
+
+    def copy_files(self, pairs):
+        """Copy (src, dst) pairs with copy2, returning total bytes copied"""
+        def _copy(pair):
+            copied = copy2(pair[0], pair[1], self.buffer_size)
+            self._advance(copied)
+            return copied
+        return sum(self.run(_copy, pairs))
+
+    def copy_files_digest(self, pairs):
+        """Copy (src, dst) pairs with copy2_digest, returning [(bytes copied, digest)] in order"""
+        def _copy(pair):
+            result = copy2_digest(pair[0], pair[1], self.buffer_size)
+            self._advance(result[0])
+            return result
+        return self.run(_copy, pairs)
+
+    def copy_tree(self, src, dst):
+        """Parallel equivalent of shutil.copytree(src, dst, dirs_exist_ok=True)"""
+        os.makedirs(dst, exist_ok=True)
+        dirs = []
+        pairs = []
+        for rel_path, entry, is_dir in walk_files(src):
+            target = os.path.join(dst, *rel_path.split('/'))
+            if is_dir:
+                os.makedirs(target, exist_ok=True)
+                dirs.append((entry.path, target))
+            else:
+                pairs.append((entry.path, target))
+
+        copied = self.copy_files(pairs)
+        # Directory times change while their contents are written, so copy them last
+        for src_dir, dst_dir in reversed(dirs):
+            shutil.copystat(src_dir, dst_dir)
+        shutil.copystat(src, dst)
+        return copied
@@ -0,0 +1,274 @@
+import os
+import re
+import sys
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from core.signatures import SIGNATURES
+
+CACHE_FILE = "discovery_cache.json"
+CACHE_VERSION = 1
+DEFAULT_DISCOVERY_WORKERS = 8
+SAVE_ROOTS = ("documents", "saved_games", "appdata", "localappdata", "locallow", "home",
+              "xdg_config", "xdg_data", "app_support", "steam_userdata")
+WILDCARD = "*"
+_LIBRARY_PATH = re.compile(r'"path"\s+"((?:[^"\\]|\\.)*)"')
+
+
+def load_signatures(extra=()):
+    """The bundled signatures with extra ones added; an extra entry replaces a bundled one of the same name"""
+    signatures = {}
+    for signature in list(SIGNATURES) + list(extra):
+        name = signature.get('name', "").strip().lower()
+        if not name or not signature.get('paths'):
+            raise ValueError(f"Save signature needs a name and paths: {signature}")
+        for path in signature['paths']:
+            if path.split('/', 1)[0] not in SAVE_ROOTS:
+                raise ValueError(f"Unknown save root in '{path}' ({name}); use one of {', '.join(SAVE_ROOTS)}")
+        signatures[name] = dict(signature, name=name)
+    return list(signatures.values())
+
+
+def _existing(paths):
+    return [path for path in paths if path and os.path.isdir(path)]
+
+
+def windows_roots(user_dir, documents=None, appdata=None, localappdata=None):
+    """Save roots of a Windows user folder, native or inside a Wine prefix"""
+    return {
+        'home': [user_dir],
+        'documents': [documents or os.path.join(user_dir, "Documents"),
+                      os.path.join(user_dir, "My Documents"),
+                      os.path.join(user_dir, "OneDrive", "Documents")],
+        'saved_games': [os.path.join(user_dir, "Saved Games")],
+        'appdata': [appdata or os.path.join(user_dir, "AppData", "Roaming"),
+                    os.path.join(user_dir, "Application Data")],
+        'localappdata': [localappdata or os.path.join(user_dir, "AppData", "Local"),
+                         os.path.join(user_dir, "Local Settings", "Application Data")],
+        'locallow': [os.path.join(user_dir, "AppData", "LocalLow")],
+    }
+
+
+def steam_roots():
+    """Steam installations of the current user"""
+    home = os.path.expanduser("~")
+    if sys.platform == "win32":
+        candidates = [os.path.join(os.environ.get(var, ""), "Steam")
+                      for var in ("ProgramFiles(x86)", "ProgramFiles") if os.environ.get(var)]
+    elif sys.platform == "darwin":
+        candidates = [os.path.join(home, "Library", "Application Support", "Steam")]
+    else:
+        candidates = [os.path.join(home, ".steam", "steam"),
+                      os.path.join(home, ".local", "share", "Steam"),
+                      os.path.join(home, ".var", "app", "com.valvesoftware.Steam", ".local", "share", "Steam"),
+                      os.path.join(home, "snap", "steam", "common", ".local", "share", "Steam")]
+    return _unique(_existing(candidates))
+
+
+def steam_libraries(steam_root):
+    """Library folders of a Steam installation, read from libraryfolders.vdf"""
+    libraries = [steam_root]
+    try:
+        with open(os.path.join(steam_root, "steamapps", "libraryfolders.vdf"), encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return libraries
+    for match in _LIBRARY_PATH.finditer(text):
+        libraries.append(match.group(1).replace("\\\\", "\\"))
+    return _unique(_existing(libraries))
+
+
+def _unique(paths):
+    seen = set()
+    unique = []
+    for path in paths:
+        key = os.path.normcase(os.path.realpath(path))
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
+
+
+class DirCache:
+    """Sub-folder names of every folder discovery looked into, keyed by the folder's mtime.
+
+    Creating, deleting or renaming an entry updates a folder's mtime, so a
+    folder whose mtime is unchanged is not listed again; a re-scan only
+    stat()s the folders it walks and lists the ones that changed. Saved
+    as JSON next to the settings file.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.listed = 0
+        self.reused = 0
+        self._dirs = {}
+        self._visited = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self._dirs = data['dirs']
+            except (OSError, ValueError, KeyError):
+                pass  # no usable cache: everything is listed again
+
+    def children(self, path):
+        """(mtime_ns, sub-folder names) of path, or None if it is not a folder"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        entry = self._dirs.get(path)
+        if entry is not None and entry[0] == mtime:
+            with self._lock:
+                self.reused += 1
+                self._visited[path] = entry
+            return entry
+        try:
+            with os.scandir(path) as it:
+                names = [e.name for e in it if e.is_dir()]
+        except OSError:
+            return None
+        entry = [mtime, names]
+        with self._lock:
+            self.listed += 1
+            self._visited[path] = entry
+        return entry
+
+    def save(self):
+        """Write the folders visited by this scan; ones no longer walked are dropped"""
+        if self.path is None:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'dirs': self._visited}, f)
+        os.replace(tmp_path, self.path)
+
+
+class SaveDiscovery:
+    """Finds the save folders of known games on this machine without going online.
+
+    Every signature path is compiled into one tree per save root, so a
+    scan only descends into folders some signature names; it never walks
+    a whole Documents or AppData folder. The roots of the native user,
+    each Proton prefix (steamapps/compatdata/<app id>) and each Wine prefix
+    are walked in parallel. Inside a Proton prefix only signatures of that
+    app id, or without one, are matched. When a game is found in several
+    places the most recently modified folder wins.
+    """
+
+    def __init__(self, signatures=None, wine_prefixes=(), cache_path=None, workers=DEFAULT_DISCOVERY_WORKERS):
+        self.signatures = load_signatures() if signatures is None else signatures
+        self.wine_prefixes = list(wine_prefixes)
+        self.cache = DirCache(cache_path)
+        self.workers = max(1, workers)
+        self._trees = {}
+        for index, signature in enumerate(self.signatures):
+            for path in signature['paths']:
+                root, _, rest = path.partition('/')
+                node = self._trees.setdefault(root, {})
+                for name in filter(None, rest.split('/')):
+                    node = node.setdefault(name.lower(), {})
+                node.setdefault(None, []).append(index)
+
+    @classmethod
+    def from_config(cls, settings, cache_path=None):
+        return cls(
+            load_signatures(settings.get('signatures', ())),
+            wine_prefixes=settings.get('wine_prefixes', ()),
+            cache_path=cache_path,
+            workers=settings.get('workers', DEFAULT_DISCOVERY_WORKERS)
+        )
+
+    def environments(self):
+        """(label, Steam app id or None, {save root: [folders]}) for every place saves may live"""
+        home = os.path.expanduser("~")
+        steam = steam_roots()
+        userdata = [os.path.join(root, "userdata") for root in steam]
+        if sys.platform == "win32":
+            native = windows_roots(os.environ.get('USERPROFILE', home), appdata=os.environ.get('APPDATA'),
+                                   localappdata=os.environ.get('LOCALAPPDATA'))
+        else:
+            native = {
+                'home': [home],
+                'xdg_config': [os.environ.get('XDG_CONFIG_HOME') or os.path.join(home, ".config")],
+                'xdg_data': [os.environ.get('XDG_DATA_HOME') or os.path.join(home, ".local", "share")],
+                'app_support': [os.path.join(home, "Library", "Application Support")],
+            }
+        native['steam_userdata'] = userdata
+        environments = [("native", None, native)]
+
+        for root in steam:
+            for library in steam_libraries(root):
+                compatdata = os.path.join(library, "steamapps", "compatdata")
+                listing = self.cache.children(compatdata)
+                for app_id in (listing[1] if listing else ()):
+                    if not app_id.isdigit():
+                        continue
+                    user_dir = os.path.join(compatdata, app_id, "pfx", "drive_c", "users", "steamuser")
+                    environments.append((f"proton {app_id}", int(app_id), windows_roots(user_dir)))
+
+        prefixes = [os.path.expanduser(prefix) for prefix in self.wine_prefixes]
+        if sys.platform != "win32":
+            prefixes += [os.environ.get('WINEPREFIX'), os.path.join(home, ".wine")]
+        for prefix in _unique(_existing(prefixes)):
+            users = os.path.join(prefix, "drive_c", "users")
+            listing = self.cache.children(users)
+            for user in (listing[1] if listing else ()):
+                if user.lower() != "public":
+                    environments.append((f"wine {prefix}", None, windows_roots(os.path.join(users, user))))
+        return environments
+
+    def scan(self):
+        """Found games as [{'name', 'source_path', 'processes', 'environment'}], sorted by name"""
+        jobs = []
+        for label, app_id, roots in self.environments():
+            for root, folders in roots.items():
+                if root in self._trees:
+                    jobs += [(label, app_id, folder, self._trees[root]) for folder in _existing(folders)]
+
+        def _walk(job):
+            label, app_id, folder, tree = job
+            matches = []
+            self._walk(folder, tree, app_id, label, matches)
+            return matches
+
+        if self.workers == 1 or len(jobs) < 2:
+            results = [_walk(job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                results = list(pool.map(_walk, jobs))
+
+        best = {}
+        for matches in results:
+            for index, path, mtime, label in matches:
+                if index not in best or mtime > best[index][1]:
+                    best[index] = (path, mtime, label)
+        self.cache.save()
+
+        found = []
+        for index, (path, _, label) in best.items():
+            signature = self.signatures[index]
+            found.append({
+                'name': signature['name'],
+                'source_path': os.path.normpath(path),
+                'processes': list(signature.get('processes', ())),
+                'environment': label
+            })
+        return sorted(found, key=lambda game: game['name'])
+
+    def _walk(self, path, node, app_id, label, matches):
+        listing = self.cache.children(path)
+        if listing is None:
+            return
+        for index in node.get(None, ()):
+            wanted = self.signatures[index].get('steam_id')
+            if app_id is None or wanted is None or wanted == app_id:
+                matches.append((index, path, listing[0], label))
+        for name in listing[1]:
+            for key in (name.lower(), WILDCARD):
+                child = node.get(key)
+                if child is not None:
+                    self._walk(os.path.join(path, name), child, app_id, label, matches)
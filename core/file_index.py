@@ -0,0 +1,102 @@
+import os
+import json
+from core.object_store import FOLDER_MANIFEST, load_manifest
+from core.copier import walk_files
+
+INDEX_FILE = ".index.json"
+INDEX_VERSION = 1
+
+
+def file_state(st):
+    """(size, mtime_ns, inode) tuple used to decide whether a file changed"""
+    # Windows DirEntry.stat() reports st_ino as 0; treat that as unknown.
+    return st.st_size, st.st_mtime_ns, st.st_ino or None
+
+
+class FileIndex:
+    """Per-game record of the source file states captured by the last snapshot.
+
+    The index lets create_backup skip reading files whose size, mtime and
+    inode are unchanged and reuse what the previous snapshot already holds.
+    It lives in the game's backup directory and is rebuilt from the newest
+    snapshot whenever it is missing, corrupt or points at a deleted backup.
+    """
+
+    def __init__(self, backup_dir):
+        self.path = os.path.join(backup_dir, INDEX_FILE)
+        self.snapshot = None
+        self.format = None
+        self.files = {}
+
+    def load(self):
+        """Load the index from disk, returning False if it is unusable"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                return False
+            self.snapshot = data['snapshot']
+            self.format = data['format']
+            self.files = data['files']
+            return True
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def save(self):
+        """Persist the index atomically"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'snapshot': self.snapshot,
+                'format': self.format,
+                'files': self.files
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def reset(self, snapshot_path, snapshot_format, files):
+        self.snapshot = os.path.basename(snapshot_path) if snapshot_path else None
+        self.format = snapshot_format
+        self.files = files
+
+    def rebuild(self, snapshot_path, snapshot_format):
+        """Reconstruct the index from an existing snapshot on disk"""
+        files = {}
+        manifest_path = snapshot_path
+        if snapshot_format == "folder":
+            # Folder snapshots written since manifests were added carry one
+            manifest_path = os.path.join(snapshot_path, FOLDER_MANIFEST)
+        if snapshot_format == "store" or os.path.isfile(manifest_path):
+            for entry in load_manifest(manifest_path)['files']:
+                files[entry['path']] = entry
+        else:
+            for rel_path, entry, is_dir in walk_files(snapshot_path):
+                if not is_dir:
+                    st = entry.stat()
+                    # Inodes of the copy never match the source, so only
+                    # size and mtime are compared until the next snapshot.
+                    files[rel_path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'ino': None}
+        self.reset(snapshot_path, snapshot_format, files)
+
+    def ensure(self, latest_path, latest_format):
+        """Make the index describe the newest snapshot, rebuilding it if needed"""
+        if latest_path is None:
+            self.reset(None, None, {})
+            return
+        if (self.load() and self.snapshot == os.path.basename(latest_path)
+                and self.format == latest_format):
+            return
+        self.rebuild(latest_path, latest_format)
+        self.save()
+
+    def lookup(self, rel_path, st):
+        """Return the previous record for rel_path if the file is unchanged"""
+        record = self.files.get(rel_path)
+        if record is None:
+            return None
+        size, mtime_ns, ino = file_state(st)
+        if record['size'] != size or record['mtime_ns'] != mtime_ns:
+            return None
+        if record.get('ino') is not None and ino is not None and record['ino'] != ino:
+            return None
+        return record
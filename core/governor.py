@@ -0,0 +1,270 @@
+import os
+import sys
+import time
+import threading
+from core.throttle import TokenBucket
+
+DEFAULT_CHECK_SECONDS = 5
+DEFAULT_GAME_RATE_MB = 8
+# Largest single read/copy call while a rate applies, so pacing stays smooth
+THROTTLE_CHUNK = 1024 * 1024
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+# ioprio_set syscall numbers by machine; None elsewhere
+_IOPRIO_SET = {'x86_64': 251, 'i686': 289, 'i386': 289, 'aarch64': 30, 'armv7l': 314,
+               'ppc64le': 273, 'riscv64': 30, 's390x': 282}
+WINDOWS_BACKGROUND_BEGIN = 0x00010000
+
+_active = None
+_psutil = False  # not looked up yet
+
+
+def throttle(nbytes):
+    """Charge nbytes of backup I/O to the installed governor, sleeping if over its rate.
+
+    Called from every read/copy loop; without a governor this is one
+    global lookup.
+    """
+    governor = _active
+    if governor is not None:
+        governor.throttle(nbytes)
+
+
+def chunk_limit(size):
+    """Largest amount to move in one call: size itself unless a rate currently applies"""
+    governor = _active
+    if governor is not None and governor.limited():
+        return min(size, THROTTLE_CHUNK)
+    return size
+
+
+def install(governor):
+    """Make governor the one every backup, restore, prune and verify in this process answers to"""
+    global _active
+    _active = governor
+
+
+def lower_priority():
+    """Drop the calling thread to the lowest CPU and I/O priority, when the governor asks for it.
+
+    Used as the initializer of worker pools and background threads. On
+    Linux, nice values and I/O priorities belong to the thread, so only
+    backup workers are affected; Windows uses background mode, which
+    lowers both. Lowering can't be undone, so only short-lived workers
+    call this.
+    """
+    governor = _active
+    if governor is None or not governor.low_priority:
+        return
+    if sys.platform.startswith("linux"):
+        try:
+            os.nice(19 - os.nice(0))
+        except OSError:
+            pass
+        _ioprio_idle()
+    elif sys.platform == "win32":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), WINDOWS_BACKGROUND_BEGIN)
+
+
+def _ioprio_idle():
+    number = _IOPRIO_SET.get(os.uname().machine)
+    if number is None:
+        return
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.syscall(number, IOPRIO_WHO_PROCESS, 0, IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT)
+    except (OSError, AttributeError):
+        pass
+
+
+def init_worker_process(settings):
+    """ProcessPoolExecutor initializer: install a governor in the worker and lower its priority"""
+    install(IOGovernor.from_config(settings))
+    lower_priority()
+
+
+def process_pool_args(workers):
+    """initializer/initargs keyword arguments giving a process pool's workers their share of the governor"""
+    governor = _active
+    if governor is None:
+        return {}
+    return {'initializer': init_worker_process, 'initargs': (governor.worker_settings(workers),)}
+
+
+def _process_name(name):
+    name = os.path.basename(name).lower()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+def _load_psutil():
+    """psutil if installed, imported the first time a game check needs it"""
+    global _psutil
+    if _psutil is False:
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        _psutil = psutil
+    return _psutil
+
+
+def _running_processes():
+    """{pid: lower-case name without .exe} of every process we can see"""
+    psutil = _load_psutil()
+    if psutil is not None:
+        return {p.pid: _process_name(p.info['name'] or "") for p in psutil.process_iter(['name'])}
+    processes = {}
+    if os.path.isdir("/proc"):
+        for pid in os.listdir("/proc"):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f"/proc/{pid}/cmdline", 'rb') as f:
+                    argv0 = f.read().split(b"\0", 1)[0].decode('utf-8', 'replace')
+                if not argv0:
+                    with open(f"/proc/{pid}/comm") as f:
+                        argv0 = f.read().strip()
+            except OSError:
+                continue
+            # Wine and Proton run Windows games as C:\...\game.exe
+            processes[int(pid)] = _process_name(argv0.replace("\\", "/"))
+    return processes
+
+
+def _open_paths(pid):
+    """Paths a process has open, or nothing if we may not look"""
+    psutil = _load_psutil()
+    if psutil is not None:
+        try:
+            return [f.path for f in psutil.Process(pid).open_files()]
+        except psutil.Error:
+            return []
+    fd_dir = f"/proc/{pid}/fd"
+    try:
+        fds = os.listdir(fd_dir)
+    except OSError:
+        return []
+    paths = []
+    for fd in fds:
+        try:
+            paths.append(os.readlink(os.path.join(fd_dir, fd)))
+        except OSError:
+            continue
+    return paths
+
+
+class GameDetector:
+    """Tells whether any configured game is running, re-checking at most every check_seconds.
+
+    A game counts as running if a process has one of its configured names
+    (case-insensitive, with or without .exe), or, with match_open_files,
+    if any process has its source_path (a save file) or a file under it
+    (a save folder) open. Open handles are read from psutil when
+    installed, otherwise /proc on Linux.
+    """
+
+    def __init__(self, names=(), source_paths=(), match_open_files=True, check_seconds=DEFAULT_CHECK_SECONDS):
+        self.names = {_process_name(name) for name in names}
+        # Exact paths match a game that keeps its save in one file; the prefixes match folders
+        self.source_paths = {os.path.normcase(os.path.abspath(path)) for path in source_paths}
+        self._prefixes = tuple(path.rstrip(os.sep) + os.sep for path in self.source_paths)
+        self.match_open_files = match_open_files and bool(self.source_paths)
+        self.check_seconds = check_seconds
+        self._running = False
+        self._checked = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.names) or self.match_open_files
+
+    def running(self):
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        if self._checked is not None and now - self._checked < self.check_seconds:
+            return self._running
+        if not self._lock.acquire(blocking=False):
+            return self._running  # another worker is checking right now
+        try:
+            self._running = self._scan()
+            self._checked = time.monotonic()
+        finally:
+            self._lock.release()
+        return self._running
+
+    def _scan(self):
+        own = os.getpid()
+        processes = _running_processes()
+        if self.names and any(name in self.names for name in processes.values()):
+            return True
+        if self.match_open_files:
+            for pid in processes:
+                if pid == own:
+                    continue  # our own backup workers have the saves open
+                for path in _open_paths(pid):
+                    path = os.path.normcase(path)
+                    if path in self.source_paths or path.startswith(self._prefixes):
+                        return True
+        return False
+
+
+class IOGovernor:
+    """Limits how hard backups, restores, prunes and verifies hit the disk.
+
+    One governor is installed per process and every read or copy loop
+    charges its bytes to it. rate is the normal bytes/s limit (0 for
+    none); while the GameDetector sees a game running, the stricter
+    game_rate applies instead. With low_priority, worker threads and
+    processes also run at idle CPU and I/O priority.
+    """
+
+    def __init__(self, rate=0, game_rate=0, low_priority=False, detector=None, settings=None):
+        self.low_priority = low_priority
+        self.settings = settings or {}
+        self.detector = detector or GameDetector()
+        self._normal = TokenBucket(rate)
+        self._game = TokenBucket(game_rate)
+
+    @classmethod
+    def from_config(cls, settings, games=()):
+        """Governor for the `io_governor` setting; games are the configured game dicts"""
+        settings = dict(settings)
+        settings['processes'] = list(settings.get('processes', ()))
+        settings['source_paths'] = list(settings.get('source_paths', ()))
+        for cfg in games:
+            settings['processes'] += cfg.get('processes', ())
+            settings['source_paths'].append(cfg['source_path'])
+        detector = GameDetector(
+            settings['processes'],
+            settings['source_paths'],
+            match_open_files=settings.get('match_open_files', True),
+            check_seconds=settings.get('check_seconds', DEFAULT_CHECK_SECONDS)
+        )
+        return cls(
+            rate=settings.get('rate_mb', 0) * 1024 * 1024,
+            game_rate=settings.get('game_rate_mb', DEFAULT_GAME_RATE_MB) * 1024 * 1024,
+            low_priority=settings.get('low_priority', True),
+            detector=detector,
+            settings=settings
+        )
+
+    def worker_settings(self, workers):
+        """Settings for the governors of `workers` worker processes, sharing this one's rates"""
+        workers = max(1, workers)
+        return dict(self.settings,
+                    rate_mb=self.settings.get('rate_mb', 0) / workers,
+                    game_rate_mb=self.settings.get('game_rate_mb', DEFAULT_GAME_RATE_MB) / workers)
+
+    def _bucket(self):
+        return self._game if self._game.rate and self.detector.running() else self._normal
+
+    def limited(self):
+        return self._bucket().rate > 0
+
+    def throttle(self, nbytes):
+        self._bucket().consume(nbytes)
@@ -0,0 +1,181 @@
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from core.object_store import FOLDER_MANIFEST, load_manifest, is_manifest
+from core.archive import ArchiveReader
+from core.catalog import is_archive
+from core.copier import native_path
+from core.governor import throttle, process_pool_args
+
+READ_SIZE = 1024 * 1024
+DEFAULT_VERIFY_WORKERS = os.cpu_count() or 1
+# Below this many bytes, hashing in-process beats starting worker processes
+POOL_THRESHOLD = 32 * 1024 * 1024
+
+
+def hash_file(path):
+    """(size, BLAKE2b digest) of a file, or (None, error) if it cannot be read"""
+    h = hashlib.blake2b(digest_size=32)
+    size = 0
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(READ_SIZE)
+                if not data:
+                    break
+                h.update(data)
+                size += len(data)
+                throttle(len(data))
+    except OSError as e:
+        return None, e.strerror or str(e)
+    return size, h.hexdigest()
+
+
+def hash_members(archive_path, entries):
+    """[(size, digest)] of archive members after decompression, (None, error) on failure"""
+    results = []
+    try:
+        reader = ArchiveReader(archive_path)
+    except (OSError, ValueError) as e:
+        return [(None, str(e))] * len(entries)
+    with open(archive_path, 'rb') as f:
+        for entry in entries:
+            h = hashlib.blake2b(digest_size=32)
+            size = 0
+            try:
+                for data in reader.iter_member(entry, f):
+                    h.update(data)
+                    size += len(data)
+                    throttle(len(data))
+            except Exception as e:
+                results.append((None, str(e)))
+                continue
+            results.append((size, h.hexdigest()))
+    return results
+
+
+class Verifier:
+    """Checks snapshots against the sizes and digests recorded when they were written.
+
+    A full check re-reads and hashes every byte. Hashing is CPU-bound, so
+    large jobs are spread over a process pool; blobs shared by several
+    store snapshots are only hashed once per Verifier. A fast check only
+    compares sizes (and mtimes for folder copies) without reading data.
+    """
+
+    def __init__(self, store, fast=False, workers=DEFAULT_VERIFY_WORKERS):
+        self.store = store
+        self.fast = fast
+        self.workers = max(1, workers)
+        self._pool = None
+        self._blobs = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _map(self, func, jobs, total_bytes):
+        """Run func(*job) for every job, on the process pool when it is worth it"""
+        if self.workers == 1 or len(jobs) < 2 or total_bytes < POOL_THRESHOLD:
+            return [func(*job) for job in jobs]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, **process_pool_args(self.workers))
+        chunksize = max(1, len(jobs) // (self.workers * 4))
+        return list(self._pool.map(func, *zip(*jobs), chunksize=chunksize))
+
+    def verify(self, snapshot_path):
+        """Return (files checked, [problem descriptions]) for one snapshot.
+
+        Raises ValueError for a folder snapshot written before manifests existed.
+        """
+        if is_manifest(snapshot_path):
+            return self._verify_store(load_manifest(snapshot_path)['files'])
+        if is_archive(snapshot_path):
+            return self._verify_archive(snapshot_path)
+        manifest_path = os.path.join(snapshot_path, FOLDER_MANIFEST)
+        if not os.path.isfile(manifest_path):
+            raise ValueError("no manifest (created by an older version)")
+        return self._verify_folder(snapshot_path, load_manifest(manifest_path)['files'])
+
+    def _blob_sizes(self, digests):
+        """Size of every blob, or an error string, checking content unless in fast mode"""
+        todo = [d for d in digests if d not in self._blobs]
+        if self.fast:
+            for digest in todo:
+                try:
+                    self._blobs[digest] = os.path.getsize(self.store.blob_path(digest))
+                except OSError:
+                    self._blobs[digest] = f"blob {digest[:12]} missing"
+        elif todo:
+            jobs = [(self.store.blob_path(digest),) for digest in todo]
+            total = sum(os.path.getsize(path) for path, in jobs if os.path.exists(path))
+            results = self._map(hash_file, jobs, total)
+            for digest, (size, actual) in zip(todo, results):
+                if size is None:
+                    self._blobs[digest] = f"blob {digest[:12]}: {actual}"
+                else:
+                    self._blobs[digest] = size if actual == digest else f"blob {digest[:12]} corrupt"
+        return self._blobs
+
+    def _verify_store(self, files):
+        blobs = self._blob_sizes({d for entry in files for d in entry['chunks']})
+        problems = []
+        for entry in files:
+            sizes = [blobs[d] for d in entry['chunks']]
+            errors = [s for s in sizes if isinstance(s, str)]
+            if errors:
+                problems.append(f"{entry['path']}: {errors[0]}")
+            elif sum(sizes) != entry['size']:
+                problems.append(f"{entry['path']}: size mismatch")
+        return len(files), problems
+
+    def _verify_archive(self, archive_path):
+        reader = ArchiveReader(archive_path)
+        files = reader.files
+        problems = [f"{e['path']}: member outside archive" for e in files
+                    if e['offset'] + e['length'] > reader.index_offset]
+        if self.fast or problems:
+            return len(files), problems
+
+        # Batches of neighbouring members keep each worker's reads sequential
+        ordered = sorted(files, key=lambda e: e['offset'])
+        step = max(1, -(-len(ordered) // (self.workers * 4)))
+        batches = [ordered[i:i + step] for i in range(0, len(ordered), step)]
+        results = self._map(hash_members, [(archive_path, b) for b in batches],
+                            sum(e['size'] for e in files))
+        for batch, batch_results in zip(batches, results):
+            for entry, (size, digest) in zip(batch, batch_results):
+                if size is None:
+                    problems.append(f"{entry['path']}: {digest}")
+                elif size != entry['size'] or digest != entry['digest']:
+                    problems.append(f"{entry['path']}: content mismatch")
+        return len(files), problems
+
+    def _verify_folder(self, folder_path, files):
+        problems = []
+        if self.fast:
+            for entry in files:
+                try:
+                    st = os.stat(native_path(folder_path, entry['path']))
+                except OSError:
+                    problems.append(f"{entry['path']}: missing")
+                    continue
+                if st.st_size != entry['size'] or st.st_mtime_ns != entry['mtime_ns']:
+                    problems.append(f"{entry['path']}: size or mtime changed")
+            return len(files), problems
+
+        jobs = [(native_path(folder_path, entry['path']),) for entry in files]
+        results = self._map(hash_file, jobs, sum(entry['size'] for entry in files))
+        for entry, (size, digest) in zip(files, results):
+            if size is None:
+                problems.append(f"{entry['path']}: {digest}")
+            elif size != entry['size'] or digest != entry['digest']:
+                problems.append(f"{entry['path']}: content mismatch")
+        return len(files), problems
@@ -0,0 +1,236 @@
+import time
+import itertools
+import threading
+from collections import deque
+from core.progress import Progress, Cancelled
+
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_HISTORY = 100
+# Lower runs first: a restore overtakes queued backups, a root move waits for everything
+PRIORITIES = {'restore': 0, 'delete': 1, 'backup': 2, 'export': 3, 'config': 3, 'verify': 4, 'move': 5}
+DEFAULT_PRIORITY = 3
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+
+
+class Job:
+    """One operation submitted to a JobManager.
+
+    work(progress) does the work and returns (success, message) like the
+    core methods. game is the game it touches, or None for jobs that touch
+    every game (Update All, moving the root). on_done(job) and
+    on_progress(job, event) are called on the worker thread.
+    """
+
+    def __init__(self, job_id, kind, game, work, title=None, priority=DEFAULT_PRIORITY, key=None,
+                 on_done=None, on_progress=None):
+        self.id = job_id
+        self.kind = kind
+        self.game = game
+        self.work = work
+        self.title = title or (f"{kind} {game}" if game else kind)
+        self.priority = priority
+        self.key = key
+        self.state = QUEUED
+        self.success = None
+        self.message = ""
+        self.result = None
+        self.coalesced = 0
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.progress = Progress(None if on_progress is None else lambda event: on_progress(self, event))
+        self._callbacks = [on_done] if on_done is not None else []
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the job has finished (or was cancelled), returning False on timeout"""
+        return self._done.wait(timeout)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'game': self.game,
+            'title': self.title,
+            'state': self.state,
+            'success': self.success,
+            'message': self.message,
+            'priority': self.priority,
+            'coalesced': self.coalesced,
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+            'bytes_done': self.progress.bytes_done,
+            'bytes_total': self.progress.bytes_total
+        }
+
+    def _finish(self, state, success, message):
+        self.state = state
+        self.success = success
+        self.message = message
+        self.finished = time.time()
+        self._done.set()
+        for callback in self._callbacks:
+            callback(self)
+
+
+class JobManager:
+    """Runs backups, restores and other operations on a bounded pool, one at a time per game.
+
+    Queued jobs are started in priority order (PRIORITIES), oldest first
+    within a priority, but never while another job of the same game is
+    running; a job with game None waits until nothing else runs and holds
+    every game while it does. Submitting a job whose (kind, game, key) is
+    already queued returns the queued job instead of adding a second one,
+    so repeated clicks never copy the same saves twice. Finished jobs are
+    kept in a bounded history for status queries.
+    """
+
+    def __init__(self, workers=DEFAULT_JOB_WORKERS, history=DEFAULT_HISTORY):
+        self.workers = max(1, workers)
+        self._queue = []
+        self._running = {}
+        self._busy = set()
+        self._history = deque(maxlen=history)
+        self._cond = threading.Condition()
+        self._ids = itertools.count(1)
+        self._threads = []
+        self._closed = False
+
+    def submit(self, kind, game, work, title=None, priority=None, key=None, on_done=None, on_progress=None):
+        """Queue work(progress) for game (None = all games) and return its Job.
+
+        key tells apart jobs of one kind and game that are not duplicates,
+        such as restores of two different backups.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Job manager has been shut down")
+            full_key = (kind, game, key)
+            for job in self._queue:
+                if job.key == full_key:
+                    job.coalesced += 1
+                    if on_done is not None:
+                        job._callbacks.append(on_done)
+                    return job
+            job = Job(next(self._ids), kind, game, work, title,
+                      PRIORITIES.get(kind, DEFAULT_PRIORITY) if priority is None else priority,
+                      full_key, on_done, on_progress)
+            self._queue.append(job)
+            if len(self._threads) < self.workers and len(self._threads) - len(self._running) < len(self._queue):
+                thread = threading.Thread(target=self._worker, daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        return job
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; returns False if it already finished"""
+        with self._cond:
+            job = next((j for j in self._queue if j.id == job_id), None)
+            if job is not None:
+                self._queue.remove(job)
+                self._history.append(job)
+            else:
+                running = self._running.get(job_id)
+                if running is None:
+                    return False
+                running.progress.token.cancel()
+                return True
+        job.progress.token.cancel()
+        job._finish(CANCELLED, False, "Cancelled before it started")
+        return True
+
+    def get(self, job_id):
+        with self._cond:
+            for job in list(self._running.values()) + self._queue + list(self._history):
+                if job.id == job_id:
+                    return job
+        return None
+
+    def jobs(self):
+        """Status dicts of running jobs, then queued jobs in start order, then finished ones newest first"""
+        with self._cond:
+            queued = sorted(self._queue, key=lambda job: (job.priority, job.id))
+            jobs = list(self._running.values()) + queued + list(reversed(self._history))
+            return [job.to_dict() for job in jobs]
+
+    def shutdown(self, cancel=True, timeout=None):
+        """Stop accepting jobs and wait for the workers; with cancel, queued and running jobs are cancelled"""
+        with self._cond:
+            self._closed = True
+            dropped = list(self._queue) if cancel else []
+            for job in dropped:
+                self._queue.remove(job)
+                self._history.append(job)
+            if cancel:
+                for job in self._running.values():
+                    job.progress.token.cancel()
+            self._cond.notify_all()
+            threads = list(self._threads)
+        for job in dropped:
+            job.progress.token.cancel()
+            job._finish(CANCELLED, False, "Cancelled before it started")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def _next(self):
+        """Highest-priority queued job that may start now, or None (caller holds the lock)"""
+        if None in self._busy:
+            return None
+        for job in sorted(self._queue, key=lambda job: (job.priority, job.id)):
+            if job.game is None:
+                if not self._running:
+                    return job
+                return None  # nothing behind an all-games job may start, or it would never get its turn
+            if job.game not in self._busy:
+                return job
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next()
+                while job is None:
+                    if self._closed and not self._queue:
+                        return
+                    self._cond.wait()
+                    job = self._next()
+                self._queue.remove(job)
+                self._busy.add(job.game)
+                self._running[job.id] = job
+                job.state = RUNNING
+                job.started = time.time()
+            state, success, message = self._run(job)
+            with self._cond:
+                self._busy.discard(job.game)
+                del self._running[job.id]
+                self._history.append(job)
+                self._cond.notify_all()
+            job._finish(state, success, message)
+
+    @staticmethod
+    def _run(job):
+        try:
+            job.result = job.work(job.progress)
+            success, message = job.result[0], job.result[1]
+        except Cancelled:
+            success, message = False, "Cancelled"
+        except Exception as e:
+            success, message = False, str(e)
+        finally:
+            job.progress.finish()
+        if success:
+            return DONE, True, message
+        return (CANCELLED if job.progress.token.cancelled else FAILED), False, message
@@ -0,0 +1,285 @@
+import os
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+METRICS_FILE = "metrics.jsonl"
+PROMETHEUS_FILE = "game_backup.prom"
+DEFAULT_MAX_MB = 10
+DEFAULT_KEEP = 3
+PROMETHEUS_PREFIX = "gamebackup"
+
+_local = threading.local()
+
+
+class _NullSpan:
+    """Stand-in returned by span() when nothing is being recorded"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, nbytes=0, files=0):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """Time one phase (scan, copy, ...) of the operation recorded on this thread.
+
+    Phases run on worker threads are not attributed, and without a recorded
+    operation this returns NULL_SPAN, so instrumented code costs one
+    thread-local lookup when metrics are off.
+    """
+    operation = getattr(_local, 'operation', None)
+    if operation is None:
+        return NULL_SPAN
+    return _Phase(operation, name)
+
+
+class _Phase:
+    def __init__(self, operation, name):
+        self.operation = operation
+        self.name = name
+        self.bytes = 0
+        self.files = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.operation.add_phase(self.name, time.perf_counter() - self.start, self.bytes, self.files)
+        return False
+
+    def add(self, nbytes=0, files=0):
+        self.bytes += nbytes
+        self.files += files
+
+
+class Operation:
+    """One timed call of a GameBackupCore operation and the phases inside it.
+
+    An operation started while another is running on the same thread (the
+    safety snapshot inside a restore) is folded into the outer one as a
+    phase named after it.
+    """
+
+    def __init__(self, recorder, name, game=None):
+        self.recorder = recorder
+        self.name = name
+        self.game = game
+        self.status = 'ok'
+        self.bytes = 0
+        self.phases = {}
+
+    def __enter__(self):
+        self.outer = getattr(_local, 'operation', None)
+        _local.operation = self
+        self.time = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        _local.operation = self.outer
+        if exc_type is not None:
+            self.status = 'failed'
+        if self.outer is not None:
+            self.outer.add_phase(self.name, self.seconds, self.bytes, 0)
+        else:
+            self.recorder.record(self)
+        return False
+
+    def add_phase(self, name, seconds, nbytes, files):
+        phase = self.phases.setdefault(name, {'seconds': 0.0, 'count': 0, 'bytes': 0, 'files': 0})
+        phase['seconds'] += seconds
+        phase['count'] += 1
+        phase['bytes'] += nbytes
+        phase['files'] += files
+
+    def result(self, result):
+        """Take status and bytes from a (success, message[, bytes]) return value"""
+        if isinstance(result, tuple) and result:
+            if not result[0]:
+                self.status = 'cancelled' if 'cancelled' in str(result[1]).lower() else 'failed'
+            if len(result) > 2 and isinstance(result[2], int):
+                self.bytes += result[2]
+
+    def as_record(self):
+        return {
+            'time': self.time,
+            'op': self.name,
+            'game': self.game,
+            'status': self.status,
+            'seconds': round(self.seconds, 6),
+            'bytes': self.bytes,
+            'phases': {name: dict(p, seconds=round(p['seconds'], 6)) for name, p in self.phases.items()}
+        }
+
+
+def instrumented(name, game=True):
+    """Record calls of a GameBackupCore method as operation name.
+
+    With game=True the method's first argument is the game it works on.
+    When the core's recorder is disabled the method is called directly.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def run(self, *args, **kwargs):
+            recorder = self._metrics
+            if not recorder.enabled:
+                return method(self, *args, **kwargs)
+            game_name = args[0] if game and args else None
+            if isinstance(game_name, str):
+                game_name = game_name.strip().lower()  # Case-insensitive game name
+            with Operation(recorder, name, game_name) as operation:
+                result = method(self, *args, **kwargs)
+                operation.result(result)
+            return result
+        return run
+    return decorate
+
+
+class MetricsRecorder:
+    """Writes finished operations to a rotating JSON-lines file and a Prometheus textfile.
+
+    The JSON-lines file gets one record per operation with its phases and
+    is rotated to metrics.jsonl.1 ... .<keep> once it reaches max_mb. The
+    Prometheus file holds counters since the process started and is
+    rewritten atomically after every operation, as node-exporter's textfile
+    collector expects.
+    """
+
+    def __init__(self, enabled=False, directory=None, max_mb=DEFAULT_MAX_MB, keep=DEFAULT_KEEP,
+                 prometheus_dir=None):
+        self.enabled = enabled
+        self.directory = directory
+        self.max_bytes = max_mb * 1024 * 1024
+        self.keep = keep
+        self.prometheus_dir = prometheus_dir or directory
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    @classmethod
+    def from_config(cls, config, default_dir):
+        settings = config.get('metrics') or {}
+        return cls(
+            enabled=settings.get('enabled', False),
+            directory=settings.get('dir') or default_dir,
+            max_mb=settings.get('max_mb', DEFAULT_MAX_MB),
+            keep=settings.get('keep', DEFAULT_KEEP),
+            prometheus_dir=settings.get('prometheus_dir')
+        )
+
+    def record(self, operation):
+        record = operation.as_record()
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self._append(record)
+                self._count(record)
+                self._write_prometheus()
+            except OSError:
+                pass  # metrics must never fail a backup
+
+    def _append(self, record):
+        path = os.path.join(self.directory, METRICS_FILE)
+        try:
+            if os.path.getsize(path) >= self.max_bytes:
+                self._rotate(path)
+        except OSError:
+            pass
+        with open(path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _rotate(self, path):
+        for n in range(self.keep - 1, 0, -1):
+            if os.path.exists(f"{path}.{n}"):
+                os.replace(f"{path}.{n}", f"{path}.{n + 1}")
+        if self.keep > 0:
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+
+    def _count(self, record):
+        totals = self._totals.setdefault(record['op'], {
+            'statuses': {}, 'seconds': 0.0, 'bytes': 0, 'last': 0.0, 'phases': {}
+        })
+        totals['statuses'][record['status']] = totals['statuses'].get(record['status'], 0) + 1
+        totals['seconds'] += record['seconds']
+        totals['bytes'] += record['bytes']
+        totals['last'] = record['time'] + record['seconds']
+        for name, phase in record['phases'].items():
+            counted = totals['phases'].setdefault(name, {'seconds': 0.0, 'bytes': 0})
+            counted['seconds'] += phase['seconds']
+            counted['bytes'] += phase['bytes']
+
+    def _write_prometheus(self):
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {p}_operations_total Operations finished, by result",
+            f"# TYPE {p}_operations_total counter",
+        ]
+        for op, totals in sorted(self._totals.items()):
+            for status, count in sorted(totals['statuses'].items()):
+                lines.append(f'{p}_operations_total{{op="{op}",status="{status}"}} {count}')
+        metrics = [
+            ('operation_seconds_total', 'Time spent in operations', 'counter', 'seconds'),
+            ('operation_bytes_total', 'Bytes written by operations', 'counter', 'bytes'),
+            ('last_operation_timestamp_seconds', 'When the operation last finished', 'gauge', 'last'),
+        ]
+        for metric, help_text, kind, key in metrics:
+            lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} {kind}"]
+            for op, totals in sorted(self._totals.items()):
+                lines.append(f'{p}_{metric}{{op="{op}"}} {totals[key]}')
+        for metric, help_text, key in (('phase_seconds_total', 'Time spent in each phase', 'seconds'),
+                                       ('phase_bytes_total', 'Bytes handled in each phase', 'bytes')):
+            lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} counter"]
+            for op, totals in sorted(self._totals.items()):
+                for name, phase in sorted(totals['phases'].items()):
+                    lines.append(f'{p}_{metric}{{op="{op}",phase="{name}"}} {phase[key]}')
+
+        os.makedirs(self.prometheus_dir, exist_ok=True)
+        path = os.path.join(self.prometheus_dir, PROMETHEUS_FILE)
+        tmp_path = path + ".tmp"  # the collector ignores names not ending in .prom
+        with open(tmp_path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+
+@contextmanager
+def capture(path, memory=False, top=30):
+    """Profile everything the calling thread does inside the block.
+
+    cProfile stats go to path (open them with pstats or snakeviz). With
+    memory=True, tracemalloc also runs and the top allocation sites and
+    peak are written to path + ".mem.txt". Work done on copy worker
+    threads shows up as time waiting on the pool.
+    """
+    import cProfile
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    if memory:
+        tracemalloc.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(path + ".mem.txt", 'w') as f:
+                f.write(f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n\n")
+                for stat in snapshot.statistics('lineno')[:top]:
+                    f.write(f"{stat}\n")
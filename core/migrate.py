@@ -0,0 +1,175 @@
+import os
+import json
+import errno
+import shutil
+from core.copier import CopyEngine, walk_files
+from core.integrity import hash_file
+
+JOURNAL_FILE = ".migration.json"
+
+
+def nested(path, other):
+    """True if the two directories are the same or one contains the other"""
+    path = os.path.normcase(os.path.abspath(path))
+    other = os.path.normcase(os.path.abspath(other))
+    return path == other or path.startswith(other.rstrip(os.sep) + os.sep) or other.startswith(path.rstrip(os.sep) + os.sep)
+
+
+def load_journal(root):
+    """The unfinished migration into root, or None"""
+    try:
+        with open(os.path.join(root, JOURNAL_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class RootMigration:
+    """Moves named entries of the backup root (game folders, object store, catalog) to a new root.
+
+    Entries are renamed when both roots are on the same filesystem, which
+    is instant whatever their size. Across filesystems they are copied on
+    the CopyEngine's pool, hard links between folder snapshots are
+    recreated rather than duplicated, and every copied file is re-hashed
+    and compared with the source before anything is deleted. A journal in
+    the new root records the plan, so running the same migration again
+    after a crash or a cancel skips files that were already copied and
+    picks up where it stopped. The old copies are only deleted once the
+    new root is complete and on_switch() has pointed the settings at it.
+    """
+
+    def __init__(self, old_root, new_root, names, engine=None, progress=None):
+        self.old_root = old_root
+        self.new_root = new_root
+        self.names = names
+        self.engine = engine or CopyEngine(progress=progress)
+        self.progress = progress
+        self.journal_path = os.path.join(new_root, JOURNAL_FILE)
+
+    def _save_journal(self, journal):
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(journal, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def run(self, on_switch):
+        """Move everything, returning (entries renamed, bytes copied)"""
+        os.makedirs(self.new_root, exist_ok=True)
+        journal = load_journal(self.new_root)
+        if journal is None:
+            for name in self.names:
+                if os.path.lexists(os.path.join(self.new_root, name)):
+                    raise ValueError(f"{self.new_root} already contains {name}")
+            journal = {'from': self.old_root, 'names': self.names, 'phase': 'moving', 'copied': []}
+            self._save_journal(journal)
+        elif os.path.normcase(journal['from']) != os.path.normcase(self.old_root):
+            raise ValueError(f"{self.new_root} holds an unfinished migration from {journal['from']}")
+
+        renamed = 0
+        copied_bytes = 0
+        if journal['phase'] == 'moving':
+            copied = []
+            for name in journal['names']:
+                src = os.path.join(self.old_root, name)
+                dst = os.path.join(self.new_root, name)
+                if not os.path.lexists(src):
+                    continue  # renamed by an earlier run
+                if not os.path.lexists(dst):
+                    try:
+                        os.rename(src, dst)
+                        renamed += 1
+                        continue
+                    except OSError as e:
+                        if e.errno != errno.EXDEV:
+                            raise
+                copied.append(name)
+
+            copied_bytes = self._copy(copied)
+            journal.update(phase='cleanup', copied=copied)
+            self._save_journal(journal)
+
+        on_switch()
+        for name in journal['copied']:
+            src = os.path.join(self.old_root, name)
+            if os.path.isdir(src) and not os.path.islink(src):
+                shutil.rmtree(src, ignore_errors=True)
+            elif os.path.lexists(src):
+                os.remove(src)
+        os.remove(self.journal_path)
+        return renamed, copied_bytes
+
+    def _copy(self, names):
+        """Copy entries across filesystems and verify them, returning bytes copied"""
+        dirs = []
+        primaries = {}
+        to_copy = []
+        resumed = []
+        links = []
+        for name in names:
+            src_root = os.path.join(self.old_root, name)
+            dst_root = os.path.join(self.new_root, name)
+            if os.path.isdir(src_root):
+                os.makedirs(dst_root, exist_ok=True)
+                dirs.append((src_root, dst_root))
+                walk = ((entry.path, os.path.join(dst_root, *rel_path.split('/')), is_dir)
+                        for rel_path, entry, is_dir in walk_files(src_root))
+            else:
+                walk = [(src_root, dst_root, False)]
+
+            for src, dst, is_dir in walk:
+                if is_dir:
+                    os.makedirs(dst, exist_ok=True)
+                    dirs.append((src, dst))
+                    continue
+                st = os.stat(src)
+                key = (st.st_dev, st.st_ino) if st.st_nlink > 1 and st.st_ino else None
+                if key in primaries:
+                    links.append((src, dst, primaries[key]))
+                    continue
+                if key is not None:
+                    primaries[key] = dst
+                try:
+                    dst_st = os.stat(dst)
+                    unchanged = dst_st.st_size == st.st_size and dst_st.st_mtime_ns == st.st_mtime_ns
+                except OSError:
+                    unchanged = False
+                if unchanged:
+                    resumed.append((src, dst))  # copied before an interruption
+                else:
+                    to_copy.append((src, dst, st.st_size))
+
+        if self.progress is not None:
+            self.progress.add_total(sum(size for _, _, size in to_copy), len(to_copy))
+        pairs = [(src, dst) for src, dst, _ in to_copy]
+        results = self.engine.copy_files_digest(pairs)
+        copied_bytes = sum(copied for copied, _ in results)
+
+        checks = [(dst, digest, None) for (_, dst), (_, digest) in zip(pairs, results)]
+        checks += [(dst, None, src) for src, dst in resumed]
+
+        def _check(item):
+            dst, digest, src = item
+            if digest is None:
+                digest = hash_file(src)[1]
+            if hash_file(dst)[1] != digest:
+                os.remove(dst)  # so the next run copies it again
+                raise RuntimeError(f"Copy of {src or dst} does not match the original")
+
+        self.engine.run(_check, checks)
+
+        for src, dst, primary in links:
+            if os.path.exists(dst) and os.path.samefile(dst, primary):
+                continue
+            if os.path.lexists(dst):
+                os.remove(dst)
+            try:
+                os.link(primary, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+
+        # Directory times change while their contents are written, so copy them last
+        for src_dir, dst_dir in reversed(dirs):
+            shutil.copystat(src_dir, dst_dir)
+        return copied_bytes
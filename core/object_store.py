@@ -0,0 +1,330 @@
+import os
+import json
+import threading
+import time
+import hashlib
+from datetime import datetime
+from core.metrics import span
+from core.governor import throttle
+
+OBJECTS_DIR = ".objects"
+MANIFEST_SUFFIX = ".manifest.json"
+FOLDER_MANIFEST = ".snapshot.json"
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 4 * 1024 * 1024
+DELTA_THRESHOLD = 64 * 1024 * 1024
+DELTA_CHUNK_SIZE = 256 * 1024
+GC_GRACE_SECONDS = 3600
+
+
+def _hasher():
+    return hashlib.blake2b(digest_size=32)
+
+
+def is_manifest(path):
+    """Check whether a path points at a snapshot manifest"""
+    return path.endswith(MANIFEST_SUFFIX)
+
+
+def load_manifest(manifest_path):
+    """Read a snapshot manifest from disk"""
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, manifest_path):
+    """Write a snapshot manifest atomically"""
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, manifest_path)
+
+
+class ObjectStore:
+    """Content-addressed blob store shared by every game under the backup root.
+
+    Files are split into fixed-size chunks, each chunk is stored once under
+    its BLAKE2b digest, and a snapshot is just a manifest listing the chunks
+    of every file. Files of DELTA_THRESHOLD bytes or more (one big save
+    database) use the smaller delta_chunk_size, so a backup after a few
+    pages changed only stores those blocks instead of whole 4 MiB chunks.
+    """
+
+    def __init__(self, root_dir, chunk_size=CHUNK_SIZE, delta_chunk_size=DELTA_CHUNK_SIZE, manifest_dirs=()):
+        self.root_dir = root_dir
+        self.objects_dir = os.path.join(root_dir, OBJECTS_DIR)
+        self.chunk_size = chunk_size
+        self.delta_chunk_size = delta_chunk_size
+        # Backup folders outside the root (or nested inside it) also hold manifests
+        self.manifest_dirs = list(manifest_dirs)
+
+    def blob_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def has(self, digest):
+        return os.path.exists(self.blob_path(digest))
+
+    def chunk_size_for(self, size):
+        """Block size used to split a file of the given size"""
+        return self.delta_chunk_size if size >= DELTA_THRESHOLD else self.chunk_size
+
+    def put(self, data):
+        """Store a chunk, returning (digest, bytes written)"""
+        h = _hasher()
+        h.update(data)
+        digest = h.hexdigest()
+        return digest, self._put_blob(digest, data)
+
+    def _put_blob(self, digest, data):
+        blob_path = self.blob_path(digest)
+        if os.path.exists(blob_path):
+            # Refresh the mtime so a concurrent collect_garbage() treats the
+            # blob as young until our manifest lands.
+            os.utime(blob_path)
+            return 0
+
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            # Durable before any manifest (which is fsynced) can refer to it
+            os.fsync(f.fileno())
+        os.replace(tmp_path, blob_path)
+        return len(data)
+
+    def store_file(self, path, known=(), progress=None):
+        """Chunk and store a file, returning (chunks, file digest, new bytes).
+
+        Chunks whose digest is in known (the previous snapshot of this file)
+        are already in the store, so an unchanged block of a large file costs
+        one hash update and, once per file, the mtime refresh that keeps the
+        blob safe from a collect_garbage() running after a prune removed
+        that previous snapshot.
+        """
+        chunks = []
+        refreshed = set()
+        new_bytes = 0
+        file_hash = _hasher()
+        with open(path, 'rb') as f:
+            chunk_size = self.chunk_size_for(os.fstat(f.fileno()).st_size)
+            while True:
+                data = f.read(chunk_size)
+                if not data:
+                    break
+                file_hash.update(data)
+                h = _hasher()
+                h.update(data)
+                digest = h.hexdigest()
+                if digest not in known:
+                    new_bytes += self._put_blob(digest, data)
+                elif digest not in refreshed:
+                    refreshed.add(digest)
+                    new_bytes += self._put_blob(digest, data)  # rewritten if it was already collected
+                chunks.append(digest)
+                throttle(len(data))
+                if progress is not None:
+                    progress.advance(len(data))
+        return chunks, file_hash.hexdigest(), new_bytes
+
+    def iter_chunks(self, chunks):
+        for digest in chunks:
+            with open(self.blob_path(digest), 'rb') as f:
+                yield f.read()
+
+    def restore_file(self, entry, dest_path):
+        """Rebuild one manifest entry at dest_path with its original metadata"""
+        from core.copier import append_fileobj
+
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        with open(dest_path, 'wb') as f:
+            # Blobs are stored uncompressed, so each one can be spliced in
+            # with copy_file_range/sendfile instead of a userspace read.
+            for digest in entry['chunks']:
+                with open(self.blob_path(digest), 'rb') as blob:
+                    append_fileobj(blob, f, os.fstat(blob.fileno()).st_size)
+        os.utime(dest_path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+        os.chmod(dest_path, entry['mode'])
+
+    # ========== SNAPSHOTS ==========
+
+    def _file_entry(self, rel_path, full_path, st, index, progress=None, capture=None):
+        previous = index.lookup(rel_path, st) if index is not None else None
+        if previous is not None:
+            # The indexed snapshot still exists, so its blobs are live.
+            if progress is not None:
+                progress.advance(st.st_size)
+            return dict(previous, ino=st.st_ino or None), 0
+
+        known = set(index.files.get(rel_path, {}).get('chunks', ())) if index is not None else ()
+        if capture is not None:
+            # Blobs written by a torn attempt stay on disk until collect_garbage(), so count them
+            written = []
+
+            def _attempt():
+                stored = self.store_file(full_path, known, progress)
+                written.append(stored[2])
+                return stored
+            (chunks, digest, _), st = capture.read(rel_path, full_path, st, _attempt, progress)
+            new_bytes = sum(written)
+        else:
+            chunks, digest, new_bytes = self.store_file(full_path, known, progress)
+        return {
+            'path': rel_path,
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'ino': st.st_ino or None,
+            'mode': st.st_mode & 0o7777,
+            'digest': digest,
+            'chunks': chunks
+        }, new_bytes
+
+    def snapshot(self, source_path, manifest_path, index=None, engine=None, progress=None, capture=None):
+        """Store source_path and write its manifest, returning (bytes newly stored, manifest).
+
+        Files the FileIndex reports as unchanged reuse the previous
+        snapshot's chunk list without being read again. Files are hashed
+        and stored on the CopyEngine's worker pool when one is given.
+        With a core.capture.Capture, files are read from its read_path and
+        re-read if they change while being stored. The manifest is only
+        written once every file is stored, so a cancelled snapshot leaves
+        nothing but unreferenced blobs for collect_garbage().
+        """
+        from core.copier import walk_files
+
+        if capture is not None:
+            source_path = capture.read_path
+        dirs = []
+        with span("scan"):
+            if os.path.isdir(source_path):
+                kind = 'dir'
+                work = []
+                for rel_path, entry, is_dir in walk_files(source_path):
+                    if is_dir:
+                        dirs.append(rel_path)
+                    else:
+                        work.append((rel_path, entry.path, entry.stat()))
+            else:
+                kind = 'file'
+                work = [(os.path.basename(source_path), source_path, os.stat(source_path))]
+
+        if progress is not None:
+            progress.add_total(sum(st.st_size for _, _, st in work), len(work))
+
+        def _store(item):
+            stored = self._file_entry(*item, index, progress, capture)
+            if progress is not None:
+                progress.advance(files=1)
+            return stored
+
+        with span("store") as phase:
+            stored = engine.run(_store, work) if engine is not None else [_store(w) for w in work]
+            files = [file_entry for file_entry, _ in stored]
+            new_bytes = sum(written for _, written in stored)
+            phase.add(new_bytes, len(work))
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'created': datetime.now().timestamp(),
+            'source_path': capture.source_path if capture is not None else source_path,
+            'kind': kind,
+            'dirs': sorted(dirs),
+            'files': sorted(files, key=lambda e: e['path'])
+        }
+        if capture is not None:
+            manifest['unsettled'] = sorted(capture.unsettled)
+        with span("manifest"):
+            save_manifest(manifest, manifest_path)
+        return new_bytes, manifest
+
+    def restore(self, manifest_path, dest_path, engine=None, paths=None):
+        """Materialise a snapshot (or only the given relative paths) at dest_path.
+
+        Returns the number of bytes written.
+        """
+        from core.copier import native_path
+
+        manifest = load_manifest(manifest_path)
+        if manifest['kind'] == 'file':
+            self.restore_file(manifest['files'][0], dest_path)
+            return manifest['files'][0]['size']
+
+        os.makedirs(dest_path, exist_ok=True)
+        files = manifest['files']
+        if paths is None:
+            for rel_dir in manifest['dirs']:
+                os.makedirs(native_path(dest_path, rel_dir), exist_ok=True)
+        else:
+            wanted = set(paths)
+            files = [entry for entry in files if entry['path'] in wanted]
+
+        def _restore(entry):
+            self.restore_file(entry, native_path(dest_path, entry['path']))
+
+        if engine is not None:
+            engine.run(_restore, files)
+        else:
+            for entry in files:
+                _restore(entry)
+        return sum(entry['size'] for entry in files)
+
+    # ========== GARBAGE COLLECTION ==========
+
+    def iter_manifests(self):
+        """Yield the path of every manifest in manifest_dirs or in a folder directly under the backup root"""
+        dirs = {os.path.normcase(os.path.abspath(d)): d for d in self.manifest_dirs}
+        if os.path.isdir(self.root_dir):
+            with os.scandir(self.root_dir) as games:
+                for game in games:
+                    if game.name != OBJECTS_DIR and game.is_dir():
+                        dirs.setdefault(os.path.normcase(os.path.abspath(game.path)), game.path)
+        for backup_dir in dirs.values():
+            try:
+                it = os.scandir(backup_dir)
+            except FileNotFoundError:
+                continue
+            with it:
+                for entry in it:
+                    if is_manifest(entry.name):
+                        yield entry.path
+
+    def live_digests(self):
+        live = set()
+        for manifest_path in self.iter_manifests():
+            for entry in load_manifest(manifest_path)['files']:
+                live.update(entry['chunks'])
+        return live
+
+    def collect_garbage(self, limiter=None):
+        """Delete blobs no manifest references, returning (blobs removed, bytes freed).
+
+        An optional TokenBucket paces the deletions.
+        """
+        if not os.path.isdir(self.objects_dir):
+            return 0, 0
+
+        # Blobs younger than the grace period may belong to a snapshot whose
+        # manifest has not been written yet.
+        cutoff = time.time() - GC_GRACE_SECONDS
+        live = self.live_digests()
+        removed = 0
+        freed = 0
+        with os.scandir(self.objects_dir) as prefixes:
+            for prefix in prefixes:
+                if not prefix.is_dir():
+                    continue
+                with os.scandir(prefix.path) as blobs:
+                    for blob in blobs:
+                        if blob.name in live:
+                            continue
+                        st = blob.stat()
+                        if st.st_mtime > cutoff:
+                            continue
+                        if limiter is not None:
+                            limiter.consume(st.st_size)
+                        os.remove(blob.path)
+                        removed += 1
+                        freed += st.st_size
+        return removed, freed
@@ -0,0 +1,106 @@
+import time
+import threading
+
+DEFAULT_INTERVAL = 0.25
+RATE_SMOOTHING = 0.3
+
+
+class Cancelled(Exception):
+    """Raised inside a long operation once its CancelToken has been cancelled"""
+
+
+class CancelToken:
+    """Thread-safe flag a caller sets to ask a running operation to stop"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled("Cancelled")
+
+
+class Progress:
+    """Byte and file counters shared by every worker of one operation.
+
+    Workers call add_total() as they discover work and advance() as they
+    finish it; advance() also raises Cancelled once the token is cancelled,
+    which is how copy loops notice a cancel between chunks. Events go to
+    on_event (a callback or a queue's put) at most once per interval, so a
+    UI thread is never flooded:
+
+        {'bytes_done', 'bytes_total', 'files_done', 'files_total',
+         'rate' (bytes/s), 'eta' (seconds or None), 'finished'}
+    """
+
+    def __init__(self, on_event=None, token=None, interval=DEFAULT_INTERVAL):
+        self.on_event = on_event
+        self.token = token or CancelToken()
+        self.interval = interval
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.files_done = 0
+        self.files_total = 0
+        self.rate = 0.0
+        self._lock = threading.Lock()
+        self._last_emit = None
+        self._last_bytes = 0
+
+    def check(self):
+        self.token.check()
+
+    def add_total(self, nbytes, files=0):
+        with self._lock:
+            self.bytes_total += nbytes
+            self.files_total += files
+
+    def advance(self, nbytes=0, files=0):
+        self.token.check()
+        with self._lock:
+            self.bytes_done += nbytes
+            self.files_done += files
+            event = self._event(False)
+        if event is not None and self.on_event is not None:
+            self.on_event(event)
+
+    def finish(self):
+        """Emit a final event regardless of the interval"""
+        with self._lock:
+            event = self._event(True)
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def _event(self, finished):
+        now = time.monotonic()
+        if self._last_emit is None:
+            self._last_emit = now
+            if not finished:
+                return None
+        elapsed = now - self._last_emit
+        if not finished and elapsed < self.interval:
+            return None
+
+        if elapsed > 0:
+            current = (self.bytes_done - self._last_bytes) / elapsed
+            self.rate = current if self.rate == 0 else (
+                RATE_SMOOTHING * current + (1 - RATE_SMOOTHING) * self.rate)
+        self._last_emit = now
+        self._last_bytes = self.bytes_done
+
+        remaining = max(0, self.bytes_total - self.bytes_done)
+        return {
+            'bytes_done': self.bytes_done,
+            'bytes_total': self.bytes_total,
+            'files_done': self.files_done,
+            'files_total': self.files_total,
+            'rate': self.rate,
+            'eta': remaining / self.rate if self.rate > 0 else None,
+            'finished': finished
+        }
@@ -0,0 +1,463 @@
+import os
+import hmac
+import lzma
+import zlib
+import queue
+import shutil
+import hashlib
+import tempfile
+import threading
+import http.client
+import urllib.parse
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from core.copier import native_path, copy_file
+from core.object_store import OBJECTS_DIR, FOLDER_MANIFEST, load_manifest, is_manifest
+from core.catalog import is_archive
+from core.governor import lower_priority, throttle, chunk_limit
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_REPLICATION_WORKERS = 4
+READ_SIZE = 1024 * 1024
+# Compressed objects are spooled in memory up to this size, then to a temp file
+SPOOL_SIZE = 8 * 1024 * 1024
+REPLICA_SUFFIXES = {"zstd": ".zst", "xz": ".xz", "gzip": ".gz"}
+S3_NAMESPACE = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+
+def _compressor(codec):
+    """Streaming compressor producing a standard .zst/.xz/.gz file"""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        return zstandard.ZstdCompressor().compressobj()
+    if codec == "xz":
+        return lzma.LZMACompressor()
+    if codec == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    raise ValueError(f"Unknown replica compression: {codec}")
+
+
+class LocalTarget:
+    """Replica on another local disk, mount or network share.
+
+    Uncompressed replicas keep the layout of the backup root, so the
+    target directory can be used as a root directory as it is.
+    """
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+
+    def _path(self, key):
+        return native_path(self.path, key)
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def _write(self, key, write):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put_file(self, key, src_path):
+        """Copy a local file to key, returning the bytes sent"""
+        sent = []
+        self._write(key, lambda tmp_path: sent.append(copy_file(src_path, tmp_path)))
+        return sent[0]
+
+    def put(self, key, fileobj, size):
+        def _write(tmp_path):
+            with open(tmp_path, 'wb') as f:
+                shutil.copyfileobj(fileobj, f, READ_SIZE)
+        self._write(key, _write)
+        return size
+
+    def copy(self, src_key, key):
+        """Hard-link an object already on the target, returning False if that is not possible"""
+        try:
+            self._write(key, lambda tmp_path: os.link(self._path(src_key), tmp_path))
+            return True
+        except OSError:
+            return False
+
+
+class _ThrottledReader:
+    """Request body that charges every read to the I/O governor, like copy_file does for local targets"""
+
+    def __init__(self, f):
+        self._f = f
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        throttle(len(data))
+        return data
+
+    def seek(self, offset, whence=0):
+        return self._f.seek(offset, whence)
+
+
+def sigv4_headers(method, host, path, query, headers, payload_hash, access_key, secret_key,
+                  region, amz_date):
+    """Request headers signed with AWS Signature Version 4 for the s3 service"""
+    headers = {k.lower(): str(v).strip() for k, v in headers.items()}
+    headers.update({'host': host, 'x-amz-date': amz_date, 'x-amz-content-sha256': payload_hash})
+    signed = ";".join(sorted(headers))
+    canonical_query = "&".join(
+        f"{urllib.parse.quote(k, safe='-_.~')}={urllib.parse.quote(v, safe='-_.~')}"
+        for k, v in sorted(query.items())
+    )
+    canonical_request = "\n".join([
+        method, path, canonical_query,
+        "".join(f"{k}:{headers[k]}\n" for k in sorted(headers)),
+        signed, payload_hash
+    ])
+    scope = f"{amz_date[:8]}/{region}/s3/aws4_request"
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", amz_date, scope,
+        hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+    ])
+    key = ("AWS4" + secret_key).encode('utf-8')
+    for part in (amz_date[:8], region, "s3", "aws4_request"):
+        key = hmac.new(key, part.encode('utf-8'), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+    headers['authorization'] = (f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+                                f"SignedHeaders={signed}, Signature={signature}")
+    return headers
+
+
+class S3Target:
+    """Replica in a bucket of any S3-compatible service (AWS, MinIO, ...).
+
+    Requests are signed with SigV4 using only the standard library and
+    sent path-style (endpoint/bucket/key), which every S3 implementation
+    accepts. Existence checks list each key's folder once per target and
+    cache the result, so finding what a replica lacks costs one LIST per
+    folder rather than one request per object.
+    """
+
+    def __init__(self, name, endpoint_url, bucket, prefix="", access_key=None, secret_key=None,
+                 region="us-east-1", timeout=60):
+        parsed = urllib.parse.urlsplit(endpoint_url)
+        self.name = name
+        self.secure = parsed.scheme == "https"
+        self.host = parsed.netloc
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.access_key = access_key or os.environ.get('AWS_ACCESS_KEY_ID', '')
+        self.secret_key = secret_key or os.environ.get('AWS_SECRET_ACCESS_KEY', '')
+        self.region = region
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._listed = {}
+
+    def _key(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+            conn = self._local.conn = cls(self.host, timeout=self.timeout, blocksize=READ_SIZE)
+        return conn
+
+    def _request(self, method, key="", query=None, headers=None, body=None):
+        """Send one signed request, returning (status, body bytes); raises OSError on failure"""
+        path = "/" + urllib.parse.quote(f"{self.bucket}/{key}" if key else self.bucket, safe="/-_.~")
+        query = query or {}
+        payload_hash = UNSIGNED_PAYLOAD if body is not None else EMPTY_SHA256
+        amz_date = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        signed = sigv4_headers(method, self.host, path, query, headers or {}, payload_hash,
+                               self.access_key, self.secret_key, self.region, amz_date)
+        url = path + ("?" + urllib.parse.urlencode(query, quote_via=urllib.parse.quote) if query else "")
+        for attempt in range(2):
+            # A pooled keep-alive connection may have been closed by the server
+            conn = self._connection()
+            try:
+                conn.request(method, url, body=body, headers=signed)
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                self._local.conn = None
+                if attempt or (body is not None and not hasattr(body, 'seek')):
+                    raise
+                if body is not None:
+                    body.seek(0)
+        if response.status >= 300:
+            raise OSError(f"{self.name}: {method} {key or self.bucket} failed with HTTP {response.status}")
+        return response.status, data
+
+    def _list(self, folder):
+        """Keys directly inside folder (ending in /), listed once and cached"""
+        with self._lock:
+            listed = self._listed.get(folder)
+        if listed is not None:
+            return listed
+        keys = set()
+        query = {'list-type': '2', 'prefix': self._key(folder), 'delimiter': '/'}
+        while True:
+            _, data = self._request("GET", query=query)
+            result = ET.fromstring(data)
+            for contents in result.iter(f"{S3_NAMESPACE}Contents"):
+                keys.add(contents.find(f"{S3_NAMESPACE}Key").text)
+            token = result.find(f"{S3_NAMESPACE}NextContinuationToken")
+            if result.findtext(f"{S3_NAMESPACE}IsTruncated") != "true" or token is None:
+                break
+            query['continuation-token'] = token.text
+        with self._lock:
+            self._listed[folder] = keys
+        return keys
+
+    def _added(self, key):
+        with self._lock:
+            listed = self._listed.get(key.rpartition('/')[0] + '/')
+            if listed is not None:
+                listed.add(self._key(key))
+
+    def exists(self, key):
+        return self._key(key) in self._list(key.rpartition('/')[0] + '/')
+
+    def put(self, key, fileobj, size):
+        self._request("PUT", self._key(key), headers={'content-length': size}, body=fileobj)
+        self._added(key)
+        return size
+
+    def put_file(self, key, src_path):
+        with open(src_path, 'rb') as f:
+            return self.put(key, _ThrottledReader(f), os.fstat(f.fileno()).st_size)
+
+    def copy(self, src_key, key):
+        """Server-side copy of an object already in the bucket; no data is sent"""
+        source = urllib.parse.quote(f"/{self.bucket}/{self._key(src_key)}", safe="/-_.~")
+        try:
+            self._request("PUT", self._key(key), headers={'x-amz-copy-source': source})
+        except OSError:
+            return False
+        self._added(key)
+        return True
+
+
+def make_target(settings):
+    """Replication target described by one entry of the `replication.targets` setting"""
+    kind = settings.get('type', 'local')
+    name = settings.get('name') or settings.get('path') or settings.get('bucket')
+    if kind == 'local':
+        return LocalTarget(name, settings['path'])
+    if kind == 's3':
+        return S3Target(
+            name, settings['endpoint_url'], settings['bucket'],
+            prefix=settings.get('prefix', ''),
+            access_key=settings.get('access_key'),
+            secret_key=settings.get('secret_key'),
+            region=settings.get('region', 'us-east-1')
+        )
+    raise ValueError(f"Unknown replication target type: {kind}")
+
+
+def _snapshot_objects(snapshot_path, prefix, store_root):
+    """([(key, local path, digest)] of a snapshot's data, commit (key, local path, is data)).
+
+    The commit object (the manifest, or the archive itself) is sent last,
+    so a snapshot only appears on a target once everything it needs is there.
+    """
+    name = os.path.basename(snapshot_path)
+    if is_manifest(snapshot_path):
+        objects = {}
+        for entry in load_manifest(snapshot_path)['files']:
+            for digest in entry['chunks']:
+                key = f"{OBJECTS_DIR}/{digest[:2]}/{digest}"
+                objects[key] = (key, native_path(store_root, key), None)
+        return list(objects.values()), (f"{prefix}/{name}", snapshot_path, False)
+    if is_archive(snapshot_path):
+        # Already compressed, so never compressed again
+        return [], (f"{prefix}/{name}", snapshot_path, False)
+
+    manifest_path = os.path.join(snapshot_path, FOLDER_MANIFEST)
+    if os.path.isfile(manifest_path):
+        objects = [(f"{prefix}/{name}/{entry['path']}", native_path(snapshot_path, entry['path']),
+                    entry.get('digest')) for entry in load_manifest(manifest_path)['files']]
+        return objects, (f"{prefix}/{name}/{FOLDER_MANIFEST}", manifest_path, False)
+
+    # Copies made before manifests existed; their last file commits them
+    objects = [(f"{prefix}/{name}/{rel_path}", native_path(snapshot_path, rel_path), None)
+               for rel_path in _walk_relative(snapshot_path)]
+    if not objects:
+        return [], None
+    return objects[:-1], objects[-1][:2] + (True,)
+
+
+def _walk_relative(root):
+    for dirpath, _, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        for filename in sorted(filenames):
+            yield filename if rel_dir == '.' else f"{rel_dir}/{filename}"
+
+
+def _in_snapshot(key, prefix):
+    """Path of a folder snapshot file inside its snapshot, to match it across snapshots"""
+    return key[len(prefix) + 1:].partition('/')[2]
+
+
+class Replicator:
+    """Sends snapshots to a secondary target, only transferring what it lacks.
+
+    Object store blobs already on the target are skipped by key, and
+    folder files whose digest matches the previous snapshot on the target
+    are hard-linked (or copied server-side) there instead of sent again.
+    Reading, compression and upload of different objects overlap on the
+    CopyEngine's worker pool; a compressed object is spooled in at most
+    SPOOL_SIZE bytes of memory, so memory stays bounded by the pool size.
+    A snapshot is committed by its manifest, written last, so an
+    interrupted run resumes from whatever the target already holds.
+    """
+
+    def __init__(self, target, store_root, engine, codec=None):
+        self.target = target
+        self.store_root = store_root
+        self.engine = engine
+        self.codec = codec
+        self.suffix = REPLICA_SUFFIXES[codec] if codec else ""
+
+    def replicate(self, prefix, snapshot_paths, progress=None):
+        """Send the snapshots (oldest first) the target lacks, returning (snapshots sent, bytes sent)"""
+        sent_snapshots = 0
+        sent_bytes = 0
+        previous = {}
+        for snapshot_path in snapshot_paths:
+            try:
+                objects, commit = _snapshot_objects(snapshot_path, prefix, self.store_root)
+            except FileNotFoundError:
+                continue  # pruned since it was listed
+            if commit is None:
+                continue
+            commit_key, commit_path, commit_is_data = commit
+            commit_key += self.suffix if commit_is_data else ""
+            if not self.target.exists(commit_key):
+                sent, complete = self._send_snapshot(prefix, objects, previous, progress)
+                sent_bytes += sent
+                if not complete:
+                    continue  # pruned mid-run; never commit a snapshot missing data
+                try:
+                    sent_bytes += self._send(commit_key, commit_path, self.codec if commit_is_data else None)
+                except FileNotFoundError:
+                    continue
+                sent_snapshots += 1
+            previous = {_in_snapshot(key, prefix): (key, digest) for key, _, digest in objects if digest}
+        return sent_snapshots, sent_bytes
+
+    def _send_snapshot(self, prefix, objects, previous, progress=None):
+        """Send the snapshot's objects, returning (bytes sent, whether every object is on the target)
+
+        An object deleted locally (the snapshot was pruned and its blobs
+        collected while it was sent) is skipped instead of failing the
+        whole target.
+        """
+        todo = []
+        missing = []
+        for key, path, digest in objects:
+            if self.target.exists(key + self.suffix):
+                continue  # shared blob, or sent before an interruption
+            linked = previous.get(_in_snapshot(key, prefix)) if digest else None
+            if linked and linked[1] == digest and self.target.copy(linked[0] + self.suffix, key + self.suffix):
+                continue
+            try:
+                todo.append((key, path, os.path.getsize(path)))
+            except FileNotFoundError:
+                missing.append(key)
+        if progress is not None:
+            progress.add_total(sum(size for _, _, size in todo), len(todo))
+
+        def _send(item):
+            key, path, size = item
+            try:
+                sent = self._send(key + self.suffix, path, self.codec)
+            except FileNotFoundError:
+                missing.append(key)
+                sent = 0
+            if progress is not None:
+                progress.advance(size, 1)
+            return sent
+
+        sent = sum(self.engine.run(_send, todo))
+        return sent, not missing
+
+    def _send(self, key, path, codec):
+        if codec is None:
+            return self.target.put_file(key, path)
+        compressor = _compressor(codec)
+        with open(path, 'rb') as src, tempfile.SpooledTemporaryFile(SPOOL_SIZE) as spool:
+            while True:
+                data = src.read(chunk_limit(READ_SIZE))
+                if not data:
+                    break
+                throttle(len(data))
+                spool.write(compressor.compress(data))
+            spool.write(compressor.flush())
+            size = spool.tell()
+            spool.seek(0)
+            return self.target.put(key, spool, size)
+
+
+class ReplicationQueue:
+    """Runs replication for games on a background thread, one pass per queued game.
+
+    A game queued again while it is still waiting is not queued twice, so a
+    burst of auto-backups leads to a single pass over its newest snapshots.
+    """
+
+    def __init__(self, replicate):
+        self.replicate = replicate
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, game_name):
+        with self._lock:
+            if game_name in self._pending:
+                return
+            self._pending.add(game_name)
+            self._queue.put(game_name)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def join(self):
+        self._queue.join()
+
+    def _run(self):
+        lower_priority()
+        while True:
+            try:
+                game_name = self._queue.get(timeout=1)
+            except queue.Empty:
+                # submit() queues under the lock, so nothing can be stranded once we leave
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+            with self._lock:
+                self._pending.discard(game_name)
+            try:
+                self.replicate(game_name)
+            except Exception:
+                pass  # the result is recorded by replicate(); a failed pass is retried next time
+            finally:
+                self._queue.task_done()
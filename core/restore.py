@@ -0,0 +1,149 @@
+import os
+import shutil
+from core.copier import walk_files, native_path
+from core.metrics import span
+from core.snapshots import path_filter
+
+STAGING_SUFFIX = ".restore-staging"
+
+
+def staging_dir_for(source_path):
+    """Hidden staging directory next to source_path, on the same filesystem"""
+    parent, name = os.path.split(os.path.normpath(source_path))
+    return os.path.join(parent, f".{name}{STAGING_SUFFIX}")
+
+
+def _unchanged(st, entry):
+    return st is not None and st.st_size == entry['size'] and st.st_mtime_ns == entry['mtime_ns']
+
+
+class RestorePlan:
+    """Difference between a snapshot and the live save folder.
+
+    Only files whose size or mtime differ from the snapshot are extracted,
+    into a staging directory beside the save folder, and then moved over
+    the live files with os.replace(). The live folder is never emptied
+    first, so an interrupted restore leaves every file either old or new.
+    """
+
+    def __init__(self, snapshot, source_path, paths=None):
+        self.snapshot = snapshot
+        self.source_path = source_path
+        self.staging = staging_dir_for(source_path)
+        self.changed = []
+        self.extra_files = []
+        self.extra_dirs = []
+
+        if snapshot.kind == 'file':
+            entry = snapshot.files[0]
+            st = os.stat(source_path) if os.path.isfile(source_path) else None
+            if not _unchanged(st, entry):
+                self.changed.append(entry)
+            return
+
+        live_files = {}
+        live_dirs = set()
+        if os.path.isdir(source_path):
+            for rel_path, entry, is_dir in walk_files(source_path):
+                if is_dir:
+                    live_dirs.add(rel_path)
+                else:
+                    live_files[rel_path] = entry.stat()
+
+        wanted = path_filter(paths) if paths is not None else None
+        for entry in snapshot.files:
+            if wanted is not None and not wanted(entry['path']):
+                continue
+            if not _unchanged(live_files.get(entry['path']), entry):
+                self.changed.append(entry)
+
+        if wanted is None:
+            keep_files = {entry['path'] for entry in snapshot.files}
+            keep_dirs = set(snapshot.dirs)
+            self.extra_files = sorted(p for p in live_files if p not in keep_files)
+            self.extra_dirs = sorted((d for d in live_dirs if d not in keep_dirs), reverse=True)
+
+    @property
+    def is_noop(self):
+        return not (self.changed or self.extra_files or self.extra_dirs
+                    or (self.snapshot.kind == 'dir' and not os.path.isdir(self.source_path)))
+
+    @property
+    def bytes_to_write(self):
+        return sum(entry['size'] for entry in self.changed)
+
+    def _stage_path(self, entry):
+        return native_path(self.staging, entry['path'])
+
+    def apply(self, engine=None, progress=None):
+        """Stage changed files, swap them in and drop files the snapshot lacks.
+
+        Cancellation is only honoured while staging; once the swap starts
+        it runs to completion so the save folder is never left half restored.
+        """
+        shutil.rmtree(self.staging, ignore_errors=True)
+        os.makedirs(self.staging)
+        if progress is not None:
+            progress.add_total(self.bytes_to_write, len(self.changed))
+        try:
+            if self.snapshot.kind == 'file':
+                return self._apply_file(progress)
+
+            def _stage(entry):
+                written = self.snapshot.extract(entry, self._stage_path(entry))
+                if progress is not None:
+                    progress.advance(written, 1)
+                return written
+
+            with span("stage") as phase:
+                if engine is not None:
+                    written = sum(engine.run(_stage, self.changed))
+                else:
+                    written = sum(_stage(entry) for entry in self.changed)
+                phase.add(written, len(self.changed))
+
+            with span("swap"):
+                if os.path.isfile(self.source_path):
+                    os.remove(self.source_path)
+                os.makedirs(self.source_path, exist_ok=True)
+                for rel_dir in self.snapshot.dirs:
+                    _make_dir(native_path(self.source_path, rel_dir))
+
+                for entry in self.changed:
+                    target = native_path(self.source_path, entry['path'])
+                    if os.path.isdir(target):
+                        shutil.rmtree(target)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(self._stage_path(entry), target)
+
+                for rel_path in self.extra_files:
+                    target = native_path(self.source_path, rel_path)
+                    if os.path.isfile(target):
+                        os.remove(target)
+                for rel_dir in self.extra_dirs:
+                    shutil.rmtree(native_path(self.source_path, rel_dir), ignore_errors=True)
+            return written
+        finally:
+            shutil.rmtree(self.staging, ignore_errors=True)
+
+    def _apply_file(self, progress=None):
+        if not self.changed:
+            return 0
+        entry = self.changed[0]
+        staged = os.path.join(self.staging, entry['path'])
+        if progress is not None:
+            progress.check()
+        written = self.snapshot.extract(entry, staged)
+        if progress is not None:
+            progress.advance(written, 1)
+        if os.path.isdir(self.source_path):
+            shutil.rmtree(self.source_path)
+        os.makedirs(os.path.dirname(self.source_path) or ".", exist_ok=True)
+        os.replace(staged, self.source_path)
+        return written
+
+
+def _make_dir(path):
+    if os.path.isfile(path):
+        os.remove(path)
+    os.makedirs(path, exist_ok=True)
@@ -0,0 +1,163 @@
+import os
+import queue
+import shutil
+import threading
+from datetime import datetime
+from core.catalog import TRASH_SUFFIX, is_safety
+from core.governor import throttle, lower_priority
+
+DEFAULT_KEEP_SAFETY = 3
+BUCKET_FORMATS = {
+    'hourly': "%Y%m%d%H",
+    'daily': "%Y%m%d",
+    'weekly': "%G%V",
+    'monthly': "%Y%m",
+}
+# Removing a file costs I/O even when it is tiny
+MIN_DELETE_COST = 4096
+
+
+def effective_policy(config, game_config):
+    """Global retention rules overridden by the game's own"""
+    policy = dict(config.get('retention') or {})
+    policy.update(game_config.get('retention') or {})
+    return policy
+
+
+def select_expired(snapshots, policy):
+    """Return the snapshots a retention policy no longer keeps.
+
+    snapshots is a list of catalog records, newest first. Pre-restore
+    safety snapshots only count against keep_safety (the N newest are
+    kept); every other rule applies to real backups alone. The newest
+    backup is always kept. keep_last keeps the N newest; hourly, daily,
+    weekly and monthly keep the newest snapshot in each of the N most
+    recent periods (grandfather-father-son). max_total_mb then drops the
+    oldest survivors until the on-disk total fits.
+    """
+    if not snapshots or not policy:
+        return []
+
+    safety = [s for s in snapshots if is_safety(s['id'])]
+    backups = [s for s in snapshots if not is_safety(s['id'])]
+    keep = {s['id'] for s in safety[:policy.get('keep_safety', DEFAULT_KEEP_SAFETY)]}
+    if backups:
+        keep.add(backups[0]['id'])
+    has_count_rules = 'keep_last' in policy or any(b in policy for b in BUCKET_FORMATS)
+    if not has_count_rules:
+        keep.update(s['id'] for s in backups)
+
+    for snapshot in backups[:policy.get('keep_last', 0)]:
+        keep.add(snapshot['id'])
+
+    for bucket, fmt in BUCKET_FORMATS.items():
+        limit = policy.get(bucket, 0)
+        seen = set()
+        for snapshot in backups:
+            if len(seen) >= limit:
+                break
+            key = datetime.fromtimestamp(snapshot['timestamp']).strftime(fmt)
+            if key not in seen:
+                seen.add(key)
+                keep.add(snapshot['id'])
+
+    max_total_mb = policy.get('max_total_mb')
+    if max_total_mb is not None:
+        limit = max_total_mb * 1024 * 1024
+        kept = [s for s in backups if s['id'] in keep]
+        total = sum(_disk_size(s) for s in kept)
+        for snapshot in reversed(kept[1:]):
+            if total <= limit:
+                break
+            keep.discard(snapshot['id'])
+            total -= _disk_size(snapshot)
+
+    return [s for s in snapshots if s['id'] not in keep]
+
+
+def _disk_size(snapshot):
+    disk_size = snapshot.get('disk_size')
+    return snapshot['size'] if disk_size is None else disk_size
+
+
+def move_to_trash(path):
+    """Rename a snapshot out of the way so listings and reconcile ignore it"""
+    trash_path = path + TRASH_SUFFIX
+    os.replace(path, trash_path)
+    return trash_path
+
+
+class Pruner:
+    """Deletes expired snapshots on a background thread at a bounded rate.
+
+    Snapshots are first renamed to *.deleting, which is instant and atomic,
+    so an interrupted deletion never leaves a half-deleted snapshot that
+    looks valid. The actual unlinking is paced by a TokenBucket so pruning
+    does not compete with a running game for disk bandwidth.
+    """
+
+    def __init__(self, limiter, on_done=None):
+        self.limiter = limiter
+        self.on_done = on_done
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, trash_paths):
+        with self._lock:
+            for path in trash_paths:
+                self._queue.put(path)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def join(self):
+        self._queue.join()
+
+    def _run(self):
+        lower_priority()
+        while True:
+            try:
+                path = self._queue.get(timeout=1)
+            except queue.Empty:
+                # submit() queues under the lock, so nothing can be stranded once we leave
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+            try:
+                self._delete(path)
+            except OSError:
+                pass
+            finally:
+                self._queue.task_done()
+            if self._queue.empty() and self.on_done is not None:
+                self.on_done()
+
+    def _delete(self, path):
+        if not os.path.isdir(path):
+            cost = max(MIN_DELETE_COST, os.path.getsize(path))
+            self.limiter.consume(cost)
+            throttle(cost)
+            os.remove(path)
+            return
+        for dirpath, dirnames, filenames in os.walk(path, topdown=False):
+            for name in filenames:
+                file_path = os.path.join(dirpath, name)
+                cost = max(MIN_DELETE_COST, os.path.getsize(file_path))
+                self.limiter.consume(cost)
+                throttle(cost)
+                os.remove(file_path)
+            for name in dirnames:
+                os.rmdir(os.path.join(dirpath, name))
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def find_trash(backup_dirs):
+    """Leftover *.deleting snapshots from an interrupted prune"""
+    for backup_dir in backup_dirs:
+        if os.path.isdir(backup_dir):
+            for entry in os.listdir(backup_dir):
+                if entry.endswith(TRASH_SUFFIX):
+                    yield os.path.join(backup_dir, entry)
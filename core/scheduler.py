@@ -0,0 +1,94 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from core.governor import lower_priority
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_PER_VOLUME = 1
+
+
+def volume_of(path):
+    """Identify the volume a path lives on (device id, or drive letter as fallback)"""
+    path = os.path.abspath(path)
+    while True:
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return os.path.splitdrive(path)[0] or path
+            path = parent
+
+
+class GameScheduler:
+    """Runs one job per game on a bounded thread pool.
+
+    Jobs are only dispatched while their source volume is below
+    per_volume and their backup volume below backup_volume, so two games
+    whose saves share a disk never thrash it while games on different
+    disks overlap. The backup volume, which every game usually shares,
+    has its own limit (max_workers by default). Waiting jobs never occupy
+    a worker thread.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, per_volume=DEFAULT_PER_VOLUME, backup_volume=None):
+        self.max_workers = max(1, max_workers)
+        self.per_volume = max(1, per_volume)
+        self.backup_volume = self.max_workers if backup_volume is None else max(1, backup_volume)
+
+    @staticmethod
+    def _timed(job):
+        start = time.perf_counter()
+        try:
+            success, message, bytes_copied = job()
+        except Exception as e:
+            success, message, bytes_copied = False, str(e), 0
+        return {
+            'success': success,
+            'message': message,
+            'duration': time.perf_counter() - start,
+            'bytes': bytes_copied
+        }
+
+    def run(self, jobs, on_result=None):
+        """Run jobs and return {game: result} in the order jobs were given.
+
+        jobs is a list of (game, source_path, backup_path, callable) where
+        the callable returns (success, message, bytes_copied) and the paths
+        decide the volumes the job counts against (backup_path may be None). If
+        on_result is given it is called as on_result(game, result) from the
+        calling thread as soon as each game finishes.
+        """
+        pending = []
+        for game, source_path, backup_path, job in jobs:
+            slots = [(("source", volume_of(source_path)), self.per_volume)]
+            if backup_path is not None:
+                slots.append((("backup", volume_of(backup_path)), self.backup_volume))
+            pending.append((game, slots, job))
+        busy = {}
+        running = {}
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, initializer=lower_priority) as pool:
+            while pending or running:
+                for item in list(pending):
+                    if len(running) >= self.max_workers:
+                        break
+                    game, slots, job = item
+                    if any(busy.get(slot, 0) >= limit for slot, limit in slots):
+                        continue
+                    pending.remove(item)
+                    for slot, _ in slots:
+                        busy[slot] = busy.get(slot, 0) + 1
+                    running[pool.submit(self._timed, job)] = (game, slots)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    game, slots = running.pop(future)
+                    for slot, _ in slots:
+                        busy[slot] -= 1
+                    results[game] = future.result()
+                    if on_result is not None:
+                        on_result(game, results[game])
+
+        return {game: results[game] for game, *_ in jobs}
@@ -0,0 +1,81 @@
+"""Bundled database of where games keep their saves, used by core.discovery.
+
+Each signature has a name (as it will appear in the game list), one or
+more paths and optionally the game's Steam app id and process names. A
+path starts with one of the save roots below and continues with folder
+names, matched case-insensitively; "*" matches any one folder (a Steam
+user id, a platform account id, ...).
+
+    documents      Documents (My Documents)
+    saved_games    Saved Games
+    appdata        AppData/Roaming
+    localappdata   AppData/Local
+    locallow       AppData/LocalLow
+    home           the user's home folder
+    xdg_config     ~/.config (Linux)
+    xdg_data       ~/.local/share (Linux)
+    app_support    ~/Library/Application Support (macOS)
+    steam_userdata Steam/userdata
+
+Windows roots are looked up natively and inside every Wine and Proton
+prefix. Add or override entries with the `discovery.signatures` setting.
+"""
+
+SIGNATURES = [
+    {"name": "armored core vi", "steam_id": 1888160, "processes": ["armoredcore6.exe"],
+     "paths": ["appdata/ArmoredCore6"]},
+    {"name": "baldur's gate 3", "steam_id": 1086940, "processes": ["bg3.exe", "bg3_dx11.exe"],
+     "paths": ["localappdata/Larian Studios/Baldur's Gate 3/PlayerProfiles"]},
+    {"name": "cuphead", "steam_id": 268910, "processes": ["cuphead.exe"],
+     "paths": ["appdata/Cuphead"]},
+    {"name": "cyberpunk 2077", "steam_id": 1091500, "processes": ["cyberpunk2077.exe"],
+     "paths": ["saved_games/CD Projekt Red/Cyberpunk 2077"]},
+    {"name": "dark souls ii", "steam_id": 335300, "processes": ["darksoulsii.exe"],
+     "paths": ["appdata/DarkSoulsII"]},
+    {"name": "dark souls iii", "steam_id": 374320, "processes": ["darksoulsiii.exe"],
+     "paths": ["appdata/DarkSoulsIII"]},
+    {"name": "dark souls remastered", "steam_id": 570940, "processes": ["darksoulsremastered.exe"],
+     "paths": ["documents/NBGI/DARK SOULS REMASTERED"]},
+    {"name": "disco elysium", "steam_id": 632470, "processes": ["disco.exe"],
+     "paths": ["locallow/ZAUM Studio/Disco Elysium/SaveGames"]},
+    {"name": "elden ring", "steam_id": 1245620, "processes": ["eldenring.exe"],
+     "paths": ["appdata/EldenRing"]},
+    {"name": "factorio", "steam_id": 427520, "processes": ["factorio.exe", "factorio"],
+     "paths": ["appdata/Factorio/saves", "home/.factorio/saves", "app_support/factorio/saves"]},
+    {"name": "fallout 4", "steam_id": 377160, "processes": ["fallout4.exe"],
+     "paths": ["documents/My Games/Fallout4/Saves"]},
+    {"name": "fallout new vegas", "steam_id": 22380, "processes": ["falloutnv.exe"],
+     "paths": ["documents/My Games/FalloutNV/Saves"]},
+    {"name": "grand theft auto v", "steam_id": 271590, "processes": ["gta5.exe"],
+     "paths": ["documents/Rockstar Games/GTA V/Profiles"]},
+    {"name": "hades", "steam_id": 1145360, "processes": ["hades.exe"],
+     "paths": ["documents/Saved Games/Hades"]},
+    {"name": "hollow knight", "steam_id": 367520, "processes": ["hollow_knight.exe", "hollow_knight.x86_64"],
+     "paths": ["locallow/Team Cherry/Hollow Knight", "xdg_config/unity3d/Team Cherry/Hollow Knight",
+               "app_support/unity.Team Cherry.Hollow Knight"]},
+    {"name": "mass effect legendary edition", "steam_id": 1328670, "processes": ["masseffectlauncher.exe"],
+     "paths": ["documents/BioWare/Mass Effect Legendary Edition/Save"]},
+    {"name": "minecraft", "processes": ["minecraft.exe", "minecraftlauncher.exe"],
+     "paths": ["appdata/.minecraft/saves", "home/.minecraft/saves", "app_support/minecraft/saves"]},
+    {"name": "monster hunter world", "steam_id": 582010, "processes": ["monsterhunterworld.exe"],
+     "paths": ["steam_userdata/*/582010/remote"]},
+    {"name": "red dead redemption 2", "steam_id": 1174180, "processes": ["rdr2.exe"],
+     "paths": ["documents/Rockstar Games/Red Dead Redemption 2/Profiles"]},
+    {"name": "rimworld", "steam_id": 294100, "processes": ["rimworldwin64.exe", "rimworldlinux"],
+     "paths": ["locallow/Ludeon Studios/RimWorld by Ludeon Studios/Saves",
+               "xdg_config/unity3d/Ludeon Studios/RimWorld by Ludeon Studios/Saves"]},
+    {"name": "sekiro", "steam_id": 814380, "processes": ["sekiro.exe"],
+     "paths": ["appdata/Sekiro"]},
+    {"name": "skyrim special edition", "steam_id": 489830, "processes": ["skyrimse.exe"],
+     "paths": ["documents/My Games/Skyrim Special Edition/Saves"]},
+    {"name": "stardew valley", "steam_id": 413150, "processes": ["stardew valley.exe", "stardewvalley"],
+     "paths": ["appdata/StardewValley/Saves", "xdg_config/StardewValley/Saves"]},
+    {"name": "starfield", "steam_id": 1716740, "processes": ["starfield.exe"],
+     "paths": ["documents/My Games/Starfield/Saves"]},
+    {"name": "terraria", "steam_id": 105600, "processes": ["terraria.exe", "terraria.bin.x86_64"],
+     "paths": ["documents/My Games/Terraria", "xdg_data/Terraria", "app_support/Terraria"]},
+    {"name": "the witcher 3", "steam_id": 292030, "processes": ["witcher3.exe"],
+     "paths": ["documents/The Witcher 3/gamesaves"]},
+    {"name": "valheim", "steam_id": 892970, "processes": ["valheim.exe", "valheim.x86_64"],
+     "paths": ["locallow/IronGate/Valheim", "xdg_config/unity3d/IronGate/Valheim"]},
+]
@@ -0,0 +1,93 @@
+import os
+import threading
+from core.copier import walk_files, native_path
+from core.object_store import load_manifest
+from core.governor import lower_priority
+
+
+def _folder_disk_size(snapshot_path, previous_path):
+    """Bytes of files not hard-linked from the previous folder snapshot"""
+    total = 0
+    for rel_path, entry, is_dir in walk_files(snapshot_path):
+        if is_dir:
+            continue
+        st = entry.stat()
+        if previous_path is not None:
+            try:
+                if os.stat(native_path(previous_path, rel_path)).st_ino == entry.inode():
+                    continue
+            except OSError:
+                pass
+        total += st.st_size
+    return total
+
+
+def _store_disk_size(manifest_path, previous_path, store):
+    """Manifest size plus blobs the previous store snapshot did not reference"""
+    previous = set()
+    if previous_path is not None:
+        for entry in load_manifest(previous_path)['files']:
+            previous.update(entry['chunks'])
+
+    total = os.path.getsize(manifest_path)
+    seen = set()
+    for entry in load_manifest(manifest_path)['files']:
+        for digest in entry['chunks']:
+            if digest in previous or digest in seen:
+                continue
+            seen.add(digest)
+            try:
+                total += os.path.getsize(store.blob_path(digest))
+            except OSError:
+                pass
+    return total
+
+
+def incremental_disk_size(snapshot_path, snapshot_format, previous_path, store):
+    """Bytes a snapshot added to disk on top of the previous snapshot of the same format"""
+    if snapshot_format == "archive":
+        return os.path.getsize(snapshot_path)
+    if snapshot_format == "store":
+        return _store_disk_size(snapshot_path, previous_path, store)
+    return _folder_disk_size(snapshot_path, previous_path)
+
+
+class SizeWalker(threading.Thread):
+    """Background thread that fills in missing on-disk sizes in the catalog.
+
+    Snapshots created by this version record their size when written; this
+    only has to catch up on older snapshots found by reconcile, so the GUI
+    never walks snapshot trees itself.
+    """
+
+    def __init__(self, catalog, store, games, on_update=None):
+        super().__init__(daemon=True)
+        self.catalog = catalog
+        self.store = store
+        self.games = games
+        self.on_update = on_update
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        lower_priority()
+        for game_name, backup_dir in self.games.items():
+            snapshots = sorted(self.catalog.list(game_name), key=lambda s: s['timestamp'])
+            previous = {}
+            for snapshot in snapshots:
+                if self._stop_event.is_set():
+                    return
+                path = os.path.join(backup_dir, snapshot['file'])
+                previous_path = previous.get(snapshot['format'])
+                previous[snapshot['format']] = path
+                if snapshot.get('disk_size') is not None:
+                    continue
+                try:
+                    disk_size = incremental_disk_size(path, snapshot['format'], previous_path, self.store)
+                except (OSError, ValueError, KeyError):
+                    continue
+                self.catalog.update(game_name, snapshot['id'], disk_size=disk_size)
+                if self.on_update is not None:
+                    self.on_update(game_name)
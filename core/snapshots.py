@@ -0,0 +1,160 @@
+import os
+from core.copier import walk_files, native_path, copy2
+from core.object_store import FOLDER_MANIFEST, load_manifest, is_manifest
+from core.archive import ArchiveReader
+from core.catalog import is_archive
+
+
+class ManifestSnapshot:
+    """Object store snapshot described by a manifest"""
+
+    def __init__(self, manifest_path, store):
+        self.path = manifest_path
+        self.store = store
+        manifest = load_manifest(manifest_path)
+        self.kind = manifest['kind']
+        self.dirs = manifest['dirs']
+        self.files = manifest['files']
+
+    def extract(self, entry, dest_path):
+        self.store.restore_file(entry, dest_path)
+        return entry['size']
+
+
+class ArchiveSnapshot:
+    """Compressed archive snapshot"""
+
+    def __init__(self, archive_path):
+        self.path = archive_path
+        self.reader = ArchiveReader(archive_path)
+        self.kind = self.reader.index['kind']
+        self.dirs = self.reader.index['dirs']
+        self.files = self.reader.files
+
+    def extract(self, entry, dest_path):
+        return self.reader.extract(entry, dest_path)
+
+
+class FolderSnapshot:
+    """Plain directory copy, described by its manifest when it has one.
+
+    Copies made before manifests existed are walked instead, taking
+    entries from stat() so they match what is on disk.
+    """
+
+    def __init__(self, folder_path, source_path):
+        self.path = folder_path
+        manifest_path = os.path.join(folder_path, FOLDER_MANIFEST)
+        if os.path.isfile(manifest_path):
+            manifest = load_manifest(manifest_path)
+            self.kind = manifest['kind']
+            self.dirs = manifest['dirs']
+            self.files = manifest['files']
+            return
+
+        self.dirs = []
+        self.files = []
+        for rel_path, entry, is_dir in walk_files(folder_path):
+            if is_dir:
+                self.dirs.append(rel_path)
+                continue
+            if rel_path == FOLDER_MANIFEST:
+                continue
+            st = entry.stat()
+            self.files.append({
+                'path': rel_path,
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'mode': st.st_mode & 0o7777
+            })
+
+        # A single-file source is backed up as <snapshot>/<file name>
+        single = (len(self.files) == 1 and not self.dirs
+                  and self.files[0]['path'] == os.path.basename(source_path))
+        self.kind = 'file' if single and not os.path.isdir(source_path) else 'dir'
+
+    def extract(self, entry, dest_path):
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        return copy2(native_path(self.path, entry['path']), dest_path)
+
+
+def open_snapshot(backup_path, source_path, store):
+    """Open any snapshot format behind a common files/dirs/extract interface"""
+    if is_manifest(backup_path):
+        return ManifestSnapshot(backup_path, store)
+    if is_archive(backup_path):
+        return ArchiveSnapshot(backup_path)
+    return FolderSnapshot(backup_path, source_path)
+
+
+def path_filter(paths):
+    """Predicate matching the given relative file paths and everything under the given folders"""
+    files = set(paths)
+    prefixes = tuple(path.rstrip('/') + '/' for path in paths)
+    return lambda rel_path: rel_path in files or rel_path.startswith(prefixes)
+
+
+class SnapshotTree:
+    """Folder-by-folder view of a snapshot, built once from its manifest or index.
+
+    Listing a folder is a dictionary lookup, so a browser can page through
+    a snapshot of any size without extracting or re-reading it.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self._folders = {"": (set(), [])}
+        for rel_dir in snapshot.dirs:
+            self._folder(rel_dir)
+        for entry in snapshot.files:
+            parent = entry['path'].rpartition('/')[0]
+            self._folder(parent)[1].append(entry)
+
+    def _folder(self, rel_dir):
+        if rel_dir not in self._folders:
+            self._folders[rel_dir] = (set(), [])
+            parent, _, name = rel_dir.rpartition('/')
+            self._folder(parent)[0].add(name)
+        return self._folders[rel_dir]
+
+    def list(self, folder=""):
+        """[(name, rel_path, entry or None for folders)] directly inside folder, folders first"""
+        folder = folder.strip('/')
+        subdirs, files = self._folders.get(folder, (set(), []))
+        prefix = f"{folder}/" if folder else ""
+        listing = [(name, prefix + name, None) for name in sorted(subdirs, key=str.lower)]
+        listing += [(entry['path'].rpartition('/')[2], entry['path'], entry)
+                    for entry in sorted(files, key=lambda e: e['path'].lower())]
+        return listing
+
+    def select(self, paths):
+        """File entries matching paths (files, or folders meaning everything under them)"""
+        selected = path_filter(paths)
+        return [entry for entry in self.snapshot.files if selected(entry['path'])]
+
+
+def _same_content(old, new):
+    if old.get('digest') and new.get('digest'):
+        return old['digest'] == new['digest']
+    return old['size'] == new['size'] and old['mtime_ns'] == new['mtime_ns']
+
+
+def diff_snapshots(old, new):
+    """{'added', 'removed', 'changed': [paths], 'unchanged': count} between two snapshots.
+
+    Content digests from the manifests are compared where both sides have
+    them, otherwise size and mtime; no file data is read.
+    """
+    old_files = {entry['path']: entry for entry in old.files}
+    new_files = {entry['path']: entry for entry in new.files}
+    diff = {'added': [], 'removed': [], 'changed': [], 'unchanged': 0}
+    for path, entry in sorted(new_files.items()):
+        previous = old_files.get(path)
+        if previous is None:
+            diff['added'].append(path)
+        elif _same_content(previous, entry):
+            diff['unchanged'] += 1
+        else:
+            diff['changed'].append(path)
+    diff['removed'] = sorted(path for path in old_files if path not in new_files)
+    return diff
@@ -0,0 +1,29 @@
+import time
+import threading
+
+
+class TokenBucket:
+    """Blocking token bucket that limits throughput to `rate` units per second.
+
+    A rate of None or 0 means unlimited, so callers can always consume()
+    without checking whether throttling is configured.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate or 0
+        self.capacity = burst if burst is not None else self.rate
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount):
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
@@ -0,0 +1,294 @@
+import os
+import sys
+import time
+import zlib
+import struct
+import select
+import threading
+
+DEFAULT_WATCH = {
+    'enabled': True,
+    'debounce_seconds': 30,
+    'min_interval_seconds': 300,
+    'poll_interval_seconds': 10,
+}
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def watch_settings(config, game_config):
+    """Global watch settings overridden by the game's own"""
+    settings = dict(DEFAULT_WATCH)
+    settings.update(config.get('watch') or {})
+    settings.update(game_config.get('watch') or {})
+    return settings
+
+
+def tree_fingerprint(path):
+    """Constant-size summary of a tree: (files, total bytes, newest mtime, path/size/mtime checksum).
+
+    Used by the polling backend so memory does not grow with file count.
+    """
+    if not os.path.isdir(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return 1, st.st_size, st.st_mtime_ns, 0
+
+    count = total = newest = checksum = 0
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                count += 1
+                total += st.st_size
+                newest = max(newest, st.st_mtime_ns)
+                checksum ^= zlib.crc32(f"{entry.path}\0{st.st_size}\0{st.st_mtime_ns}".encode('utf-8', 'surrogateescape'))
+    return count, total, newest, checksum
+
+
+class PollingBackend:
+    """Portable backend: periodically compares tree fingerprints"""
+
+    def __init__(self, poll_interval):
+        self.poll_interval = poll_interval
+        self._trees = {}
+        self._stop = threading.Event()
+
+    def add(self, game_name, path):
+        self._trees[game_name] = [path, tree_fingerprint(path)]
+
+    def wait(self, timeout):
+        """Block up to timeout seconds, returning the games whose trees changed"""
+        if self._stop.wait(min(timeout, self.poll_interval)):
+            return set()
+        changed = set()
+        for game_name, tree in self._trees.items():
+            fingerprint = tree_fingerprint(tree[0])
+            if fingerprint != tree[1]:
+                tree[1] = fingerprint
+                changed.add(game_name)
+        return changed
+
+    def wake(self):
+        self._stop.set()
+
+    def close(self):
+        pass
+
+
+class InotifyBackend:
+    """Linux backend using inotify through ctypes; one watch per directory"""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches = {}
+        self._files = {}
+        self._wake_r, self._wake_w = os.pipe()
+
+    def _add_watch(self, game_name, directory):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = (game_name, directory)
+
+    def _add_tree(self, game_name, directory):
+        self._add_watch(game_name, directory)
+        stack = [directory]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        self._add_watch(game_name, entry.path)
+                        stack.append(entry.path)
+
+    def add(self, game_name, path):
+        if os.path.isdir(path):
+            self._add_tree(game_name, path)
+        else:
+            # A single save file: watch its folder and filter on the name
+            parent = os.path.dirname(path) or "."
+            self._files[game_name] = os.path.basename(path)
+            self._add_watch(game_name, parent)
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in readable or self._fd not in readable:
+            return set()
+
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_len].rstrip(b"\0"))
+            offset += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                changed.update(game for game, _ in self._watches.values())
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            game_name, directory = watch
+            if game_name in self._files and name != self._files[game_name]:
+                continue
+            if mask & IN_CREATE and mask & IN_ISDIR:
+                self._add_tree(game_name, os.path.join(directory, name))
+            changed.add(game_name)
+        return changed
+
+    def wake(self):
+        os.write(self._wake_w, b"x")
+
+    def close(self):
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+
+def default_backend(poll_interval, name=None):
+    """inotify on Linux, polling elsewhere or when asked for"""
+    if name != "poll" and sys.platform.startswith("linux"):
+        try:
+            return InotifyBackend()
+        except (OSError, AttributeError):
+            pass
+    return PollingBackend(poll_interval)
+
+
+class SaveWatcher(threading.Thread):
+    """Watches every configured source_path and backs up once writes settle.
+
+    A burst of writes (an autosave touching a save file dozens of times)
+    only marks the game dirty; the backup runs after the game has been
+    quiet for debounce_seconds, and never more often than
+    min_interval_seconds. The thread sleeps in select()/wait() until the
+    next deadline, so an idle watcher uses no CPU. Save trees are only
+    walked once the thread runs, so starting a watcher never blocks the
+    caller, and backups are handed to the job queue without waiting for
+    them, so file events keep being read while they run.
+    """
+
+    def __init__(self, core, on_backup=None, backend=None):
+        super().__init__(daemon=True)
+        self.core = core
+        self.on_backup = on_backup
+        self.settings = {}
+        for game_name, cfg in core.config['games'].items():
+            settings = watch_settings(core.config, cfg)
+            if settings['enabled']:
+                self.settings[game_name] = settings
+
+        self.backend = backend
+        self._dirty = {}
+        self._last_backup = {}
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+        backend = self.backend
+        if backend is not None:
+            backend.wake()
+
+    def _start_backend(self):
+        """Create the backend and walk every save tree into it, on the watcher thread"""
+        if self.backend is None:
+            global_settings = watch_settings(self.core.config, {})
+            self.backend = default_backend(
+                global_settings['poll_interval_seconds'], global_settings.get('backend')
+            )
+        for game_name in self.settings:
+            if self._stopped.is_set():
+                return
+            self.backend.add(game_name, self.core.config['games'][game_name]['source_path'])
+
+    def _next_deadline(self, game_name):
+        settings = self.settings[game_name]
+        quiet_at = self._dirty[game_name] + settings['debounce_seconds']
+        allowed_at = self._last_backup.get(game_name, float('-inf')) + settings['min_interval_seconds']
+        return max(quiet_at, allowed_at)
+
+    def run(self):
+        try:
+            self._start_backend()
+            while not self._stopped.is_set():
+                self._step()
+        finally:
+            if self.backend is not None:
+                self.backend.close()
+
+    def _step(self):
+        now = time.monotonic()
+        deadlines = [self._next_deadline(game) for game in self._dirty]
+        timeout = max(0.0, min(deadlines) - now) if deadlines else 3600.0
+        changed = self.backend.wait(timeout)
+        if self._stopped.is_set():
+            return
+
+        now = time.monotonic()
+        for game_name in changed:
+            if game_name in self.settings:
+                self._dirty[game_name] = now
+
+        for game_name in [g for g in self._dirty if self._next_deadline(g) <= now]:
+            del self._dirty[game_name]
+            self._last_backup[game_name] = time.monotonic()
+            self._submit(game_name)
+
+    def _submit(self, game_name):
+        """Queue a backup of the game; it never overlaps a restore or a manual backup of it"""
+        def _done(job):
+            if self.on_backup is not None:
+                self.on_backup(game_name, job.success, job.message)
+
+        try:
+            self.core.job_manager().submit(
+                "backup", game_name, lambda progress: self.core.create_backup(game_name, progress=progress),
+                title=f"Auto backup {game_name}", on_done=_done
+            )
+        except RuntimeError as e:  # the job queue is shutting down
+            if self.on_backup is not None:
+                self.on_backup(game_name, False, str(e))
@@ -3,6 +3,7 @@ __version__ = "4.1"
 import sys
 import subprocess
 import os
+import multiprocessing
 
 
 def install_dependencies():
@@ -50,6 +51,7 @@ def launch_gui():
         sys.exit(1)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # verify runs hashing in worker processes
     try:
         install_dependencies()
         launch_gui()
@@ -1,3 +1,4 @@
+import multiprocessing
 from core.backup_manager import GameBackupCore
 from ui.gui_interface import BackupGUI
 
@@ -9,6 +10,7 @@ def main():
     gui.run()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # verify runs hashing in worker processes
     main()
 
 
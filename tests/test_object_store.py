@@ -0,0 +1,50 @@
+import os
+import json
+
+from core.backup_manager import GameBackupCore
+from core.object_store import ObjectStore
+
+
+def test_garbage_collection_keeps_blobs_of_backup_dirs_outside_the_root(tmp_path):
+    source = tmp_path / "saves"
+    source.mkdir()
+    (source / "slot1.sav").write_bytes(os.urandom(4096))
+    config_path = tmp_path / "game_backup_config.json"
+    config_path.write_text(json.dumps({
+        "root_backup_dir": str(tmp_path / "backups"),
+        "schema": 2,
+        "games": {
+            "outside": {"source_path": str(source), "backup_dir": str(tmp_path / "elsewhere")},
+            "nested": {"source_path": str(source), "backup_dir": os.path.join("group", "nested")}
+        }
+    }))
+    core = GameBackupCore(str(config_path))
+    for game in ("outside", "nested"):
+        assert core.create_backup(game)[0]
+
+    objects_dir = tmp_path / "backups" / ".objects"
+    blobs = [os.path.join(d, name) for d, _, names in os.walk(objects_dir) for name in names]
+    assert blobs
+    for blob in blobs:
+        os.utime(blob, (0, 0))  # well past the grace period
+    assert core.collect_garbage()[0]
+
+    assert all(os.path.exists(blob) for blob in blobs)
+    for game in ("outside", "nested"):
+        assert core.verify_backup(game, core.get_backups(game)[0]['path'])[0]
+
+
+def test_known_chunks_are_kept_young_and_rewritten_if_collected(tmp_path):
+    store = ObjectStore(str(tmp_path / "root"), chunk_size=1024)
+    save = tmp_path / "save.db"
+    save.write_bytes(os.urandom(4096))
+    chunks, _, _ = store.store_file(str(save))
+    for digest in chunks:
+        os.utime(store.blob_path(digest), (0, 0))
+    os.remove(store.blob_path(chunks[0]))  # collected after a prune removed the indexed snapshot
+
+    again, _, new_bytes = store.store_file(str(save), known=set(chunks))
+
+    assert again == chunks
+    assert new_bytes == 1024
+    assert all(os.path.getmtime(store.blob_path(digest)) > 0 for digest in chunks)
@@ -0,0 +1,36 @@
+import os
+import json
+
+from core.backup_manager import GameBackupCore
+
+
+def make_core(tmp_path, retention):
+    source = tmp_path / "saves"
+    source.mkdir()
+    (source / "slot1.sav").write_bytes(b"first")
+    config_path = tmp_path / "game_backup_config.json"
+    config_path.write_text(json.dumps({
+        "root_backup_dir": str(tmp_path / "backups"),
+        "games": {},
+        "retention": retention
+    }))
+    core = GameBackupCore(str(config_path))
+    assert core.add_game("game", str(source))[0]
+    return core, source
+
+
+def test_safety_snapshots_do_not_push_out_backups(tmp_path):
+    core, source = make_core(tmp_path, {'keep_last': 2, 'keep_safety': 1})
+
+    assert core.create_backup("game")[0]
+    backup = core.get_backups("game")[0]
+    for content in (b"second", b"third"):
+        (source / "slot1.sav").write_bytes(content)
+        assert core.restore_backup("game", backup['path'])[0]
+    assert core.prune_backups("game", wait=True)[0]
+
+    backups = core.get_backups("game")
+    assert [b['name'] for b in backups if not b['safety']] == [backup['name']]
+    assert len([b for b in backups if b['safety']]) == 1
+    assert all(os.path.exists(b['path']) for b in backups)
+    assert core.restore_all_backups()["game"]['success']
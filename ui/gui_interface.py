@@ -1,15 +1,41 @@
 from datetime import datetime
 import os
+import queue
 import threading
-import webbrowser
 import customtkinter as ctk
 from tkinter import messagebox, filedialog
 from core.backup_manager import GameBackupCore
+from core.jobs import RUNNING
 import tkinter as tk
 from tkinter import ttk 
 import json
-import urllib.parse
 from ui.theme import COLORS, FONTS, STYLES, configure_theme
+from ui.widgets import PagedList
+
+GAME_PAGE_SIZE = 25
+BACKUP_PAGE_SIZE = 15
+BROWSE_PAGE_SIZE = 15
+CHANGE_MARKS = {'added': "+", 'changed': "~"}
+DISCOVERY_PAGE_SIZE = 12
+PROGRESS_POLL_MS = 200
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.2f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.2f} TB"
+
+
+def format_progress(event):
+    text = f"{format_size(event['bytes_done'])} / {format_size(event['bytes_total'])}"
+    text += f" · {event['files_done']}/{event['files_total']} files"
+    text += f" · {event['rate'] / (1024 * 1024):.1f} MB/s"
+    if event['eta'] is not None and not event['finished']:
+        minutes, seconds = divmod(int(event['eta']), 60)
+        text += f" · {minutes}:{seconds:02d} left"
+    return text
+
 
 class BackupGUI(ctk.CTk):
     def __init__(self, core):
@@ -20,11 +46,21 @@ class BackupGUI(ctk.CTk):
         self.core = core
         self.selected_game = None
         self.selected_backup_path = None
+        self._backups = []
         self._debounce_id = None
+        self._sizes_job = None
+        self._sized_games = set()
+        self._watcher = None
+        self._jobs = {}
+        self._job_events = queue.Queue()
+        self._shown_job = None
         self.configure(fg_color=COLORS["background"])
         self.create_widgets()
         self.update_root_display()
         self.refresh_game_list()
+        self.refresh_totals()
+        self.core.start_size_walker(on_update=lambda game: self.after(0, self._on_sizes_updated, game))
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         try:
             self.iconbitmap("./assets/icon.ico")
         except:
@@ -43,6 +79,9 @@ class BackupGUI(ctk.CTk):
                     font=FONTS["label"], text_color=COLORS["text"]).pack(anchor="w")
         self.root_dir_entry = ctk.CTkEntry(root_frame, **STYLES["entry"])
         self.root_dir_entry.pack(fill="x", pady=5)
+        self.totals_label = ctk.CTkLabel(root_frame, text="", justify="left",
+                                         font=FONTS["label"], text_color=COLORS["text"])
+        self.totals_label.pack(anchor="w")
 
         buttons = [
             ("\U0001F4C1 Create Backup", self.create_backup),
@@ -51,8 +90,9 @@ class BackupGUI(ctk.CTk):
             ("\U0001F5D1️ Delete Backup", self.delete_backup),
             ("⚡ Update All", self.update_all_backups),
             ("\U0001F3AE Restore All", self.restore_all_backups),
+            ("\U0001F441 Auto Backup", self.toggle_auto_backup),
             ("\U0001F4C2 Change Root", self.change_root_dir),
-            ("\U0001F50D Search Saves", self.search_save_location),
+            ("\U0001F50D Find Saves", self.search_save_location),
             ("\U0001F4EE Export Config", self.export_config),  # New button
             ("\U0001F4E5 Import Config", self.import_config)   # New button
         ]
@@ -71,23 +111,78 @@ class BackupGUI(ctk.CTk):
         main.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
         main.grid_columnconfigure(0, weight=1)
         main.grid_columnconfigure(1, weight=1)
+        main.grid_columnconfigure(2, weight=1)
         main.grid_rowconfigure(1, weight=1)
 
-        self.game_list_frame = ctk.CTkScrollableFrame(
+        self.game_list = PagedList(
             main,
-            label_text="Configured Games",
-            **STYLES["frame"],
-            label_font=FONTS["body"]
+            "Configured Games",
+            GAME_PAGE_SIZE,
+            self.on_game_select,
+            selected_prefix="✔ ",
+            selected_text_color="#000000"
         )
-        self.game_list_frame.grid(row=1, column=0, sticky="nsew")
+        self.game_list.grid(row=1, column=0, sticky="nsew")
 
-        self.backup_list_frame = ctk.CTkScrollableFrame(
+        self.backup_list = PagedList(
             main,
-            label_text="Available Backups",
-            **STYLES["frame"],
-            label_font=FONTS["body"]
+            "Available Backups",
+            BACKUP_PAGE_SIZE,
+            self.on_backup_select,
+            row_font=("Arial", 11),
+            row_anchor="w"
+        )
+        self.backup_list.grid(row=1, column=1, sticky="nsew")
+
+        browse_frame = ctk.CTkFrame(main, **STYLES["frame"])
+        browse_frame.grid(row=1, column=2, sticky="nsew")
+        browse_frame.grid_columnconfigure(0, weight=1)
+        browse_frame.grid_rowconfigure(0, weight=1)
+        self.browse_list = PagedList(
+            browse_frame,
+            "Backup Contents",
+            BROWSE_PAGE_SIZE,
+            self.on_browse_select,
+            row_font=("Arial", 11),
+            row_anchor="w"
         )
-        self.backup_list_frame.grid(row=1, column=1, sticky="nsew")
+        self.browse_list.grid(row=0, column=0, sticky="nsew")
+        self.browse_path_label = ctk.CTkLabel(browse_frame, text="", anchor="w",
+                                              font=FONTS["label"], text_color=COLORS["text"])
+        self.browse_path_label.grid(row=1, column=0, sticky="ew", padx=5)
+        browse_buttons = ctk.CTkFrame(browse_frame, fg_color="transparent")
+        browse_buttons.grid(row=2, column=0, sticky="ew")
+        for column, (text, cmd) in enumerate([
+            ("Restore Selected", self.restore_selected_files),
+            ("Export Selected", self.export_selected_files),
+            ("Changes", self.toggle_backup_changes)
+        ]):
+            browse_buttons.grid_columnconfigure(column, weight=1)
+            ctk.CTkButton(browse_buttons, text=text, command=cmd, **STYLES["button"]).grid(
+                row=0, column=column, sticky="ew", padx=3, pady=(4, 0))
+        self.clear_browser()
+
+        self.status_label = ctk.CTkLabel(
+            main,
+            text="",
+            anchor="w",
+            text_color=COLORS["text"],
+            font=FONTS["label"]
+        )
+        self.status_label.grid(row=2, column=0, columnspan=3, sticky="ew", padx=5, pady=(5, 0))
+
+        self.progress_frame = ctk.CTkFrame(main, fg_color="transparent")
+        self.progress_frame.grid(row=3, column=0, columnspan=3, sticky="ew", padx=5, pady=(5, 0))
+        self.progress_frame.grid_columnconfigure(0, weight=1)
+        self.progress_bar = ctk.CTkProgressBar(self.progress_frame, progress_color=COLORS["accent"])
+        self.progress_bar.grid(row=0, column=0, sticky="ew")
+        self.progress_label = ctk.CTkLabel(self.progress_frame, text="", anchor="w",
+                                           text_color=COLORS["text"], font=FONTS["label"])
+        self.progress_label.grid(row=1, column=0, sticky="ew")
+        self.cancel_button = ctk.CTkButton(self.progress_frame, text="Cancel", width=80,
+                                           command=self.cancel_operation, **STYLES["button"])
+        self.cancel_button.grid(row=0, column=1, rowspan=2, padx=(10, 0))
+        self.progress_frame.grid_remove()
 
     def debounce_refresh_game_list(self, delay_ms=100):
         if self._debounce_id:
@@ -95,84 +190,234 @@ class BackupGUI(ctk.CTk):
         self._debounce_id = self.after(delay_ms, self.refresh_game_list)
 
     def refresh_game_list(self):
-        for widget in self.game_list_frame.winfo_children():
-            widget.destroy()
-
         games = list(self.core.config['games'].keys())
         if not games:
-            ctk.CTkLabel(
-                self.game_list_frame, 
-                text="No games configured",
-                text_color=COLORS["text"],
-                font=FONTS["body"]
-            ).pack(pady=10)
+            self.game_list.show_message("No games configured")
             self.clear_backup_list()
             return
 
-        for game in games:
-            is_selected = (game == self.selected_game)
-            btn = ctk.CTkButton(
-                self.game_list_frame,
-                text=f"✔ {game}" if is_selected else game,
-                command=lambda g=game: self.on_game_select(g),
-                fg_color=COLORS["accent"] if is_selected else COLORS["surface"],
-                hover_color=COLORS["secondary"],
-                text_color="#000000" if is_selected else COLORS["text"],
-                border_width=2 if is_selected else 0,
-                border_color=COLORS["accent"],
-                corner_radius=6
-            )
-            btn.pack(fill="x", pady=2, padx=5)
+        self.game_list.set_items([(game, game) for game in games])
+        self.game_list.select(self.selected_game)
+        self.game_list.reveal(self.selected_game)
 
     def on_game_select(self, game_name):
         if self.selected_game == game_name:
             return
         self.selected_game = game_name
         self.selected_backup_path = None
-        self.refresh_game_list()
+        self.game_list.select(game_name)
+        self.backup_list.select(None)
+        self.backup_list.page = 0
+        self.clear_browser()
         self.refresh_backup_list()
 
     def refresh_backup_list(self):
+        game = self.selected_game
+
         def _load():
-            backups = self.core.get_backups(self.selected_game)
-            self.after(0, lambda: self._populate_backups(backups))
+            backups = self.core.get_backups(game) if game else []
+            source_path = self.core.config['games'].get(game, {}).get('source_path')
+            missing = bool(source_path) and not backups and not os.path.exists(source_path)
+            self.after(0, lambda: self._populate_backups(game, backups, missing, source_path))
         threading.Thread(target=_load, daemon=True).start()
-
-    def _populate_backups(self, backups):
-        self.clear_backup_list()
+        self.refresh_totals()
+
+    def _populate_backups(self, game, backups, source_missing, source_path):
+        if game != self.selected_game:
+            return  # the selection moved on while this list was loading
+        self._backups = [backup['path'] for backup in backups]
+        if self._browse_backup not in self._backups:
+            self.clear_browser()  # the open backup was deleted or pruned
         if not backups:
-            error_msg = "No backups found"
-            if self.selected_game and not os.path.exists(self.core.config['games'][self.selected_game]['source_path']):
-                error_msg = f"Source path missing!\n{self.core.config['games'][self.selected_game]['source_path']}"
-            ctk.CTkLabel(
-                self.backup_list_frame,
-                text=error_msg,
-                text_color="#FF5555" if "missing" in error_msg else None
-            ).pack(pady=10)
+            if source_missing:
+                self.backup_list.show_message(f"Source path missing!\n{source_path}", "#FF5555")
+            else:
+                self.backup_list.show_message("No backups found")
             return
 
+        items = []
         for idx, backup in enumerate(backups, 1):
-            size_mb = os.path.getsize(backup['path']) / (1024 * 1024)
-            text = f"{idx}. {backup['formatted_date']}\n{size_mb:.2f} MB"
-            btn = ctk.CTkButton(
-                self.backup_list_frame,
-                text=text,
-                font=("Arial", 11),
-                anchor="w",
-                fg_color=COLORS["accent"] if backup['path'] == self.selected_backup_path else COLORS["surface"],
-                hover_color=COLORS["secondary"],
-                text_color=COLORS["text"],
-                command=lambda b=backup: self.on_backup_select(b['path'])
-            )
-            btn.pack(fill="x", pady=3, padx=5)
+            text = f"{idx}. {backup['formatted_date']}\n{format_size(backup['size'])}"
+            if backup['disk_size'] is not None:
+                text += f" ({format_size(backup['disk_size'])} on disk)"
+            if backup['safety']:
+                text += " · pre-restore"
+            if backup['unsettled']:
+                text += f" · ⚠ {backup['unsettled']} files changing"
+            items.append((backup['path'], text))
+        self.backup_list.set_items(items)
+        self.backup_list.select(self.selected_backup_path)
+
+    def refresh_totals(self):
+        def _load():
+            summary = self.core.get_size_summary()
+            text = (f"{summary['snapshots']} backups: {format_size(summary['logical'])}\n"
+                    f"{format_size(summary['disk'])} on disk")
+            if summary['pending']:
+                text += f" ({summary['pending']} still measuring)"
+            self.after(0, lambda: self.totals_label.configure(text=text))
+        threading.Thread(target=_load, daemon=True).start()
+
+    def _on_sizes_updated(self, game_name):
+        # The size walker reports once per snapshot; batch the repaints
+        self._sized_games.add(game_name)
+        if self._sizes_job:
+            self.after_cancel(self._sizes_job)
+
+        def _refresh():
+            self._sizes_job = None
+            self.refresh_totals()
+            if self.selected_game in self._sized_games:
+                self.refresh_backup_list()
+            self._sized_games.clear()
+        self._sizes_job = self.after(500, _refresh)
 
     def on_backup_select(self, backup_path):
         self.selected_backup_path = None if self.selected_backup_path == backup_path else backup_path
-        self.refresh_backup_list()
+        self.backup_list.select(self.selected_backup_path)
+        if self.selected_backup_path:
+            self.open_browser(self.selected_backup_path)
+        else:
+            self.clear_browser()
+
+    # ========== BACKUP CONTENTS ==========
+
+    def clear_browser(self):
+        self._browse_backup = None
+        self._browse_folder = ""
+        self._browse_listing = []
+        self._browse_checked = set()
+        self._browse_changes = None
+        self.browse_list.show_message("Select a backup to see its files")
+        self.browse_path_label.configure(text="")
+
+    def open_browser(self, backup_path):
+        self._browse_backup = backup_path
+        self._browse_checked = set()
+        self._browse_changes = None
+        self.show_browser_folder("")
+
+    def show_browser_folder(self, folder):
+        """List one folder of the open backup, loading it off the UI thread"""
+        game, backup_path = self.selected_game, self._browse_backup
+        self._browse_folder = folder
+        self.browse_path_label.configure(text=f"/{folder}")
+
+        def _load():
+            listing = self.core.list_backup_files(game, backup_path, folder)
+            self.after(0, lambda: self._populate_browser(backup_path, folder, listing))
+        threading.Thread(target=_load, daemon=True).start()
+
+    def _populate_browser(self, backup_path, folder, listing):
+        if (backup_path, folder) != (self._browse_backup, self._browse_folder):
+            return  # the user moved on while this folder was loading
+        self._browse_listing = listing
+        self.browse_list.page = 0
+        self._render_browser()
+
+    def _render_browser(self):
+        items = [("..", "⬑ ..")] if self._browse_folder else []
+        for entry in self._browse_listing:
+            if entry['is_dir']:
+                items.append((entry['path'] + "/", f"\U0001F4C1 {entry['name']}"))
+                continue
+            check = "☑" if entry['path'] in self._browse_checked else "☐"
+            mark = (self._browse_changes or {}).get(entry['path'])
+            text = f"{check} {entry['name']}  {format_size(entry['size'])}"
+            items.append((entry['path'], f"{text}  {mark}" if mark else text))
+        if items:
+            self.browse_list.set_items(items)
+        else:
+            self.browse_list.show_message("Empty folder")
+
+    def on_browse_select(self, key):
+        if key == "..":
+            self.show_browser_folder(self._browse_folder.rpartition('/')[0])
+        elif key.endswith("/"):
+            self.show_browser_folder(key[:-1])
+        else:
+            self._browse_checked ^= {key}
+            self._render_browser()  # only the toggled row is redrawn
+
+    def restore_selected_files(self):
+        if not self._browse_checked:
+            messagebox.showerror("Error", "Tick the files to restore first!")
+            return
+        paths = sorted(self._browse_checked)
+        if not messagebox.askyesno("Confirm", f"Restore {len(paths)} files from this backup?\n"
+                                              "Other files in the save folder are left alone."):
+            return
+        game, backup_path = self.selected_game, self._browse_backup
+
+        def _restore(progress):
+            success, msg = self.core.restore_backup(game, backup_path, paths=paths, progress=progress)
+            self.after(0, lambda: messagebox.showinfo(
+                "Result", f"✅ Restored {len(paths)} files!" if success else f"❌ Error: {msg}"
+            ))
+            self.after(0, self.refresh_backup_list)  # the safety snapshot is new
+            return success, msg
+
+        self._start_operation("restore", game, f"Restoring {len(paths)} files", _restore,
+                              key=(backup_path, tuple(paths)))
+
+    def export_selected_files(self):
+        if not self._browse_checked:
+            messagebox.showerror("Error", "Tick the files to export first!")
+            return
+        dest_dir = filedialog.askdirectory(title="Export Files To")
+        if not dest_dir:
+            return
+        paths = sorted(self._browse_checked)
+        game, backup_path = self.selected_game, self._browse_backup
+
+        def _export(progress):
+            success, msg = self.core.export_backup_files(game, backup_path, paths, dest_dir, progress=progress)
+            self.after(0, lambda: messagebox.showinfo("Export Result", msg if success else f"❌ {msg}"))
+            return success, msg
+
+        self._start_operation("export", game, f"Exporting {len(paths)} files", _export,
+                              key=(backup_path, tuple(paths), dest_dir))
+
+    def toggle_backup_changes(self):
+        """Mark files added (+) or changed (~) since the previous backup"""
+        if self._browse_changes is not None:
+            self._browse_changes = None
+            self.status_label.configure(text="")
+            self._render_browser()
+            return
+        backup_path = self._browse_backup
+        older = self._backups[self._backups.index(backup_path) + 1:] if backup_path in self._backups else []
+        if not older:
+            messagebox.showinfo("Changes", "There is no older backup to compare with.")
+            return
+        game = self.selected_game
+
+        def _compare(progress):
+            try:
+                diff = self.core.compare_backups(game, older[0], backup_path)
+            except Exception as e:
+                error = str(e)
+                self.after(0, lambda err=error: messagebox.showerror("Error", f"Compare failed: {err}"))
+                return False, error
+            self.after(0, lambda: self._show_changes(backup_path, diff))
+            return True, "Compared"
+
+        self._start_operation("compare", game, f"Comparing backups of {game}", _compare,
+                              key=(older[0], backup_path))
+
+    def _show_changes(self, backup_path, diff):
+        if backup_path != self._browse_backup:
+            return
+        self._browse_changes = {path: CHANGE_MARKS[kind] for kind in CHANGE_MARKS for path in diff[kind]}
+        self.status_label.configure(text=(
+            f"Since the previous backup: {len(diff['added'])} added, {len(diff['changed'])} changed, "
+            f"{len(diff['removed'])} removed, {diff['unchanged']} unchanged"
+        ))
+        self._render_browser()
 
     def clear_backup_list(self):
-        for widget in self.backup_list_frame.winfo_children():
-            widget.destroy()
+        self.backup_list.show_message("")
+        self.clear_browser()
 
     def update_root_display(self):
         current_root = self.core.config['root_backup_dir']
@@ -204,24 +449,28 @@ class BackupGUI(ctk.CTk):
 
         self.selected_game = name.strip().lower()
         self.debounce_refresh_game_list()
+        game = self.selected_game
 
-        def _create():
-            success, msg = self.core.create_backup(self.selected_game)
+        def _create(progress):
+            success, msg = self.core.create_backup(game, progress=progress)
             self.after(0, lambda: messagebox.showinfo(
                 "Result", 
                 "✅ Backup created!" if success else f"❌ Error: {msg}"
             ))
-            self.refresh_backup_list()
+            self.after(0, self.refresh_backup_list)
+            return success, msg
 
-        threading.Thread(target=_create, daemon=True).start()
+        self._start_operation("backup", game, f"Backing up {game}", _create)
     
     def update_backup(self):
         if not self.selected_game:
             messagebox.showerror("Error", "No game selected!")
             return
 
-        def _update():
-            success, msg = self.core.create_backup(self.selected_game)
+        game = self.selected_game
+
+        def _update(progress):
+            success, msg = self.core.create_backup(game, progress=progress)
             def post_update():
                 messagebox.showinfo(
                     "Result", 
@@ -229,8 +478,9 @@ class BackupGUI(ctk.CTk):
                 )
                 self.refresh_backup_list()  # Ensure it's called after backup completes
             self.after(0, post_update)
+            return success, msg
 
-        threading.Thread(target=_update, daemon=True).start()
+        self._start_operation("backup", game, f"Backing up {game}", _update)
 
 
     def restore_backup(self):
@@ -242,22 +492,19 @@ class BackupGUI(ctk.CTk):
             messagebox.showerror("Error", "No backup selected!")
             return
 
-        if not os.path.exists(self.selected_backup_path):
-            messagebox.showerror("Error", "Backup path is invalid!")
-            return
-
         if messagebox.askyesno("Confirm", "Are you sure you want to restore this backup?"):
-            def _restore():
-                success, msg = self.core.restore_backup(
-                    self.selected_game, 
-                    self.selected_backup_path
-                )
+            game, backup_path = self.selected_game, self.selected_backup_path
+
+            def _restore(progress):
+                success, msg = self.core.restore_backup(game, backup_path, progress=progress)
                 self.after(0, lambda: messagebox.showinfo(
                     "Result",
                     "✅ Restore successful!" if success else f"❌ Error: {msg}"
                 ))
+                self.after(0, self.refresh_backup_list)  # the safety snapshot is new
+                return success, msg
 
-            threading.Thread(target=_restore, daemon=True).start()
+            self._start_operation("restore", game, f"Restoring {game}", _restore, key=backup_path)
 
     def delete_backup(self):
         if not self.selected_game:
@@ -268,64 +515,272 @@ class BackupGUI(ctk.CTk):
             messagebox.showerror("Error", "No backup selected!")
             return
 
-        if not os.path.exists(self.selected_backup_path):
-            messagebox.showerror("Error", "Backup path is invalid!")
-            return
-
         if messagebox.askyesno("Confirm", "Permanently delete this backup?"):
-            def _delete():
-                success, msg = self.core.delete_backup(
-                    self.selected_game,
-                    self.selected_backup_path
-                )
+            game, backup_path = self.selected_game, self.selected_backup_path
+
+            def _delete(progress):
+                success, msg = self.core.delete_backup(game, backup_path)
                 self.after(0, lambda: messagebox.showinfo(
                     "Result",
                     "✅ Backup deleted!" if success else f"❌ Error: {msg}"
                 ))
-                self.selected_backup_path = None
-                self.refresh_backup_list()
+                self.after(0, self._on_backup_deleted, backup_path)
+                return success, msg
+
+            self._start_operation("delete", game, f"Deleting a backup of {game}", _delete, key=backup_path)
+
+    def _on_backup_deleted(self, backup_path):
+        if self.selected_backup_path == backup_path:
+            self.selected_backup_path = None
+        self.refresh_backup_list()
 
-            threading.Thread(target=_delete, daemon=True).start()
+    def _start_operation(self, kind, game, title, work, key=None):
+        """Queue work(progress) as a job and show it behind the progress bar and Cancel button.
+
+        work returns (success, message). The job manager runs one job per
+        game at a time, so a second click queues behind the first instead
+        of racing it, and a click that duplicates a job still waiting is
+        folded into it. Progress events are queued by the workers and
+        drained by a Tk timer, so the UI repaints at most every
+        PROGRESS_POLL_MS.
+        """
+        job = self.core.job_manager().submit(
+            kind, game, work, title=title, key=key,
+            on_progress=lambda job, event: self._job_events.put((job.id, event))
+        )
+        if job.id in self._jobs:
+            self.status_label.configure(text=f"{job.title} is already queued")
+            return job
+        polling = bool(self._jobs)
+        self._jobs[job.id] = job
+        if not polling:
+            self.progress_bar.set(0)
+            self.progress_frame.grid()
+            self.after(PROGRESS_POLL_MS, self._poll_progress)
+        self._show_job_status()
+        return job
+
+    def _shown(self):
+        """The job the progress bar follows: the first running one, else the next queued one"""
+        jobs = list(self._jobs.values())
+        return next((job for job in jobs if job.state == RUNNING), jobs[0] if jobs else None)
+
+    def _show_job_status(self, event=None):
+        job = self._shown()
+        if job is None:
+            return
+        if job is not self._shown_job:
+            self._shown_job = job
+            self.progress_bar.set(0)
+            self.cancel_button.configure(state="normal")
+        waiting = len(self._jobs) - 1
+        more = f" (+{waiting} queued)" if waiting else ""
+        if job.progress.token.cancelled:
+            self.progress_label.configure(text=f"{job.title}: cancelling…{more}")
+        elif job.state != RUNNING:
+            self.progress_label.configure(text=f"{job.title}: waiting…{more}")
+        elif event is not None:
+            if event['bytes_total']:
+                self.progress_bar.set(min(1.0, event['bytes_done'] / event['bytes_total']))
+            self.progress_label.configure(text=f"{job.title}: {format_progress(event)}{more}")
+
+    def _poll_progress(self):
+        latest = {}
+        while True:
+            try:
+                job_id, event = self._job_events.get_nowait()
+            except queue.Empty:
+                break
+            latest[job_id] = event  # only the newest event is drawn
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done]:
+            del self._jobs[job_id]
+        if self._jobs:
+            shown = self._shown()
+            self._show_job_status(latest.get(shown.id))
+            self.after(PROGRESS_POLL_MS, self._poll_progress)
+        else:
+            self._shown_job = None
+            self.progress_frame.grid_remove()
+
+    def cancel_operation(self):
+        job = self._shown()
+        if job is not None:
+            self.core.job_manager().cancel(job.id)
+            self.cancel_button.configure(state="disabled")
+            self._show_job_status()
+
+    def on_close(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+        # Cancelled operations delete their partial snapshot before returning
+        self.core.shutdown_jobs(timeout=30)
+        self.destroy()
+
+    def _stream_result(self, action, total):
+        """Build a per-game callback that reports bulk progress in the status bar"""
+        done = []
+
+        def _on_result(game, result):
+            done.append(game)
+            text = (f"{action} {len(done)}/{total}: {game} "
+                    f"{'✅' if result['success'] else '❌'} "
+                    f"({result['duration']:.1f}s, {result['bytes'] / (1024 * 1024):.2f} MB)")
+            self.after(0, lambda: self.status_label.configure(text=text))
+        return _on_result
+
+    def _bulk_report(self, results):
+        return "\n".join(
+            f"{k}: {'✅' if v['success'] else '❌'} {v['message']} ({v['duration']:.1f}s)"
+            for k, v in results.items()
+        )
 
     def update_all_backups(self):
         if messagebox.askyesno("Confirm", "Backup ALL games?"):
-            def _update_all():
-                results = self.core.update_all_backups()
-                report = "\n".join(
-                    f"{k}: {'✅' if v['success'] else '❌'} {v['message']}" 
-                    for k, v in results.items()
+            def _update_all(progress):
+                results = self.core.update_all_backups(
+                    on_result=self._stream_result("Updated", len(self.core.config['games'])),
+                    progress=progress
                 )
+                report = self._bulk_report(results)
                 self.after(0, lambda: messagebox.showinfo("Update All", report))
-                self.refresh_backup_list()
+                self.after(0, self.refresh_backup_list)
+                return all(r['success'] for r in results.values()), report
 
-            threading.Thread(target=_update_all, daemon=True).start()
+            self._start_operation("backup", None, "Updating all games", _update_all)
 
     def restore_all_backups(self):
         if messagebox.askyesno("Warning", "Restore ALL games to latest backups?"):
-            def _restore_all():
-                results = self.core.restore_all_backups()
-                report = "\n".join(
-                    f"{k}: {'✅' if v['success'] else '❌'} {v['message']}" 
-                    for k, v in results.items()
+            def _restore_all(progress):
+                results = self.core.restore_all_backups(
+                    on_result=self._stream_result("Restored", len(self.core.config['games'])),
+                    progress=progress
                 )
+                report = self._bulk_report(results)
                 self.after(0, lambda: messagebox.showinfo("Restore All", report))
+                return all(r['success'] for r in results.values()), report
 
-            threading.Thread(target=_restore_all, daemon=True).start()
+            self._start_operation("restore", None, "Restoring all games", _restore_all)
+
+    def toggle_auto_backup(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+            self.status_label.configure(text="Auto backup off")
+            return
+
+        def _on_backup(game, success, msg):
+            text = f"Auto backup {game}: {'✅' if success else '❌'} {msg}"
+            self.after(0, lambda: self.status_label.configure(text=text))
+            if game == self.selected_game:
+                self.after(0, self.refresh_backup_list)
+
+        self._watcher = self.core.start_watcher(on_backup=_on_backup)
+        self.status_label.configure(text="Auto backup on: watching save folders for changes")
 
     def change_root_dir(self):
         new_root = filedialog.askdirectory()
-        if new_root:
-            self.core.config['root_backup_dir'] = os.path.normpath(new_root)
-            self.core._save_config()
-            self.update_root_display()
-            messagebox.showinfo("Success", f"Root directory updated to:\n{new_root}")
-            self.refresh_game_list()
+        if not new_root:
+            return
+        move = messagebox.askyesnocancel(
+            "Change Root", "Move the existing backups to the new folder?\n\n"
+            "No switches the root without moving anything."
+        )
+        if move is None:
+            return
+        if not move:
+            def _switch(progress):
+                success, msg = self.core.set_root_directory(new_root)
+
+                def post_switch():
+                    self.update_root_display()
+                    messagebox.showinfo("Success", f"Root directory updated to:\n{new_root}")
+                    self.refresh_game_list()
+                self.after(0, post_switch)
+                return success, msg
+
+            # Waits for running jobs, which still write to the old root
+            self._start_operation("config", None, "Changing root", _switch, key=new_root)
+            return
+
+        def _move(progress):
+            success, msg = self.core.migrate_root_directory(new_root, progress=progress)
+
+            def post_move():
+                self.update_root_display()
+                self.refresh_game_list()
+                self.refresh_totals()
+                if success:
+                    messagebox.showinfo("Success", f"✅ {msg}")
+                else:
+                    messagebox.showerror("Error", f"❌ {msg}")
+            self.after(0, post_move)
+            return success, msg
+
+        self._start_operation("move", None, "Moving backups", _move, key=new_root)
 
     def search_save_location(self):
-        name = ctk.CTkInputDialog(text="Enter game name:", title="Search Saves").get_input()
-        if name:
-            url = self.core.search_save_locations(name)['search_url']
-            webbrowser.open(url)
+        """Look for known games' saves on this machine and offer to add the new ones"""
+        self.status_label.configure(text="Looking for game saves…")
+
+        def _discover():
+            try:
+                found = [game for game in self.core.discover_games() if not game['configured']]
+                self.after(0, lambda: self._show_discovered(found))
+            except Exception as e:
+                error = str(e)
+                self.after(0, lambda err=error: messagebox.showerror("Error", f"❌ Save search failed: {err}"))
+            self.after(0, lambda: self.status_label.configure(text=""))
+        threading.Thread(target=_discover, daemon=True).start()
+
+    def _show_discovered(self, found):
+        if not found:
+            messagebox.showinfo("Find Saves", "No new games found.")
+            return
+        dialog = ctk.CTkToplevel(self, fg_color=COLORS["background"])
+        dialog.title("Find Saves")
+        dialog.geometry("640x480")
+        dialog.grid_columnconfigure(0, weight=1)
+        dialog.grid_rowconfigure(0, weight=1)
+        games = {game['name']: game for game in found}
+        checked = set(games)
+
+        def _render():
+            found_list.set_items([
+                (name, f"{'☑' if name in checked else '☐'} {name}  ({game['source_path']})")
+                for name, game in games.items()
+            ])
+
+        def _toggle(name):
+            checked.symmetric_difference_update({name})
+            _render()
+
+        def _add():
+            selected = [games[name] for name in games if name in checked]
+            dialog.destroy()
+            if not selected:
+                return
+
+            def _work(progress):
+                success, msg = self.core.add_discovered_games(selected)
+
+                def post_add():
+                    self.refresh_game_list()
+                    if success:
+                        messagebox.showinfo("Success", f"✅ {msg}")
+                    else:
+                        messagebox.showerror("Error", f"❌ {msg}")
+                self.after(0, post_add)
+                return success, msg
+
+            self._start_operation("config", None, f"Adding {len(selected)} games", _work,
+                                  key=tuple(game['name'] for game in selected))
+
+        found_list = PagedList(dialog, f"Found {len(found)} new games", DISCOVERY_PAGE_SIZE, _toggle,
+                               row_font=("Arial", 11), row_anchor="w")
+        found_list.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        ctk.CTkButton(dialog, text="Add Selected", command=_add,
+                      **STYLES["button"], font=FONTS["button"]).grid(row=1, column=0, pady=(0, 10))
+        _render()
 
 
     def export_config(self):
@@ -337,14 +792,15 @@ class BackupGUI(ctk.CTk):
             title="Export Configuration"
         )
         if export_path:
-            def _export():
+            def _export(progress):
                 success, msg = self.core.export_config(export_path)
                 self.after(0, lambda: messagebox.showinfo(
                     "Export Result", 
                     msg if success else f"❌ {msg}"
                 ))
-            
-            threading.Thread(target=_export, daemon=True).start()
+                return success, msg
+
+            self._start_operation("config", None, "Exporting settings", _export, key=export_path)
 
     def import_config(self):
         import_path = filedialog.askopenfilename(
@@ -355,11 +811,12 @@ class BackupGUI(ctk.CTk):
             if not messagebox.askyesno("Confirm", "This will overwrite current configuration. Continue?"):
                 return
                 
-            def _import():
+            def _import(progress):
                 success, msg = self.core.import_config(import_path)
                 self.after(0, lambda: self._handle_import_result(success, msg))
-            
-            threading.Thread(target=_import, daemon=True).start()
+                return success, msg
+
+            self._start_operation("config", None, "Importing settings", _import, key=import_path)
 
     def _handle_import_result(self, success, msg):
         if success:
@@ -0,0 +1,147 @@
+import customtkinter as ctk
+from ui.theme import COLORS, FONTS, STYLES
+
+
+class PagedList(ctk.CTkFrame):
+    """Selectable list that shows one page of rows at a time.
+
+    A fixed pool of at most page_size row buttons is created once and
+    re-labelled whenever the items or the page change, so the widget count
+    never grows with the number of games or backups. Moving the selection
+    restyles only the rows that gain or lose it.
+    """
+
+    def __init__(self, master, title, page_size, on_select, selected_prefix="",
+                 selected_text_color=COLORS["text"], row_font=None, row_anchor="center"):
+        super().__init__(master, **STYLES["frame"])
+        self.page_size = page_size
+        self.on_select = on_select
+        self.selected_prefix = selected_prefix
+        self.selected_text_color = selected_text_color
+        self.row_font = row_font
+        self.row_anchor = row_anchor
+        self.items = []
+        self.page = 0
+        self.selected = None
+        self._rows = []
+        self._row_keys = []
+        self._row_texts = []
+        self._row_states = []
+        self._shown = 0
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        ctk.CTkLabel(self, text=title, font=FONTS["body"], text_color=COLORS["text"]).grid(row=0, column=0)
+
+        self._body = ctk.CTkScrollableFrame(self, **STYLES["frame"])
+        self._body.grid(row=1, column=0, sticky="nsew")
+        self._body.grid_columnconfigure(0, weight=1)
+        self._message = ctk.CTkLabel(self._body, text="", font=FONTS["body"], text_color=COLORS["text"])
+
+        nav = ctk.CTkFrame(self, fg_color="transparent")
+        nav.grid(row=2, column=0, sticky="ew")
+        nav.grid_columnconfigure(1, weight=1)
+        self._prev = ctk.CTkButton(nav, text="◀", width=32, command=lambda: self.show_page(self.page - 1),
+                                   **STYLES["button"])
+        self._prev.grid(row=0, column=0, padx=5, pady=(4, 0))
+        self._page_label = ctk.CTkLabel(nav, text="", font=FONTS["label"], text_color=COLORS["text"])
+        self._page_label.grid(row=0, column=1)
+        self._next = ctk.CTkButton(nav, text="▶", width=32, command=lambda: self.show_page(self.page + 1),
+                                   **STYLES["button"])
+        self._next.grid(row=0, column=2, padx=5, pady=(4, 0))
+
+    @property
+    def page_count(self):
+        return max(1, -(-len(self.items) // self.page_size))
+
+    def set_items(self, items):
+        """Show [(key, text)] rows, keeping the current page where possible"""
+        self.items = list(items)
+        self._message.grid_remove()
+        self.page = min(self.page, self.page_count - 1)
+        self._render()
+
+    def show_message(self, text, color=None):
+        """Replace the rows with a single message (empty list, errors)"""
+        self.items = []
+        self.page = 0
+        self._render()
+        self._message.configure(text=text, text_color=color or COLORS["text"])
+        self._message.grid(row=0, column=0, pady=10)
+
+    def show_page(self, page):
+        page = max(0, min(page, self.page_count - 1))
+        if page != self.page:
+            self.page = page
+            self._render()
+
+    def reveal(self, key):
+        """Switch to the page holding key"""
+        for position, (item_key, _) in enumerate(self.items):
+            if item_key == key:
+                self.show_page(position // self.page_size)
+                return
+
+    def select(self, key):
+        """Move the highlight to key (or clear it with None)"""
+        previous, self.selected = self.selected, key
+        for index, row_key in enumerate(self._row_keys):
+            if row_key is not None and row_key in (previous, key):
+                self._style_row(index)
+
+    def _row(self, index):
+        while len(self._rows) <= index:
+            position = len(self._rows)
+            row = ctk.CTkButton(
+                self._body,
+                text="",
+                font=self.row_font or FONTS["body"],
+                anchor=self.row_anchor,
+                hover_color=COLORS["secondary"],
+                border_color=COLORS["accent"],
+                corner_radius=6,
+                command=lambda i=position: self._clicked(i)
+            )
+            self._rows.append(row)
+            self._row_keys.append(None)
+            self._row_texts.append("")
+            self._row_states.append(None)
+        return self._rows[index]
+
+    def _clicked(self, index):
+        key = self._row_keys[index]
+        if key is not None:
+            self.on_select(key)
+
+    def _style_row(self, index):
+        key = self._row_keys[index]
+        text = self._row_texts[index]
+        is_selected = key is not None and key == self.selected
+        if self._row_states[index] == (text, is_selected):
+            return  # unchanged; configure() would redraw the button for nothing
+        self._row_states[index] = (text, is_selected)
+        self._rows[index].configure(
+            text=f"{self.selected_prefix}{text}" if is_selected else text,
+            fg_color=COLORS["accent"] if is_selected else COLORS["surface"],
+            text_color=self.selected_text_color if is_selected else COLORS["text"],
+            border_width=2 if is_selected else 0
+        )
+
+    def _render(self):
+        start = self.page * self.page_size
+        visible = self.items[start:start + self.page_size]
+        for index, (key, text) in enumerate(visible):
+            row = self._row(index)
+            self._row_keys[index] = key
+            self._row_texts[index] = text
+            self._style_row(index)
+            if index >= self._shown:
+                row.grid(row=index, column=0, sticky="ew", pady=2, padx=5)
+        for index in range(len(visible), self._shown):
+            self._row_keys[index] = None
+            self._rows[index].grid_remove()
+        self._shown = len(visible)
+
+        self._page_label.configure(text=f"{self.page + 1}/{self.page_count}" if self.items else "")
+        self._prev.configure(state="normal" if self.page > 0 else "disabled")
+        self._next.configure(state="normal" if self.page < self.page_count - 1 else "disabled")